@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from .config import settings
+from .utils import normalize_slug
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    generation: int
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {part.strip().removeprefix('W/') for part in if_none_match.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+class ResponseCache:
+    # Serialized API responses keyed by normalized query parameters. Entries are
+    # only valid for the ingest generation they were computed in; every ingest
+    # commit bumps the generation and drops the whole memory tier.
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._lock = Lock()
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max(1, max_bytes)
+        self._bytes = 0
+        self._generation = 0
+        self._bumped_at = monotonic()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._not_modified = 0
+        self._unsettled = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def bump_generation(self) -> int:
+        with self._lock:
+            self._generation += 1
+            self._bumped_at = monotonic()
+            self._entries.clear()
+            self._bytes = 0
+            return self._generation
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.generation != self._generation:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: tuple, body: bytes, generation: int, *, min_age: float = 0.0) -> CachedResponse:
+        # min_age: how far behind the latest commit the data source may be (a read
+        # replica). Such responses are only stored once the generation is older.
+        entry = CachedResponse(body=body, etag=make_etag(body), generation=generation)
+        size = len(body)
+        with self._lock:
+            # A commit landed while this response was being built; it may be stale.
+            if generation != self._generation or size > self._max_bytes:
+                return entry
+            if min_age > 0 and monotonic() - self._bumped_at < min_age:
+                self._unsettled += 1
+                return entry
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self._evictions += 1
+        return entry
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._not_modified += 1
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'generation': self._generation,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'not_modified': self._not_modified,
+                'unsettled': self._unsettled,
+            }
+
+
+def _slug(value: str | None) -> str:
+    return normalize_slug(value) if value and value.strip() else ''
+
+
+def news_list_key(
+    *,
+    lang: str,
+    china_only: bool,
+    q: str | None,
+    country: str | None,
+    topic: str | None,
+    limit: int,
+    offset: int,
+    source_lang: str | None = None,
+) -> tuple:
+    # Search is ILIKE-based, so case and surrounding whitespace never change the result.
+    needle = (q or '').strip().lower()
+    return ('news', lang, china_only, needle, _slug(country), _slug(topic), source_lang or '', limit, offset)
+
+
+def rollup_key(
+    kind: str,
+    *,
+    china_only: bool,
+    country: str | None,
+    topic: str | None,
+    source: str | None,
+    hours: int,
+    bucket: str = '',
+) -> tuple:
+    # Same normalization as the rollup filters, so equivalent spellings share an entry.
+    return (kind, china_only, _slug(country), _slug(topic), (source or '').strip(), hours, bucket)
+
+
+def dashboard_key(*, version: int, news_key: tuple) -> tuple:
+    return ('dashboard', version, *news_key)
+
+
+def related_key(*, article_id: int, limit: int) -> tuple:
+    return ('related', article_id, limit)
+
+
+def news_detail_key(*, article_id: int, lang: str) -> tuple:
+    return ('detail', article_id, lang)
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    max_bytes=settings.response_cache_max_bytes,
+)
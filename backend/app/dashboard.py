@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+# Source health, retry-queue counts and the last ingest cycle's stats, computed once
+# per cycle and held in memory so dashboard polling never reaches the database.
+# The ingest process refreshes it after each cycle and announces it on the event
+# bus; API-only workers then reload health and retry counts with one pair of
+# queries per process and take the ingest stats from the message.
+
+
+class DashboardSnapshot:
+    def __init__(self) -> None:
+        self.version = 0
+        self.sources: list[dict] = []
+        self.retry: dict[str, int] = {'pending': 0, 'due': 0}
+        self.ingest: dict | None = None
+        self.generated_at: datetime | None = None
+
+    def update(self, *, sources: list[dict], retry: dict[str, int], ingest: dict | None) -> None:
+        self.sources = sources
+        self.retry = retry
+        if ingest is not None:
+            self.ingest = ingest
+        self.generated_at = datetime.now(timezone.utc)
+        # Part of the response cache key, so cached dashboards never outlive a refresh.
+        self.version += 1
+
+    def payload(self) -> dict:
+        return {
+            'sources': self.sources,
+            'retry': self.retry,
+            'ingest': self.ingest,
+            'generated_at': self.generated_at,
+        }
+
+
+dashboard = DashboardSnapshot()
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from collections.abc import AsyncGenerator
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy import text
 
 from .config import settings
-from .models import Base
+from .migrations import run_migrations
+from .profiling import slow_query_log
+
+logger = logging.getLogger(__name__)
 
 
 def _normalize_database_url(raw_url: str) -> str:
@@ -30,21 +35,103 @@ def _normalize_database_url(raw_url: str) -> str:
     return urlunsplit((split.scheme, split.netloc, split.path, urlencode(query), split.fragment))
 
 
-engine = create_async_engine(_normalize_database_url(settings.database_url), pool_pre_ping=True)
+engine = create_async_engine(
+    _normalize_database_url(settings.database_url),
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+)
 SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+slow_query_log.install(engine, 'primary')
+
+read_engine: AsyncEngine | None = None
+ReadSessionLocal: async_sessionmaker[AsyncSession] | None = None
+if settings.read_database_url:
+    read_engine = create_async_engine(
+        _normalize_database_url(settings.read_database_url),
+        pool_pre_ping=True,
+        pool_size=settings.read_db_pool_size,
+        max_overflow=settings.read_db_max_overflow,
+    )
+    ReadSessionLocal = async_sessionmaker(bind=read_engine, expire_on_commit=False, class_=AsyncSession)
+    slow_query_log.install(read_engine, 'replica')
+
+# Zero when the replica has replayed everything it received; otherwise the age of
+# the last replayed transaction. A server that is not in recovery reports zero.
+_REPLICA_LAG_SQL = text(
+    'SELECT CASE '
+    'WHEN NOT pg_is_in_recovery() THEN 0 '
+    'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+
+class ReadRouter:
+    # Chooses the sessionmaker for API reads: the replica while it is reachable and
+    # within the lag budget, the primary otherwise.
+    def __init__(self) -> None:
+        self.replica_healthy = ReadSessionLocal is not None
+        self.replica_lag_seconds: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def configured(self) -> bool:
+        return ReadSessionLocal is not None
+
+    def sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        if ReadSessionLocal is not None and self.replica_healthy:
+            return ReadSessionLocal
+        return SessionLocal
+
+    def mark_unhealthy(self, error: str) -> None:
+        if self.replica_healthy:
+            logger.warning('read replica unavailable, falling back to primary: %s', error)
+        self.replica_healthy = False
+        self.last_error = error[:1000]
+
+    async def check(self) -> None:
+        if read_engine is None:
+            return
+        try:
+            async with read_engine.connect() as conn:
+                lag = float(await conn.scalar(_REPLICA_LAG_SQL) or 0)
+        except Exception as exc:
+            self.replica_lag_seconds = None
+            self.mark_unhealthy(str(exc) or type(exc).__name__)
+            return
+
+        self.replica_lag_seconds = lag
+        if lag > settings.read_replica_max_lag_seconds:
+            self.mark_unhealthy(f'replica lag {lag:.1f}s exceeds {settings.read_replica_max_lag_seconds}s')
+            return
+        if not self.replica_healthy:
+            logger.info('read replica healthy again, routing reads to replica')
+        self.replica_healthy = True
+        self.last_error = None
+
+    async def run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(max(1.0, settings.read_replica_check_seconds))
+
+    def status(self) -> dict:
+        return {
+            'configured': self.configured,
+            'healthy': self.configured and self.replica_healthy,
+            'lag_seconds': self.replica_lag_seconds,
+            'last_error': self.last_error,
+        }
+
+
+read_router = ReadRouter()
 
 
 async def init_db() -> None:
+    # A no-op version check unless this build ships new migrations.
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        # Backward-compatible schema patching for pre-existing deployments
-        # without migration tooling.
-        await conn.execute(
-            text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS country_tags_blob VARCHAR(1024) NOT NULL DEFAULT '|'")
-        )
-        await conn.execute(
-            text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS topic_tags_blob VARCHAR(1024) NOT NULL DEFAULT '|'")
-        )
+        applied = await run_migrations(conn)
+    if applied:
+        logger.info('applied %s schema migration(s)', applied)
 
 
 async def wait_for_db_ready() -> None:
@@ -69,3 +156,13 @@ async def wait_for_db_ready() -> None:
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    maker = read_router.sessionmaker()
+    # The response cache needs to know the data may trail the latest commit.
+    request.state.read_replica = maker is not SessionLocal
+    # Endpoint errors never reach this yield, so replica failures are detected by
+    # ReadRouter.check, which moves reads to the primary within one check interval.
+    async with maker() as session:
+        yield session
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+
+from .cache import response_cache
+from .config import settings
+from .dashboard import dashboard
+from .database import engine
+from .realtime import ArticleEvent, ws_manager
+from .related import related_index
+from .utils import dump_json
+
+logger = logging.getLogger(__name__)
+
+# More re-embedded ids than fit in one NOTIFY payload turn into a full index reload.
+_MAX_EMBEDDING_IDS = 500
+
+ArticleLoader = Callable[[list[int]], Awaitable[list[ArticleEvent]]]
+DashboardLoader = Callable[[dict | None], Awaitable[None]]
+
+
+def _apply_embeddings(ids: list[int] | None) -> None:
+    if ids is None:
+        related_index.mark_reload()
+    else:
+        related_index.mark_changed(ids)
+
+
+class EventBus:
+    # Fans ingest events out to every API process through Postgres LISTEN/NOTIFY.
+    # The publishing process always delivers to its own clients directly, so when
+    # the listener is down (or the bus is disabled) behaviour degrades to the old
+    # in-process push instead of losing events.
+    def __init__(self) -> None:
+        self.origin = uuid.uuid4().hex
+        self.listening = False
+        self.published = 0
+        self.received = 0
+        self.publish_errors = 0
+        self._loader: ArticleLoader | None = None
+        self._dashboard_loader: DashboardLoader | None = None
+        self._last_panels = ''
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.event_bus_enabled
+
+    def start(self, loader: ArticleLoader, dashboard_loader: DashboardLoader | None = None) -> None:
+        self._loader = loader
+        self._dashboard_loader = dashboard_loader
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.listening = False
+
+    async def publish_commit(self) -> None:
+        response_cache.bump_generation()
+        await self._notify({'type': 'commit'})
+
+    async def publish_articles(self, events: list[ArticleEvent]) -> None:
+        if not events:
+            return
+        await ws_manager.publish_articles(events)
+        # NOTIFY payloads are capped at 8000 bytes, so peers get ids and load the rows.
+        await self._notify({'type': 'articles', 'ids': [event.id for event in events]})
+
+    async def publish_embeddings(self, ids: list[int] | None) -> None:
+        # Vectors of existing articles were rewritten; None means too many to list.
+        if ids is not None and len(ids) > _MAX_EMBEDDING_IDS:
+            ids = None
+        _apply_embeddings(ids)
+        await self._notify({'type': 'embeddings', 'ids': ids})
+
+    async def publish_dashboard(self, ingest: dict) -> None:
+        # Peers reload the snapshot themselves; only the small ingest stats travel.
+        self._push_panels()
+        await self._notify({'type': 'dashboard', 'ingest': ingest})
+
+    def _push_panels(self) -> None:
+        # Open pages take health and retry panels from the message instead of
+        # re-fetching /api/dashboard, and hear nothing when neither changed.
+        message = dump_json({'type': 'dashboard', 'sources': dashboard.sources, 'retry': dashboard.retry}).decode()
+        if message != self._last_panels:
+            self._last_panels = message
+            ws_manager.broadcast_text(message)
+
+    async def _notify(self, message: dict) -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps({**message, 'origin': self.origin})
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text('SELECT pg_notify(:channel, :payload)'),
+                    {'channel': settings.event_bus_channel, 'payload': payload},
+                )
+            self.published += 1
+        except Exception:
+            self.publish_errors += 1
+            logger.exception('event bus notify failed')
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('event bus listener failed, reconnecting')
+            self.listening = False
+            await asyncio.sleep(max(1.0, settings.event_bus_reconnect_seconds))
+
+    async def _listen(self) -> None:
+        loop = asyncio.get_running_loop()
+        lost: asyncio.Future[None] = loop.create_future()
+
+        def on_notify(_conn, _pid, _channel, payload: str) -> None:
+            asyncio.create_task(self._handle(payload))
+
+        def on_terminate(_conn) -> None:
+            if not lost.done():
+                lost.set_result(None)
+
+        async with engine.connect() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            raw.add_termination_listener(on_terminate)
+            await raw.add_listener(settings.event_bus_channel, on_notify)
+            self.listening = True
+            logger.info('event bus listening on %s', settings.event_bus_channel)
+            try:
+                while not lost.done():
+                    try:
+                        await asyncio.wait_for(asyncio.shield(lost), timeout=30)
+                    except asyncio.TimeoutError:
+                        # Half-open TCP connections never fire the termination callback.
+                        await asyncio.wait_for(raw.execute('SELECT 1'), timeout=10)
+            finally:
+                self.listening = False
+                raw.remove_termination_listener(on_terminate)
+                if not raw.is_closed():
+                    await raw.remove_listener(settings.event_bus_channel, on_notify)
+
+    async def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get('origin') == self.origin:
+            return
+
+        self.received += 1
+        try:
+            if message.get('type') == 'commit':
+                response_cache.bump_generation()
+            elif message.get('type') == 'articles' and self._loader is not None:
+                ids = [int(value) for value in message.get('ids') or []]
+                await ws_manager.publish_articles(await self._loader(ids))
+            elif message.get('type') == 'embeddings':
+                ids = message.get('ids')
+                _apply_embeddings(None if ids is None else [int(value) for value in ids])
+            elif message.get('type') == 'dashboard' and self._dashboard_loader is not None:
+                await self._dashboard_loader(message.get('ingest'))
+                self._push_panels()
+        except Exception:
+            logger.exception('event bus message handling failed')
+
+    def metrics(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'listening': self.listening,
+            'published': self.published,
+            'received': self.received,
+            'publish_errors': self.publish_errors,
+        }
+
+
+event_bus = EventBus()
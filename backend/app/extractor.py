@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-
-import aiohttp
-import trafilatura
+import re
+from html.parser import HTMLParser
 
 from .config import settings
+from .downloads import check_html_type, read_text
+from .html_cache import html_cache
+from .metrics import stage_timer
 
 
 async def fetch_article_html(url: str) -> str | None:
+    import aiohttp
+
     timeout = aiohttp.ClientTimeout(total=settings.request_timeout_seconds)
     headers = {'User-Agent': settings.user_agent}
 
@@ -16,12 +20,15 @@ async def fetch_article_html(url: str) -> str | None:
         async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
             async with session.get(url, allow_redirects=True) as response:
                 response.raise_for_status()
-                return await response.text()
+                check_html_type(response)
+                return await read_text(response, kind='article', max_bytes=settings.article_max_bytes)
     except Exception:
         return None
 
 
 def extract_text_from_html(html: str) -> str | None:
+    import trafilatura
+
     try:
         text = trafilatura.extract(
             html,
@@ -37,14 +44,75 @@ def extract_text_from_html(html: str) -> str | None:
         return None
 
 
-async def extract_article_text(url: str) -> str:
-    html = await fetch_article_html(url)
-    if not html:
+_BLOCK_TAGS = frozenset(
+    {'p', 'div', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'section', 'article', 'tr'}
+)
+_SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'iframe', 'svg', 'figure', 'aside', 'nav'})
+_SPACES = re.compile(r'[ \t\r\f\v\u00a0]+')
+
+
+class _FragmentText(HTMLParser):
+    # Feed bodies are small, trusted-shape fragments; the stdlib parser turns them
+    # into paragraphs far cheaper than running the full page extractor.
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_fragment_to_text(fragment: str) -> str:
+    if '<' not in fragment:
+        return fragment.strip()
+    parser = _FragmentText()
+    try:
+        parser.feed(fragment)
+        parser.close()
+    except Exception:
         return ''
+    lines = (_SPACES.sub(' ', line).strip() for line in ''.join(parser.parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
 
+
+async def _extract(html: str) -> str:
     # HTML parsing can be CPU-heavy; keep it off the event loop.
-    text = await asyncio.to_thread(extract_text_from_html, html)
-    if not text:
-        return ''
+    with stage_timer('article_extract') as timer:
+        text = await asyncio.to_thread(extract_text_from_html, html)
+        if not text:
+            timer.outcome = 'empty'
+    return text[:30000] if text else ''
 
-    return text[:30000]
+
+async def extract_article_text(url: str, *, cached: bool = False) -> str:
+    # Retries and re-extraction pass cached=True to work from the page as first
+    # downloaded; if that yields nothing the page is fetched again.
+    if cached:
+        html = await html_cache.aget(url)
+        if html:
+            text = await _extract(html)
+            if text:
+                return text
+
+    with stage_timer('article_fetch') as timer:
+        html = await fetch_article_html(url)
+        if not html:
+            timer.outcome = 'empty'
+    if not html:
+        return ''
+    await html_cache.aput(url, html)
+    return await _extract(html)
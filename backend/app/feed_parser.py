@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import logging
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser, tostring
+
+from .config import settings
+from .metrics import FEED_PARSES
+
+logger = logging.getLogger(__name__)
+
+# Streaming RSS 2.0 / RSS 1.0 / Atom reader. It pulls only the fields fetch_feed
+# uses and stops after max_entries, so a 300-item feed costs about as much as its
+# first few items. Anything expat rejects (undeclared HTML entities, unsupported
+# encodings, broken markup) goes to feedparser, which is slower but forgiving.
+#
+# Entries are plain dicts shaped like the subset of feedparser entries we read:
+# id, title, link, summary, content=[{'value'}], media_content=[{'url'}], published, updated.
+
+_CHUNK_SIZE = 32 * 1024
+_CONTENT_NS = 'http://purl.org/rss/1.0/modules/content/'
+_MEDIA_NS = 'http://search.yahoo.com/mrss/'
+_ROOTS = frozenset({'rss', 'feed', 'RDF'})
+_ENTRY_TAGS = frozenset({'item', 'entry'})
+
+
+class FeedFormatError(Exception):
+    pass
+
+
+def _split(tag: str) -> tuple[str, str]:
+    if tag[:1] == '{':
+        namespace, _, local = tag[1:].partition('}')
+        return namespace, local
+    return '', tag
+
+
+def _text(elem: Element) -> str:
+    if len(elem):
+        # Atom type="xhtml" bodies arrive as child elements. Drop their namespace so
+        # they serialize as plain <p> rather than <ns0:p>.
+        for node in elem.iter():
+            node.tag = _split(node.tag)[1]
+        return ((elem.text or '') + ''.join(tostring(child, encoding='unicode') for child in elem)).strip()
+    return (elem.text or '').strip()
+
+
+def _entry(elem: Element) -> dict:
+    entry: dict = {}
+    guid = ''
+    guid_is_link = False
+    for child in elem:
+        namespace, local = _split(child.tag)
+        if namespace == _MEDIA_NS:
+            if local == 'content' and child.get('url'):
+                entry.setdefault('media_content', []).append({'url': child.get('url')})
+            continue
+        if namespace == _CONTENT_NS and local == 'encoded':
+            entry.setdefault('content', []).append({'value': _text(child)})
+        elif local == 'title':
+            entry['title'] = _text(child)
+        elif local == 'link':
+            href = child.get('href')
+            if href is None:
+                entry.setdefault('link', _text(child))
+            elif child.get('rel', 'alternate') == 'alternate':
+                entry.setdefault('link', href.strip())
+        elif local == 'guid':
+            guid = entry['id'] = _text(child)
+            guid_is_link = child.get('isPermaLink', 'true').lower() == 'true'
+        elif local == 'id':
+            entry['id'] = _text(child)
+        elif local in {'description', 'summary'}:
+            entry.setdefault('summary', _text(child))
+        elif local == 'content':
+            entry.setdefault('content', []).append({'value': _text(child)})
+        elif local in {'pubDate', 'published', 'issued'}:
+            entry.setdefault('published', _text(child))
+        elif local in {'updated', 'modified', 'date'}:
+            entry.setdefault('updated', _text(child))
+    if not entry.get('link') and guid_is_link and guid.startswith(('http://', 'https://')):
+        entry['link'] = guid
+    return entry
+
+
+def parse_feed_fast(data: bytes, *, max_entries: int) -> list[dict]:
+    parser = XMLPullParser(events=('start', 'end'))
+    entries: list[dict] = []
+    depth = 0
+    root_checked = False
+    try:
+        for offset in range(0, len(data), _CHUNK_SIZE):
+            parser.feed(data[offset : offset + _CHUNK_SIZE])
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if not root_checked:
+                        if _split(elem.tag)[1] not in _ROOTS:
+                            raise FeedFormatError(f'unexpected root element {elem.tag}')
+                        root_checked = True
+                    if _split(elem.tag)[1] in _ENTRY_TAGS:
+                        depth += 1
+                    continue
+                if _split(elem.tag)[1] in _ENTRY_TAGS:
+                    depth -= 1
+                    if depth == 0:
+                        entries.append(_entry(elem))
+                        elem.clear()
+                        if len(entries) >= max_entries:
+                            return entries
+        parser.close()
+    except ParseError as exc:
+        raise FeedFormatError(str(exc)) from exc
+    if not root_checked:
+        raise FeedFormatError('empty document')
+    return entries
+
+
+def parse_feed_entries(data: bytes, *, max_entries: int, content_type: str = '') -> list:
+    if settings.feed_parser_mode == 'fast':
+        try:
+            entries = parse_feed_fast(data, max_entries=max_entries)
+            FEED_PARSES.inc('fast')
+            return entries
+        except FeedFormatError as exc:
+            FEED_PARSES.inc('fallback')
+            logger.debug('fast feed parser fell back to feedparser: %s', exc)
+
+    import feedparser
+
+    if settings.feed_parser_mode != 'fast':
+        FEED_PARSES.inc('feedparser')
+    parsed = feedparser.parse(data, response_headers={'content-type': content_type})
+    return parsed.entries[:max_entries]
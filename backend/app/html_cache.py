@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from .config import settings
+from .utils import strip_tracking_params
+
+logger = logging.getLogger(__name__)
+
+# zlib-compressed article HTML on local disk, keyed by canonical URL, so retries
+# and re-extraction can work from the page as first downloaded instead of fetching
+# it again. Bounded by total compressed size (least recently used goes first) and
+# by age. The index lives in memory and is rebuilt from the directory on first use.
+
+_SUFFIX = '.html.z'
+
+
+class HtmlCache:
+    def __init__(self, directory: str, *, max_bytes: int, ttl_seconds: float) -> None:
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (compressed size, stored at), least recently used first.
+        self._index: OrderedDict[str, tuple[int, float]] | None = None
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(strip_tracking_params(url).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._dir / key[:2] / f'{key}{_SUFFIX}'
+
+    def _load_index(self) -> OrderedDict[str, tuple[int, float]]:
+        if self._index is not None:
+            return self._index
+        entries: list[tuple[float, str, int]] = []
+        if self._dir.is_dir():
+            for path in self._dir.glob(f'*/*{_SUFFIX}'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.name[: -len(_SUFFIX)], stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, (size, stored_at)) for stored_at, key, size in entries)
+        self._bytes = sum(size for _, _, size in entries)
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        size, _ = self._index.pop(key)
+        self._bytes -= size
+        self._path(key).unlink(missing_ok=True)
+
+    def get(self, url: str) -> str | None:
+        key = self.key(url)
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is not None and time.time() - entry[1] > self._ttl:
+                self._drop(key)
+                self._evictions += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            index.move_to_end(key)
+        try:
+            data = zlib.decompress(self._path(key).read_bytes())
+        except (OSError, zlib.error):
+            with self._lock:
+                if key in self._index:
+                    self._drop(key)
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return data.decode('utf-8')
+
+    def put(self, url: str, html: str) -> None:
+        key = self.key(url)
+        data = zlib.compress(html.encode('utf-8'), 6)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a reader never sees a partial file.
+        tmp = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            index = self._load_index()
+            previous = index.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[0]
+            index[key] = (len(data), time.time())
+            self._bytes += len(data)
+            while self._bytes > self._max_bytes and len(index) > 1:
+                self._drop(next(iter(index)))
+                self._evictions += 1
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self._ttl
+        with self._lock:
+            index = self._load_index()
+            expired = [key for key, (_, stored_at) in index.items() if stored_at < cutoff]
+            for key in expired:
+                self._drop(key)
+            self._evictions += len(expired)
+        return len(expired)
+
+    async def aget(self, url: str) -> str | None:
+        if not settings.html_cache_enabled:
+            return None
+        return await asyncio.to_thread(self.get, url)
+
+    async def aput(self, url: str, html: str) -> None:
+        if not settings.html_cache_enabled:
+            return
+        try:
+            await asyncio.to_thread(self.put, url, html)
+        except OSError:
+            logger.warning('could not cache html for %s', url, exc_info=True)
+
+    def metrics(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': float(len(self._index or ())),
+                'bytes': float(self._bytes),
+                'hits': float(self._hits),
+                'misses': float(self._misses),
+                'evictions': float(self._evictions),
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+            }
+
+
+html_cache = HtmlCache(
+    settings.html_cache_dir,
+    max_bytes=settings.html_cache_max_mb * 1024 * 1024,
+    ttl_seconds=settings.html_cache_ttl_hours * 3600,
+)
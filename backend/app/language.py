@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import re
+
+# Offline language detection for ingested articles: the dominant Unicode script
+# decides CJK, Korean, Cyrillic and Arabic text; Latin-script text is told apart
+# by common function words. Only the first few thousand characters are looked at.
+
+_SAMPLE_CHARS = 3000
+
+_SCRIPTS = (
+    ('han', re.compile(r'[㐀-䶿一-鿿豈-﫿]')),
+    ('kana', re.compile(r'[぀-ヿ]')),
+    ('hangul', re.compile(r'[가-힯ᄀ-ᇿ]')),
+    ('cyrillic', re.compile(r'[Ѐ-ӿ]')),
+    ('arabic', re.compile(r'[؀-ۿ]')),
+    ('latin', re.compile(r'[A-Za-zÀ-ɏ]')),
+)
+# A CJK character carries roughly a word, a Latin letter a fifth of one.
+_SCRIPT_WEIGHT = {'han': 3.0, 'kana': 3.0, 'hangul': 2.0, 'cyrillic': 1.0, 'arabic': 1.0, 'latin': 1.0}
+
+_WORD = re.compile(r"[a-zÀ-ɏ']+")
+_STOPWORDS: dict[str, frozenset[str]] = {
+    'en': frozenset('the of and to in is that for it with as was on are by this be from at have has said'.split()),
+    'fr': frozenset('le la les des et est une dans pour que qui sur pas par au aux du ont été'.split()),
+    'es': frozenset('el la los las del que en por una para con es se al fue han sus como'.split()),
+    'de': frozenset('der die das und ist nicht ein eine mit für auf den dem des sich von wurde'.split()),
+    'pt': frozenset('o os as do da dos das que em para com uma não por foi são pelo'.split()),
+}
+
+LANGUAGES = ('en', 'zh', 'ja', 'ko', 'ru', 'ar', 'fr', 'es', 'de', 'pt')
+
+
+def _latin_language(sample: str) -> str:
+    scores = dict.fromkeys(_STOPWORDS, 0)
+    for word in _WORD.findall(sample.lower()):
+        for lang, words in _STOPWORDS.items():
+            if word in words:
+                scores[lang] += 1
+    best = max(scores, key=lambda lang: (scores[lang], lang == 'en'))
+    return best if scores[best] else 'en'
+
+
+def detect_language(*texts: str, default: str = 'en') -> str:
+    sample = '\n'.join(text for text in texts if text)[:_SAMPLE_CHARS]
+    counts = {name: len(pattern.findall(sample)) * _SCRIPT_WEIGHT[name] for name, pattern in _SCRIPTS}
+    if not any(counts.values()):
+        return default
+
+    cjk = counts['han'] + counts['kana']
+    dominant = max(counts, key=counts.get)
+    if dominant in {'han', 'kana'} or cjk > counts['latin']:
+        # Japanese mixes kana into kanji; Chinese has none.
+        return 'ja' if counts['kana'] > 0.15 * cjk else 'zh'
+    if dominant == 'hangul':
+        return 'ko'
+    if dominant == 'cyrillic':
+        return 'ru'
+    if dominant == 'arabic':
+        return 'ar'
+    return _latin_language(sample)
+
+
+def language_family(code: str) -> str:
+    return code.split('-')[0].lower()
@@ -1,30 +1,81 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from typing import TYPE_CHECKING
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .cache import (
+    CachedResponse,
+    dashboard_key,
+    etag_matches,
+    make_etag,
+    news_detail_key,
+    news_list_key,
+    related_key,
+    response_cache,
+    rollup_key,
+)
 from .config import settings
-from .database import SessionLocal, get_db, init_db, wait_for_db_ready
+from .dashboard import dashboard
+from .database import SessionLocal, engine, get_read_db, init_db, read_router, wait_for_db_ready
+from .events import event_bus
+from .html_cache import html_cache
+from .maintenance import ensure_article_partitions, run_maintenance
+from .metrics import STATE, HttpMetricsMiddleware, registry
 from .news_service import (
     ingest_news_batch,
+    query_facets,
+    query_article_events,
     query_filter_options,
+    query_max_article_id,
     query_news,
+    prewarm_translations,
     query_news_detail,
+    query_related,
     query_retry_metrics,
     query_source_health,
+    query_trends,
+    refresh_dashboard,
+    stream_news_export,
 )
+from .profiling import ServerTimingMiddleware, profiler, slow_query_log, timed
 from .realtime import ws_manager
-from .schemas import NewsItem, NewsListResponse, RetryMetrics, SourceHealthItem, SourceHealthResponse
+from .related import related_index
+from .rollups import rebuild_rollups, rollups_empty
+from .schemas import (
+    CacheMetrics,
+    DashboardResponse,
+    FacetsResponse,
+    NewsItem,
+    NewsListResponse,
+    RelatedResponse,
+    RetryMetrics,
+    SourceHealthItem,
+    SourceHealthResponse,
+    TrendResponse,
+)
+from .seen import seen_index
+from .translations import READER_LANGUAGES, translation_jobs
+from .utils import dump_json
 
-scheduler = AsyncIOScheduler()
+if TYPE_CHECKING:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+# Created only in the process that runs ingest, so API-only workers never import APScheduler.
+scheduler: AsyncIOScheduler | None = None
 logger = logging.getLogger(__name__)
 
+LANG_PATTERN = f'^({"|".join(READER_LANGUAGES)})$'
+
 
 async def scheduled_ingest() -> None:
     try:
@@ -34,22 +85,105 @@ async def scheduled_ingest() -> None:
         logger.exception('scheduled ingest failed')
 
 
+async def scheduled_maintenance() -> None:
+    try:
+        async with engine.begin() as conn:
+            stats = await run_maintenance(conn)
+        stats['html_cache_expired'] = await asyncio.to_thread(html_cache.purge_expired)
+        # Retention may have removed rows that cached pages still reference.
+        await event_bus.publish_commit()
+        logger.info('maintenance finished: %s', stats)
+    except Exception:
+        logger.exception('scheduled maintenance failed')
+
+
+async def warm_related_index() -> None:
+    try:
+        await related_index.ensure_current(SessionLocal)
+        logger.info('related index loaded with %d articles', len(related_index))
+    except Exception:
+        logger.exception('related index load failed')
+
+
+async def run_translation_prewarm() -> None:
+    # Every API process warms what its own readers open most.
+    while True:
+        await asyncio.sleep(max(1, settings.translation_prewarm_interval_minutes) * 60)
+        try:
+            warmed = await prewarm_translations(SessionLocal)
+            if warmed:
+                logger.info('pre-warmed %d article translations', warmed)
+        except Exception:
+            logger.exception('translation pre-warm failed')
+
+
+async def load_dashboard(ingest: dict | None) -> None:
+    # Once per ingest cycle per process, however many dashboards are polling.
+    async with SessionLocal() as db:
+        await refresh_dashboard(db, ingest)
+
+
+async def load_article_events(article_ids: list[int]) -> list:
+    # Peers announce ids right after their commit; read from the primary so
+    # replica lag cannot hide the new rows.
+    related_index.mark_stale()
+    async with SessionLocal() as db:
+        return await query_article_events(db, article_ids)
+
+
+def start_scheduler() -> None:
+    global scheduler
+    if scheduler is not None and scheduler.running:
+        return
+
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        scheduled_ingest,
+        'interval',
+        seconds=settings.poll_seconds,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        scheduled_maintenance,
+        'interval',
+        minutes=max(1, settings.maintenance_interval_minutes),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+
+
 async def startup_db_worker(app: FastAPI) -> None:
     while True:
         try:
             await wait_for_db_ready()
             await init_db()
+            async with SessionLocal() as db:
+                # One-off backfill for databases that predate the rollup table.
+                if await rollups_empty(db):
+                    await rebuild_rollups(db, only_if_empty=True)
+                ws_manager.seed_resume_floor(await query_max_article_id(db))
+                await refresh_dashboard(db)
+            event_bus.start(load_article_events, load_dashboard)
+            asyncio.create_task(warm_related_index())
+            if settings.translation_prewarm_top > 0 and settings.enable_translation:
+                asyncio.create_task(run_translation_prewarm())
             app.state.db_ready = True
             app.state.last_db_error = None
-            if not scheduler.running:
-                scheduler.add_job(
-                    scheduled_ingest,
-                    'interval',
-                    seconds=settings.poll_seconds,
-                    max_instances=1,
-                    coalesce=True,
-                )
-                scheduler.start()
+            if not settings.scheduler_enabled:
+                # API-only worker: ingest runs elsewhere and reaches us over the event bus.
+                logger.info('database initialized; scheduler disabled for this process')
+                return
+            # The ingest process owns partition upkeep; API-only workers skip the DDL.
+            async with engine.begin() as conn:
+                await ensure_article_partitions(conn)
+            async with SessionLocal() as db:
+                loaded = await seen_index.rebuild(db)
+            logger.info('seen-url filter rebuilt from %d recent articles', loaded)
+            start_scheduler()
             asyncio.create_task(scheduled_ingest())
             logger.info('database initialized and scheduler started')
             return
@@ -65,17 +199,23 @@ async def lifespan(app: FastAPI):
     app.state.db_ready = False
     app.state.last_db_error = None
     startup_task = asyncio.create_task(startup_db_worker(app))
+    replica_task = asyncio.create_task(read_router.run()) if read_router.configured else None
 
     try:
         yield
     finally:
         startup_task.cancel()
-        if scheduler.running:
+        if replica_task is not None:
+            replica_task.cancel()
+        await event_bus.stop()
+        if scheduler is not None and scheduler.running:
             scheduler.shutdown()
 
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=ORJSONResponse)
 
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(HttpMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['*'],
@@ -95,25 +235,94 @@ async def health() -> dict:
     return {
         'status': 'ok',
         'db_ready': bool(getattr(app.state, 'db_ready', False)),
-        'scheduler_running': bool(scheduler.running),
+        'scheduler_running': bool(scheduler is not None and scheduler.running),
         'last_db_error': getattr(app.state, 'last_db_error', None),
+        'read_replica': read_router.status(),
+        'websocket': ws_manager.metrics(),
+        'event_bus': event_bus.metrics(),
     }
 
 
+def _cacheable_response(request: Request, key: tuple, body: bytes, generation: int) -> Response:
+    if settings.response_cache_enabled:
+        # Replica lag goes unnoticed for up to one check interval beyond the budget;
+        # until then a replica read may predate the commit that opened the generation.
+        min_age = 0.0
+        if getattr(request.state, 'read_replica', False):
+            min_age = settings.read_replica_max_lag_seconds + settings.read_replica_check_seconds
+        entry = response_cache.put(key, body, generation, min_age=min_age)
+    else:
+        entry = CachedResponse(body=body, etag=make_etag(body), generation=generation)
+    return _etag_response(request, entry)
+
+
+def _encode(payload) -> bytes:
+    with timed('serialize'):
+        return dump_json(payload)
+
+
+def _etag_response(request: Request, entry: CachedResponse) -> Response:
+    headers = {'ETag': entry.etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request.headers.get('if-none-match'), entry.etag):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type='application/json', headers=headers)
+
+
+@app.get('/metrics', include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    # Cheap in-memory state is sampled at scrape time instead of on every event.
+    for name, value in response_cache.metrics().items():
+        STATE.set(f'response_cache_{name}', value=value)
+    for name, value in ws_manager.metrics().items():
+        STATE.set(f'websocket_{name}', value=value)
+    for name, value in event_bus.metrics().items():
+        STATE.set(f'event_bus_{name}', value=float(value))
+    for name, value in html_cache.metrics().items():
+        STATE.set(f'html_cache_{name}', value=value)
+    for name, value in related_index.metrics().items():
+        STATE.set(f'related_index_{name}', value=value)
+    for name, value in seen_index.metrics().items():
+        STATE.set(f'seen_index_{name}', value=value)
+    for name, value in translation_jobs.metrics().items():
+        STATE.set(f'translation_jobs_{name}', value=value)
+    STATE.set('slow_query_explains_pending', value=float(slow_query_log.metrics()['pending_explains']))
+    STATE.set('db_ready', value=float(bool(getattr(app.state, 'db_ready', False))))
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
+
+
 @app.get(f'{settings.api_prefix}/news', response_model=NewsListResponse)
 async def list_news(
-    lang: str = Query(default='en', pattern='^(en|zh)$'),
+    request: Request,
+    lang: str = Query(default='en', pattern=LANG_PATTERN),
     china_only: bool = Query(default=False),
     q: str | None = Query(default=None),
     country: str | None = Query(default=None),
     topic: str | None = Query(default=None),
+    source_lang: str | None = Query(default=None, pattern='^[a-z]{2}$'),
     limit: int = Query(default=30, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    db: AsyncSession = Depends(get_db),
-) -> NewsListResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response | NewsListResponse:
     if not getattr(app.state, 'db_ready', False):
         return NewsListResponse(total=0, items=[])
 
+    key = news_list_key(
+        lang=lang,
+        china_only=china_only,
+        q=q,
+        country=country,
+        topic=topic,
+        limit=limit,
+        offset=offset,
+        source_lang=source_lang,
+    )
+    # The session is only bound to a connection on first use, so a hit never touches the pool.
+    cached = response_cache.get(key) if settings.response_cache_enabled else None
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    generation = response_cache.generation
     try:
         total, items = await query_news(
             db,
@@ -124,30 +333,156 @@ async def list_news(
             topic=topic,
             limit=limit,
             offset=offset,
+            source_lang=source_lang,
         )
-        return NewsListResponse(total=total, items=[NewsItem(**item) for item in items])
     except Exception:
         logger.exception('list_news failed')
-        return NewsListResponse(total=0, items=[])
+        raise HTTPException(status_code=500, detail='Failed to load news')
+    # Rows come straight from our own table and already match NewsItem, so
+    # they are encoded directly instead of being validated twice.
+    body = _encode({'total': total, 'items': items})
+    return _cacheable_response(request, key, body, generation)
+
+
+# Declared before /news/{article_id} so 'export' is not taken for an id.
+@app.get(f'{settings.api_prefix}/news/export')
+async def export_news(
+    lang: str = Query(default='en', pattern=LANG_PATTERN),
+    china_only: bool = Query(default=False),
+    q: str | None = Query(default=None),
+    country: str | None = Query(default=None),
+    topic: str | None = Query(default=None),
+    source_lang: str | None = Query(default=None, pattern='^[a-z]{2}$'),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    after_id: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1),
+) -> StreamingResponse:
+    if not getattr(app.state, 'db_ready', False):
+        raise HTTPException(status_code=503, detail='Database initializing')
+
+    # The generator opens its own session: it outlives this handler while the body streams.
+    lines = stream_news_export(
+        read_router.sessionmaker(),
+        lang=lang,
+        china_only=china_only,
+        q=q,
+        country=country,
+        topic=topic,
+        source_lang=source_lang,
+        since=since,
+        until=until,
+        after_id=after_id,
+        limit=limit,
+    )
+    return StreamingResponse(lines, media_type='application/x-ndjson', headers={'Cache-Control': 'no-store'})
 
 
 @app.get(f'{settings.api_prefix}/news/{{article_id}}', response_model=NewsItem)
 async def get_news_detail(
+    request: Request,
     article_id: int,
-    lang: str = Query(default='en', pattern='^(en|zh)$'),
-    db: AsyncSession = Depends(get_db),
-) -> NewsItem:
+    lang: str = Query(default='en', pattern=LANG_PATTERN),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     if not getattr(app.state, 'db_ready', False):
         raise HTTPException(status_code=503, detail='Database initializing')
 
-    item = await query_news_detail(db, article_id=article_id, lang=lang)
+    translation_jobs.record_view(article_id)
+    key = news_detail_key(article_id=article_id, lang=lang)
+    cached = response_cache.get(key) if settings.response_cache_enabled else None
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    generation = response_cache.generation
+    # Missing translations are produced on the primary and shared by concurrent readers.
+    item = await query_news_detail(db, article_id=article_id, lang=lang, maker=SessionLocal)
     if not item:
         raise HTTPException(status_code=404, detail='News not found')
-    return NewsItem(**item)
+    body = _encode(item)
+    if translation_jobs.pending(article_id, lang):
+        # Served untranslated while the job finishes; the next request gets the real thing.
+        return _etag_response(request, CachedResponse(body=body, etag=make_etag(body), generation=generation))
+    return _cacheable_response(request, key, body, generation)
+
+
+@app.get(f'{settings.api_prefix}/news/{{article_id}}/related', response_model=RelatedResponse)
+async def get_related_news(
+    request: Request,
+    article_id: int,
+    limit: int = Query(default=6, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    if not getattr(app.state, 'db_ready', False):
+        raise HTTPException(status_code=503, detail='Database initializing')
+
+    key = related_key(article_id=article_id, limit=limit)
+    cached = response_cache.get(key) if settings.response_cache_enabled else None
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    generation = response_cache.generation
+    # The index follows the primary, like article events, so it never misses new rows.
+    items = await query_related(db, SessionLocal, article_id, limit=limit)
+    if items is None:
+        raise HTTPException(status_code=404, detail='News not found')
+    return _cacheable_response(request, key, _encode({'items': items}), generation)
+
+
+@app.get(f'{settings.api_prefix}/dashboard', response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    lang: str = Query(default='en', pattern=LANG_PATTERN),
+    china_only: bool = Query(default=False),
+    q: str | None = Query(default=None),
+    country: str | None = Query(default=None),
+    topic: str | None = Query(default=None),
+    source_lang: str | None = Query(default=None, pattern='^[a-z]{2}$'),
+    limit: int = Query(default=30, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    if not getattr(app.state, 'db_ready', False):
+        raise HTTPException(status_code=503, detail='Database initializing')
+
+    news_key = news_list_key(
+        lang=lang,
+        china_only=china_only,
+        q=q,
+        country=country,
+        topic=topic,
+        limit=limit,
+        offset=0,
+        source_lang=source_lang,
+    )
+    key = dashboard_key(version=dashboard.version, news_key=news_key)
+    cached = response_cache.get(key) if settings.response_cache_enabled else None
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    # Health, retry and ingest stats come from the in-memory snapshot; only the
+    # first news page may touch the database, once per cache generation.
+    generation = response_cache.generation
+    try:
+        total, items = await query_news(
+            db,
+            lang=lang,
+            china_only=china_only,
+            q=q,
+            country=country,
+            topic=topic,
+            limit=limit,
+            offset=0,
+            source_lang=source_lang,
+        )
+    except Exception:
+        logger.exception('get_dashboard failed')
+        raise HTTPException(status_code=500, detail='Failed to load dashboard')
+    body = _encode({'news': {'total': total, 'items': items}, **dashboard.payload()})
+    return _cacheable_response(request, key, body, generation)
 
 
 @app.get(f'{settings.api_prefix}/sources/health', response_model=SourceHealthResponse)
-async def get_sources_health(db: AsyncSession = Depends(get_db)) -> SourceHealthResponse:
+async def get_sources_health(db: AsyncSession = Depends(get_read_db)) -> SourceHealthResponse:
     if not getattr(app.state, 'db_ready', False):
         return SourceHealthResponse(items=[])
 
@@ -165,11 +500,72 @@ async def get_filters() -> dict[str, list[str]]:
         return await query_filter_options()
     except Exception:
         logger.exception('get_filters failed')
-        return {'countries': [], 'topics': []}
+        return {'countries': [], 'topics': [], 'languages': []}
+
+
+@app.get(f'{settings.api_prefix}/facets', response_model=FacetsResponse)
+async def get_facets(
+    request: Request,
+    china_only: bool = Query(default=False),
+    country: str | None = Query(default=None),
+    topic: str | None = Query(default=None),
+    source: str | None = Query(default=None),
+    hours: int = Query(default=24, ge=1, le=24 * 90),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response | FacetsResponse:
+    if not getattr(app.state, 'db_ready', False):
+        return FacetsResponse(total=0, countries=[], topics=[], sources=[], china=[])
+
+    key = rollup_key('facets', china_only=china_only, country=country, topic=topic, source=source, hours=hours)
+    cached = response_cache.get(key) if settings.response_cache_enabled else None
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    generation = response_cache.generation
+    try:
+        facets = await query_facets(
+            db, china_only=china_only, country=country, topic=topic, source=source, hours=hours
+        )
+    except Exception:
+        logger.exception('get_facets failed')
+        raise HTTPException(status_code=500, detail='Failed to load facets')
+    return _cacheable_response(request, key, _encode(facets), generation)
+
+
+@app.get(f'{settings.api_prefix}/trends', response_model=TrendResponse)
+async def get_trends(
+    request: Request,
+    china_only: bool = Query(default=False),
+    country: str | None = Query(default=None),
+    topic: str | None = Query(default=None),
+    source: str | None = Query(default=None),
+    hours: int = Query(default=24, ge=1, le=24 * 90),
+    bucket: str = Query(default='hour', pattern='^(hour|day)$'),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response | TrendResponse:
+    if not getattr(app.state, 'db_ready', False):
+        return TrendResponse(bucket=bucket, points=[])
+
+    key = rollup_key(
+        'trends', china_only=china_only, country=country, topic=topic, source=source, hours=hours, bucket=bucket
+    )
+    cached = response_cache.get(key) if settings.response_cache_enabled else None
+    if cached is not None:
+        return _etag_response(request, cached)
+
+    generation = response_cache.generation
+    try:
+        points = await query_trends(
+            db, china_only=china_only, country=country, topic=topic, source=source, hours=hours, bucket=bucket
+        )
+    except Exception:
+        logger.exception('get_trends failed')
+        raise HTTPException(status_code=500, detail='Failed to load trends')
+    return _cacheable_response(request, key, _encode({'bucket': bucket, 'points': points}), generation)
 
 
 @app.get(f'{settings.api_prefix}/retry/metrics', response_model=RetryMetrics)
-async def get_retry_queue_metrics(db: AsyncSession = Depends(get_db)) -> RetryMetrics:
+async def get_retry_queue_metrics(db: AsyncSession = Depends(get_read_db)) -> RetryMetrics:
     if not getattr(app.state, 'db_ready', False):
         return RetryMetrics(pending=0, due=0)
 
@@ -181,12 +577,42 @@ async def get_retry_queue_metrics(db: AsyncSession = Depends(get_db)) -> RetryMe
         return RetryMetrics(pending=0, due=0)
 
 
+@app.get(f'{settings.api_prefix}/cache/metrics', response_model=CacheMetrics)
+async def get_cache_metrics() -> CacheMetrics:
+    return CacheMetrics(**response_cache.metrics())
+
+
+@app.get(f'{settings.api_prefix}/debug/profile', include_in_schema=False)
+async def capture_profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    x_debug_token: str | None = Header(default=None),
+) -> PlainTextResponse:
+    # Disabled unless DEBUG_TOKEN is set; the route then looks like any unknown path.
+    if not settings.debug_token:
+        raise HTTPException(status_code=404, detail='Not Found')
+    if x_debug_token != settings.debug_token:
+        raise HTTPException(status_code=403, detail='Invalid debug token')
+    if profiler.running:
+        raise HTTPException(status_code=409, detail='Profiler already running')
+    collapsed = await profiler.capture(min(seconds, settings.profile_max_seconds), interval_ms / 1000)
+    return PlainTextResponse(collapsed)
+
+
 @app.websocket('/ws/news')
 async def news_ws(websocket: WebSocket) -> None:
     await ws_manager.connect(websocket)
     try:
         while True:
-            await websocket.receive_text()
+            raw = await websocket.receive_text()
+            if raw == 'ping':
+                continue
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get('type') == 'subscribe':
+                await ws_manager.subscribe(websocket, message)
     except WebSocketDisconnect:
         await ws_manager.disconnect(websocket)
     except Exception:
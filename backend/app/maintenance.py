@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, exists, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .config import settings
+from .models import ArticleTranslation, IngestionFailure, NewsArticle, NewsRollup
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_TABLE = NewsArticle.__tablename__
+DEFAULT_PARTITION = f'{ARTICLE_TABLE}_default'
+_PARTITION_NAME = re.compile(rf'^{ARTICLE_TABLE}_p(\d{{4}})(\d{{2}})$')
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f'{ARTICLE_TABLE}_p{month.year:04d}{month.month:02d}'
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    found = await conn.scalar(
+        text('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)'),
+        {'name': ARTICLE_TABLE},
+    )
+    return bool(found)
+
+
+async def _partitions(conn: AsyncConnection) -> list[str]:
+    rows = await conn.execute(
+        text(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(:name)'
+        ),
+        {'name': ARTICLE_TABLE},
+    )
+    return [row[0] for row in rows]
+
+
+async def ensure_article_partitions(conn: AsyncConnection, *, since: datetime | None = None) -> None:
+    if not await is_partitioned(conn):
+        # Schema migration 5 converts pre-partitioning tables at startup.
+        raise RuntimeError(f'{ARTICLE_TABLE} is not partitioned; run the schema migrations first')
+
+    await conn.execute(text(f'CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {ARTICLE_TABLE} DEFAULT'))
+
+    month = _month_start(since or _utcnow())
+    last = _month_start(_utcnow())
+    for _ in range(max(0, settings.article_partition_months_ahead)):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        try:
+            async with conn.begin_nested():
+                await conn.execute(
+                    text(
+                        f'CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {ARTICLE_TABLE} '
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                    )
+                )
+        except Exception:
+            # Usually rows for this month already sit in the default partition.
+            logger.exception('could not create partition %s', partition_name(month))
+        month = upper
+
+
+async def _retire_partition(conn: AsyncConnection, name: str) -> None:
+    mode = settings.article_retention_mode
+    if mode == 'export':
+        archive_dir = Path(settings.article_archive_dir)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_from_table(name, output=str(archive_dir / f'{name}.csv'), format='csv', header=True)
+
+    await conn.execute(text(f'ALTER TABLE {ARTICLE_TABLE} DETACH PARTITION {name}'))
+    if mode != 'detach':
+        await conn.execute(text(f'DROP TABLE {name}'))
+    logger.info('retired partition %s (%s)', name, mode)
+
+
+async def apply_article_retention(conn: AsyncConnection) -> int:
+    if settings.article_retention_days <= 0:
+        return 0
+
+    # Articles expire a whole month at a time: a partition goes once all of it is
+    # past the retention window. The start of the oldest kept month is the one
+    # boundary for retired partitions, the default partition and the rollups, so
+    # facet counts live exactly as long as the articles they describe.
+    boundary = _month_start(_utcnow() - timedelta(days=settings.article_retention_days))
+    retired = 0
+    for name in await _partitions(conn):
+        match = _PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+        if _next_month(month) <= boundary:
+            await _retire_partition(conn, name)
+            retired += 1
+
+    result = await conn.execute(
+        text(f'DELETE FROM {DEFAULT_PARTITION} WHERE published_at < :boundary'), {'boundary': boundary}
+    )
+    if result.rowcount:
+        logger.info('deleted %s expired rows from %s', result.rowcount, DEFAULT_PARTITION)
+    await conn.execute(delete(NewsRollup).where(NewsRollup.bucket_start < boundary))
+    return retired
+
+
+async def purge_resolved_failures(conn: AsyncConnection) -> int:
+    if settings.failure_retention_days <= 0:
+        return 0
+
+    cutoff = _utcnow() - timedelta(days=settings.failure_retention_days)
+    result = await conn.execute(
+        delete(IngestionFailure).where(IngestionFailure.resolved.is_(True), IngestionFailure.updated_at < cutoff)
+    )
+    return int(result.rowcount or 0)
+
+
+async def purge_orphan_translations(conn: AsyncConnection) -> int:
+    # Only retention removes articles, so there is nothing to do without it.
+    if settings.article_retention_days <= 0:
+        return 0
+
+    orphaned = ~exists(select(NewsArticle.id).where(NewsArticle.id == ArticleTranslation.article_id))
+    result = await conn.execute(delete(ArticleTranslation).where(orphaned))
+    return int(result.rowcount or 0)
+
+
+async def run_maintenance(conn: AsyncConnection) -> dict[str, int]:
+    await ensure_article_partitions(conn)
+    retired = await apply_article_retention(conn)
+    purged = await purge_resolved_failures(conn)
+    translations = await purge_orphan_translations(conn)
+    return {'partitions_retired': retired, 'failures_purged': purged, 'translations_purged': translations}
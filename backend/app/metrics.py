@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+# Plain-Python Prometheus metrics: a label tuple -> counts dict per metric and a
+# text renderer. Hot-path cost is one lock, one bisect and a few dict updates.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Source name of the item being processed, so deep stages (article fetch,
+# extraction, translation) are labelled without threading it through every call.
+current_source: ContextVar[str] = ContextVar('current_source', default='')
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value:g}')
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f'# TYPE {self.name} gauge'
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: [count per bucket (+Inf last)..., sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = [(labels, list(state)) for labels, state in self._values.items()]
+        for labels, state in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float('inf')), state):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                label_text = _labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{label_text} {cumulative:g}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {state[-1]:g}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative:g}')
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.register(
+    Histogram(
+        'news_ingest_stage_seconds',
+        'Time spent in each ingestion pipeline stage.',
+        ('stage', 'source', 'outcome'),
+    )
+)
+INGEST_ITEMS = registry.register(
+    Counter('news_ingest_items_total', 'Feed items by ingest outcome.', ('source', 'outcome'))
+)
+HTTP_SECONDS = registry.register(
+    Histogram('news_http_request_seconds', 'HTTP request latency by route.', ('method', 'route', 'status'))
+)
+FEED_PARSES = registry.register(
+    Counter('news_feed_parse_total', 'Feeds parsed by parser; fallback means the fast parser gave up.', ('parser',))
+)
+ARTICLE_FETCHES = registry.register(
+    Counter(
+        'news_article_fetch_decisions_total',
+        'Per-item article page decision: fetched, avoided_feed_content or skipped_policy.',
+        ('source', 'decision'),
+    )
+)
+TRANSLATIONS = registry.register(
+    Counter(
+        'news_ingest_translations_total',
+        'Article bodies by translation direction; skipped bodies were already in the target language.',
+        ('direction',),
+    )
+)
+DOWNLOADS_LIMITED = registry.register(
+    Counter(
+        'news_download_limited_total',
+        'Downloads truncated at the byte limit or refused by content type.',
+        ('kind', 'reason'),
+    )
+)
+SLOW_QUERIES = registry.register(
+    Counter('news_db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS.', ('engine', 'operation'))
+)
+STATE = registry.register(Gauge('news_state', 'Point-in-time service state, refreshed on scrape.', ('name',)))
+
+
+class StageTimer:
+    __slots__ = ('outcome',)
+
+    def __init__(self) -> None:
+        self.outcome = 'ok'
+
+
+@contextmanager
+def stage_timer(stage: str, source: str | None = None) -> Iterator[StageTimer]:
+    timer = StageTimer()
+    started = perf_counter()
+    try:
+        yield timer
+    except BaseException:
+        timer.outcome = 'error'
+        raise
+    finally:
+        STAGE_SECONDS.observe(perf_counter() - started, stage, source or current_source.get(), timer.outcome)
+
+
+class HttpMetricsMiddleware:
+    # Pure ASGI so timing adds no extra task or response buffering.
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = {'code': 500}
+
+        async def send_wrapper(message) -> None:
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            # Unmatched paths share one label so scanners cannot blow up cardinality.
+            template = getattr(route, 'path', None) or 'unmatched'
+            HTTP_SECONDS.observe(perf_counter() - started, scope['method'], template, str(status['code']))
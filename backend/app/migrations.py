@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .maintenance import ARTICLE_TABLE, ensure_article_partitions, is_partitioned
+from .models import ArticleTranslation, Base, NewsArticle
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_TABLE = 'schema_version'
+# Arbitrary application-wide key so concurrent workers apply migrations one at a time.
+_MIGRATION_LOCK_KEY = 7_340_021
+
+_LEGACY_ARTICLE_TABLE = f'{ARTICLE_TABLE}_unpartitioned'
+_CONVERT_BATCH_IDS = 20000
+
+Migration = Callable[[AsyncConnection], Awaitable[None]]
+
+
+async def _baseline(conn: AsyncConnection) -> None:
+    await conn.run_sync(Base.metadata.create_all)
+    # Deployments created before tag blobs and the URL index existed.
+    await conn.execute(
+        text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS country_tags_blob VARCHAR(1024) NOT NULL DEFAULT '|'")
+    )
+    await conn.execute(
+        text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS topic_tags_blob VARCHAR(1024) NOT NULL DEFAULT '|'")
+    )
+    await conn.execute(text('CREATE INDEX IF NOT EXISTS idx_news_article_url ON news_articles (article_url)'))
+    # A pre-partitioning table is converted by migration 5.
+    if await is_partitioned(conn):
+        await ensure_article_partitions(conn)
+
+
+async def _language_index(conn: AsyncConnection) -> None:
+    await conn.execute(text('CREATE INDEX IF NOT EXISTS idx_news_language ON news_articles (language_detected)'))
+
+
+async def _article_embedding(conn: AsyncConnection) -> None:
+    # Existing rows stay NULL until `python -m app.reprocess --embed` backfills them.
+    await conn.execute(text('ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS embedding BYTEA'))
+
+
+async def _article_translations(conn: AsyncConnection) -> None:
+    await conn.run_sync(ArticleTranslation.__table__.create, checkfirst=True)
+
+
+async def _partition_articles(conn: AsyncConnection) -> None:
+    # Deployments created before partitioning still have a plain news_articles with
+    # a primary key on id and a unique URL. The old table moves aside, a partitioned
+    # one is created under its name, rows are copied across in id ranges and the
+    # old table is dropped. All of it runs in the startup transaction: readers and
+    # writers wait for the commit, and a failure leaves the old table untouched.
+    if await is_partitioned(conn):
+        return
+
+    await conn.execute(text(f'ALTER TABLE {ARTICLE_TABLE} RENAME TO {_LEGACY_ARTICLE_TABLE}'))
+    # Index (and so constraint) and sequence names are per schema; free them.
+    indexes = await conn.execute(
+        text(
+            'SELECT idx.relname FROM pg_index '
+            'JOIN pg_class idx ON idx.oid = pg_index.indexrelid '
+            'WHERE pg_index.indrelid = to_regclass(:name)'
+        ),
+        {'name': _LEGACY_ARTICLE_TABLE},
+    )
+    for (name,) in indexes.all():
+        await conn.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name[:50]}_legacy"'))
+    sequence = await conn.scalar(
+        text("SELECT pg_get_serial_sequence(:name, 'id')"), {'name': _LEGACY_ARTICLE_TABLE}
+    )
+    if sequence:
+        await conn.execute(text(f'ALTER SEQUENCE {sequence} RENAME TO {_LEGACY_ARTICLE_TABLE}_id_seq'))
+
+    await conn.run_sync(NewsArticle.__table__.create)
+    oldest = await conn.scalar(text(f'SELECT MIN(published_at) FROM {_LEGACY_ARTICLE_TABLE}'))
+    await ensure_article_partitions(conn, since=oldest)
+
+    columns = ', '.join(column.name for column in NewsArticle.__table__.columns)
+    last_id = int(await conn.scalar(text(f'SELECT COALESCE(MAX(id), 0) FROM {_LEGACY_ARTICLE_TABLE}')))
+    copy = text(
+        f'INSERT INTO {ARTICLE_TABLE} ({columns}) '
+        f'SELECT {columns} FROM {_LEGACY_ARTICLE_TABLE} WHERE id > :lower AND id <= :upper'
+    )
+    copied = 0
+    for lower in range(0, last_id, _CONVERT_BATCH_IDS):
+        result = await conn.execute(copy, {'lower': lower, 'upper': lower + _CONVERT_BATCH_IDS})
+        copied += int(result.rowcount or 0)
+        logger.info('partitioning %s: copied %s rows (id <= %s)', ARTICLE_TABLE, copied, lower + _CONVERT_BATCH_IDS)
+    await conn.execute(
+        text("SELECT setval(pg_get_serial_sequence(:name, 'id'), :next_id, false)"),
+        {'name': ARTICLE_TABLE, 'next_id': last_id + 1},
+    )
+    await conn.execute(text(f'DROP TABLE {_LEGACY_ARTICLE_TABLE}'))
+
+
+# Append only. Each entry runs once, in order, inside the startup transaction.
+MIGRATIONS: list[tuple[int, str, Migration]] = [
+    (1, 'baseline schema', _baseline),
+    (2, 'index articles by detected language', _language_index),
+    (3, 'store related-article vectors', _article_embedding),
+    (4, 'per-language article translations', _article_translations),
+    (5, 'partition news_articles by month', _partition_articles),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+async def current_version(conn: AsyncConnection) -> int:
+    exists = await conn.scalar(text('SELECT to_regclass(:name) IS NOT NULL'), {'name': SCHEMA_TABLE})
+    if not exists:
+        return 0
+    return int(await conn.scalar(text(f'SELECT COALESCE(MAX(version), 0) FROM {SCHEMA_TABLE}')))
+
+
+async def run_migrations(conn: AsyncConnection) -> int:
+    version = await current_version(conn)
+    if version >= SCHEMA_VERSION:
+        if version > SCHEMA_VERSION:
+            logger.warning('database schema version %s is newer than this build (%s)', version, SCHEMA_VERSION)
+        return 0
+
+    await conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': _MIGRATION_LOCK_KEY})
+    await conn.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} ('
+            'version INTEGER PRIMARY KEY, '
+            'description TEXT NOT NULL, '
+            'applied_at TIMESTAMPTZ NOT NULL DEFAULT now())'
+        )
+    )
+    # Another worker may have migrated while we waited for the lock.
+    version = await current_version(conn)
+    applied = 0
+    for target, description, migrate in MIGRATIONS:
+        if target <= version:
+            continue
+        logger.info('applying schema migration %s: %s', target, description)
+        await migrate(conn)
+        await conn.execute(
+            text(f'INSERT INTO {SCHEMA_TABLE} (version, description) VALUES (:version, :description)'),
+            {'version': target, 'description': description},
+        )
+        applied += 1
+    return applied
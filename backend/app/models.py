@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, Index, Integer, LargeBinary, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -16,12 +16,18 @@ class Base(DeclarativeBase):
 
 class NewsArticle(Base):
     __tablename__ = 'news_articles'
+    # Range-partitioned by month on published_at (see maintenance.py). Postgres
+    # requires the partition key in every unique constraint, so URL uniqueness is
+    # per published_at and the ingest existence check is what dedupes by URL.
     __table_args__ = (
-        UniqueConstraint('article_url', name='uq_news_article_url'),
+        UniqueConstraint('article_url', 'published_at', name='uq_news_article_url'),
+        Index('idx_news_article_url', 'article_url'),
         Index('idx_news_published_at', 'published_at'),
         Index('idx_news_china_related', 'china_related'),
         Index('idx_news_country_tags', 'country_tags_blob'),
         Index('idx_news_topic_tags', 'topic_tags_blob'),
+        Index('idx_news_language', 'language_detected'),
+        {'postgresql_partition_by': 'RANGE (published_at)'},
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -35,13 +41,32 @@ class NewsArticle(Base):
     content_zh: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     language_detected: Mapped[str] = mapped_column(String(16), nullable=False, default='en')
-    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utcnow)
+    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, default=utcnow)
     fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utcnow)
 
     china_related: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     image_url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     country_tags_blob: Mapped[str] = mapped_column(String(1024), nullable=False, default='|')
     topic_tags_blob: Mapped[str] = mapped_column(String(1024), nullable=False, default='|')
+    # Packed float16 vector for related-article search (see related.py); deferred
+    # so ordinary article loads never carry it.
+    embedding: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+
+
+class ArticleTranslation(Base):
+    __tablename__ = 'article_translations'
+    # No foreign key: news_articles is partitioned and keyed on (id, published_at).
+    # Retention removes orphans in maintenance instead.
+    __table_args__ = (UniqueConstraint('article_id', 'lang', name='uq_article_translation'),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    article_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    lang: Mapped[str] = mapped_column(String(16), nullable=False)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    summary: Mapped[str] = mapped_column(Text, nullable=False, default='')
+    # NULL when the body is already stored in content_en / content_zh.
+    content: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utcnow)
 
 
 class SourceHealth(Base):
@@ -88,3 +113,21 @@ class IngestionFailure(Base):
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utcnow, onupdate=utcnow)
+
+
+class NewsRollup(Base):
+    __tablename__ = 'news_rollups'
+    __table_args__ = (
+        UniqueConstraint('bucket_start', 'source_name', 'china_related', 'country', 'topic', name='uq_news_rollup_cell'),
+        Index('idx_news_rollup_bucket', 'bucket_start'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    source_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    china_related: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # '*' marks the "any value" cell, so each article is counted exactly once per
+    # (country, topic) combination including the unfiltered ones.
+    country: Mapped[str] = mapped_column(String(64), nullable=False)
+    topic: Mapped[str] = mapped_column(String(64), nullable=False)
+    article_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,32 +2,70 @@ from __future__ import annotations
 
 import asyncio
 import json
+import re
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from time import perf_counter
 
-from sqlalchemy import func, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import defer
 
 from .classifier import is_china_related
 from .config import settings
-from .extractor import extract_article_text
-from .models import IngestionFailure, NewsArticle, SourceHealth
-from .realtime import ws_manager
-from .sources import SourceConfig, SourceFetchResult, fetch_all_feeds_with_health, fetch_feed_with_retry
+from .dashboard import dashboard
+from .events import event_bus
+from .extractor import extract_article_text, html_fragment_to_text
+from .language import LANGUAGES, detect_language, language_family
+from .metrics import ARTICLE_FETCHES, INGEST_ITEMS, TRANSLATIONS, current_source, stage_timer
+from .models import ArticleTranslation, IngestionFailure, NewsArticle, NewsRollup, SourceHealth
+from .realtime import ArticleEvent
+from .related import decode_vector, encode_vector, related_index
+from .rollups import ANY, flush_rollups, record_article
+from .seen import apply_remembered, remember_entry, seen_index
+from .sources import (
+    FETCH_FEED_FIRST,
+    FETCH_NEVER,
+    FeedItem,
+    SourceFetchResult,
+    fetch_all_feeds_with_health,
+    fetch_feed_with_retry,
+    source_config,
+)
 from .tagger import extract_country_topic_tags, supported_countries, supported_topics
-from .translator import translate_en_to_zh
-from .utils import blob_to_tags, normalize_slug, strip_tracking_params, tags_to_blob
+from .translations import READER_LANGUAGES, translation_jobs
+from .translator import translate_text
+from .utils import blob_to_tag_tuple, dump_json, normalize_slug, tags_to_blob
+
+
+_TEASER_ENDING = re.compile(r'(\.\.\.|…|\[…\]|\[\.\.\.\]|read more|continue reading|full story)\W*$', re.IGNORECASE)
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
 def _next_retry_time(retry_count: int) -> datetime:
     delay = settings.retry_initial_delay_seconds * (2**max(0, retry_count - 1))
     bounded = min(delay, 60 * 60)
     return _utcnow() + timedelta(seconds=bounded)
 
 
+async def _commit(db: AsyncSession) -> None:
+    with stage_timer('commit'):
+        await flush_rollups(db)
+        await db.commit()
+    apply_remembered(db)
+    # Anything served from any process's response cache predates this commit.
+    await event_bus.publish_commit()
+
+
 async def _enqueue_failure(
     db: AsyncSession,
     *,
@@ -81,83 +119,167 @@ async def _update_source_health(db: AsyncSession, result: SourceFetchResult) ->
         current.last_status = 'down' if current.consecutive_failures >= 3 else 'degraded'
 
 
-async def _ingest_one_item(db: AsyncSession, item: dict) -> int:
-    normalized_url = strip_tracking_params(item['article_url'])
+async def _translate_bounded(text: str, *, source: str, target: str) -> str | None:
+    try:
+        return await asyncio.wait_for(
+            translate_text(text, source=source, target=target),
+            timeout=max(1, settings.translation_timeout_seconds),
+        )
+    except Exception:
+        return None
+
+
+async def localize_content(text: str, language: str) -> tuple[str, str | None]:
+    # Returns (content_en, content_zh) for a body written in `language`. Text that
+    # is already in the target language is stored as-is and only reverse-translated.
+    source_lang = settings.translation_source_lang
+    target_lang = settings.translation_target_lang
+    if language == language_family(target_lang):
+        if not settings.reverse_translation_enabled:
+            TRANSLATIONS.inc('skipped')
+            return text, text
+        TRANSLATIONS.inc('reverse')
+        return (await _translate_bounded(text, source=target_lang, target=source_lang)) or text, text
+    TRANSLATIONS.inc('forward')
+    source = source_lang if language == language_family(source_lang) else 'auto'
+    return text, await _translate_bounded(text, source=source, target=target_lang)
+
+
+def _feed_body_usable(body: str, summary: str) -> bool:
+    # Good enough to stand in for the article page: long, clearly more than the
+    # teaser summary, and not cut off with a "read more" style ending.
+    if len(body) < settings.feed_content_min_chars or len(body) < 2 * len(summary):
+        return False
+    return not _TEASER_ENDING.search(body[-80:])
+
+
+async def _ingest_one_item(db: AsyncSession, item: FeedItem) -> int:
     exists_stmt = select(NewsArticle.id).where(
         or_(
-            NewsArticle.article_url == normalized_url,
-            (NewsArticle.title == item['title'])
-            & (NewsArticle.source_name == item['source_name'])
-            & (NewsArticle.published_at == item['published_at']),
+            NewsArticle.article_url == item.article_url,
+            (NewsArticle.title == item.title)
+            & (NewsArticle.source_name == item.source_name)
+            & (NewsArticle.published_at == item.published_at),
         )
     )
-    if await db.scalar(exists_stmt):
+    with stage_timer('dedupe_check'):
+        exists = await db.scalar(exists_stmt)
+    remember_entry(db, item)
+    if exists:
+        INGEST_ITEMS.inc(item.source_name, 'duplicate')
         return 0
 
-    try:
-        content_en = await asyncio.wait_for(
-            extract_article_text(normalized_url),
-            timeout=max(1, settings.article_extract_timeout_seconds),
-        )
-    except Exception:
-        content_en = ''
-    extraction_failed = False
-    if not content_en:
-        extraction_failed = True
-        content_en = item['summary'] or ''
+    policy = item.source.fetch_policy
+    feed_body = ''
+    if item.content_html:
+        with stage_timer('feed_content'):
+            feed_body = html_fragment_to_text(item.content_html)[:30000]
 
-    try:
-        content_zh = await asyncio.wait_for(
-            translate_en_to_zh(content_en),
-            timeout=max(1, settings.translation_timeout_seconds),
-        )
-    except Exception:
-        content_zh = None
-    countries, topics = extract_country_topic_tags(item['title'], item['summary'], content_en)
-    china_related = 'china' in countries or is_china_related(item['title'], item['summary'], content_en)
-
-    db.add(
-        NewsArticle(
-            source_name=item['source_name'],
-            source_url=item['source_url'],
-            article_url=normalized_url,
-            title=item['title'],
-            summary=item['summary'] or '',
-            content_en=content_en,
-            content_zh=content_zh,
-            language_detected='en',
-            published_at=item['published_at'],
-            china_related=china_related,
-            image_url=item.get('image_url'),
-            country_tags_blob=tags_to_blob(countries),
-            topic_tags_blob=tags_to_blob(topics),
-        )
+    content = ''
+    extraction_failed = False
+    if policy == FETCH_NEVER:
+        ARTICLE_FETCHES.inc(item.source_name, 'skipped_policy')
+        content = feed_body
+    elif policy == FETCH_FEED_FIRST and _feed_body_usable(feed_body, item.summary):
+        ARTICLE_FETCHES.inc(item.source_name, 'avoided_feed_content')
+        content = feed_body
+    else:
+        ARTICLE_FETCHES.inc(item.source_name, 'fetched')
+        try:
+            content = await asyncio.wait_for(
+                extract_article_text(item.article_url),
+                timeout=max(1, settings.article_extract_timeout_seconds),
+            )
+        except Exception:
+            content = ''
+        extraction_failed = not content
+    if not content:
+        content = feed_body or item.summary
+
+    with stage_timer('language_detect'):
+        language = detect_language(item.title, content)
+    content_en, content_zh = await localize_content(content, language)
+    with stage_timer('tagging'):
+        countries, topics = extract_country_topic_tags(item.title, item.summary, content_en)
+        china_related = 'china' in countries or is_china_related(item.title, item.summary, content_en)
+
+    article = NewsArticle(
+        source_name=item.source_name,
+        source_url=item.source.feed_url,
+        article_url=item.article_url,
+        title=item.title,
+        summary=item.summary,
+        content_en=content_en,
+        content_zh=content_zh,
+        language_detected=language,
+        published_at=item.published_at,
+        china_related=china_related,
+        image_url=item.image_url,
+        country_tags_blob=tags_to_blob(countries),
+        topic_tags_blob=tags_to_blob(topics),
     )
+    with stage_timer('embedding'):
+        article.embedding = encode_vector(item.title, item.summary, content_en)
+    db.add(article)
+    record_article(db, article)
+    db.info.setdefault('inserted_articles', []).append(article)
 
     if extraction_failed:
         await _enqueue_failure(
             db,
             stage='article_extract',
-            source_name=item['source_name'],
-            target_url=normalized_url,
-            payload={'title': item['title']},
+            source_name=item.source_name,
+            target_url=item.article_url,
+            payload={'title': item.title},
             error='initial content extraction returned empty',
         )
+    INGEST_ITEMS.inc(item.source_name, 'extract_failed' if extraction_failed else 'inserted')
     return 1
 
 
-async def _ingest_items(db: AsyncSession, items: list[dict]) -> int:
+def _drop_known(items: list[FeedItem]) -> list[FeedItem]:
+    # In-memory pass so that only entries not seen before reach the database.
+    fresh: list[FeedItem] = []
+    with stage_timer('seen_filter'):
+        for item in items:
+            reason = seen_index.known(item)
+            if reason is None:
+                fresh.append(item)
+            else:
+                INGEST_ITEMS.inc(item.source_name, f'known_{reason}')
+    return fresh
+
+
+def _select_new_items(items: list[FeedItem], limit: int) -> list[FeedItem]:
+    # Newest first, one entry per URL, bounded so a cycle never holds up the API.
+    seen_urls: set[str] = set()
+    selected: list[FeedItem] = []
+    for item in sorted(_drop_known(items), key=attrgetter('published_at'), reverse=True):
+        if item.article_url in seen_urls:
+            continue
+        seen_urls.add(item.article_url)
+        selected.append(item)
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+async def _ingest_items(db: AsyncSession, items: list[FeedItem]) -> int:
     inserted = 0
     batch_size = max(1, settings.ingest_commit_batch_size)
     for idx, item in enumerate(items, start=1):
-        inserted += await _ingest_one_item(db, item)
+        token = current_source.set(item.source_name)
+        try:
+            inserted += await _ingest_one_item(db, item)
+        finally:
+            current_source.reset(token)
         if idx % batch_size == 0:
-            await db.commit()
+            await _commit(db)
     return inserted
 
 
 async def _retry_article_extract(db: AsyncSession, failure: IngestionFailure) -> bool:
-    text = await extract_article_text(failure.target_url)
+    text = await extract_article_text(failure.target_url, cached=True)
     if not text:
         return False
 
@@ -165,15 +287,24 @@ async def _retry_article_extract(db: AsyncSession, failure: IngestionFailure) ->
     if article is None:
         return True
 
-    if len(text) <= len(article.content_en or ''):
+    # Articles written in the target language keep their original text in content_zh.
+    target_family = language_family(settings.translation_target_lang)
+    original = article.content_zh if article.language_detected == target_family else article.content_en
+    if len(text) <= len(original or ''):
         return True
 
-    article.content_en = text
-    article.content_zh = await translate_en_to_zh(text)
-    countries, topics = extract_country_topic_tags(article.title, article.summary, text)
+    article.language_detected = detect_language(article.title, text)
+    article.content_en, article.content_zh = await localize_content(text, article.language_detected)
+    countries, topics = extract_country_topic_tags(article.title, article.summary, article.content_en)
+    record_article(db, article, -1)
     article.country_tags_blob = tags_to_blob(countries)
     article.topic_tags_blob = tags_to_blob(topics)
-    article.china_related = 'china' in countries or is_china_related(article.title, article.summary, text)
+    article.china_related = 'china' in countries or is_china_related(article.title, article.summary, article.content_en)
+    article.embedding = encode_vector(article.title, article.summary, article.content_en)
+    db.info.setdefault('reembedded_ids', []).append(article.id)
+    record_article(db, article)
+    # Reader-language translations were made from the old body.
+    await db.execute(delete(ArticleTranslation).where(ArticleTranslation.article_id == article.id))
     return True
 
 
@@ -196,16 +327,17 @@ async def process_retry_queue(db: AsyncSession) -> tuple[int, int]:
         ok = False
         latest_error = 'unknown retry error'
 
+        token = current_source.set(job.source_name)
         try:
             if job.stage == 'feed_fetch':
                 result = await fetch_feed_with_retry(
-                    SourceConfig(name=job.source_name, feed_url=job.target_url),
+                    source_config(job.source_name, job.target_url),
                     max_attempts=1,
                     backoff_seconds=0,
                 )
                 await _update_source_health(db, result)
                 if result.success:
-                    inserted += await _ingest_items(db, result.items)
+                    inserted += await _ingest_items(db, _drop_known(result.items))
                     ok = True
                 else:
                     latest_error = result.error or latest_error
@@ -218,6 +350,8 @@ async def process_retry_queue(db: AsyncSession) -> tuple[int, int]:
         except Exception as exc:
             latest_error = str(exc)
             ok = False
+        finally:
+            current_source.reset(token)
 
         if ok:
             job.resolved = True
@@ -235,13 +369,29 @@ async def process_retry_queue(db: AsyncSession) -> tuple[int, int]:
 
 
 async def ingest_news_batch(db: AsyncSession) -> int:
+    stats: dict = {}
+    started = perf_counter()
+    with stage_timer('cycle'):
+        inserted = await _run_ingest_cycle(db, stats)
+    stats.update(inserted=inserted, duration_ms=int((perf_counter() - started) * 1000), finished_at=_utcnow().isoformat())
+    await refresh_dashboard(db, stats)
+    await event_bus.publish_dashboard(stats)
+    return inserted
+
+
+async def refresh_dashboard(db: AsyncSession, ingest: dict | None = None) -> None:
+    dashboard.update(sources=await query_source_health(db), retry=await query_retry_metrics(db), ingest=ingest)
+
+
+async def _run_ingest_cycle(db: AsyncSession, stats: dict) -> int:
     inserted_total = 0
 
-    retry_inserted, _ = await process_retry_queue(db)
+    with stage_timer('retry_queue'):
+        retry_inserted, _ = await process_retry_queue(db)
     inserted_total += retry_inserted
 
     source_results = await fetch_all_feeds_with_health()
-    collected_items: list[dict] = []
+    collected_items: list[FeedItem] = []
     for result in source_results:
         await _update_source_health(db, result)
         if result.success:
@@ -257,64 +407,113 @@ async def ingest_news_batch(db: AsyncSession) -> int:
             error=result.error or 'source fetch failed',
         )
 
-    # Keep each cycle bounded so API responsiveness is not affected.
-    seen_urls: set[str] = set()
-    deduped: list[dict] = []
-    for item in sorted(collected_items, key=lambda x: x.get('published_at', _utcnow()), reverse=True):
-        url = strip_tracking_params(item.get('article_url', ''))
-        if not url or url in seen_urls:
-            continue
-        seen_urls.add(url)
-        deduped.append(item)
-        if len(deduped) >= settings.ingest_max_items_per_cycle:
-            break
+    deduped = _select_new_items(collected_items, settings.ingest_max_items_per_cycle)
 
+    stats.update(
+        sources_ok=sum(1 for result in source_results if result.success),
+        sources_failed=sum(1 for result in source_results if not result.success),
+        items_fetched=len(collected_items),
+        items_new=len(deduped),
+    )
     if deduped:
         inserted_total += await _ingest_items(db, deduped)
 
-    await db.commit()
-    if inserted_total:
-        await ws_manager.broadcast_json({'type': 'news_inserted', 'count': inserted_total})
+    await _commit(db)
+    inserted_articles: list[NewsArticle] = db.info.pop('inserted_articles', [])
+    if inserted_articles:
+        related_index.mark_stale()
+        await event_bus.publish_articles([_to_article_event(article) for article in inserted_articles])
+    reembedded_ids: list[int] = db.info.pop('reembedded_ids', [])
+    if reembedded_ids:
+        await event_bus.publish_embeddings(reembedded_ids)
 
     return inserted_total
 
 
-def _choose_content(article: NewsArticle, lang: str) -> str:
-    if lang == 'zh' and article.content_zh:
+def _stored_content(article: NewsArticle, lang: str) -> str | None:
+    if lang == 'zh':
         return article.content_zh
-    return article.content_en
+    # content_en holds the original body of every article not written in the target
+    # language, and the reverse translation of those that are.
+    family = language_family(article.language_detected or '')
+    if lang == family or (lang == 'en' and family == language_family(settings.translation_target_lang)):
+        return article.content_en
+    return None
+
+
+def _choose_content(article: NewsArticle, lang: str, translation: ArticleTranslation | None = None) -> str:
+    if translation is not None and translation.content:
+        return translation.content
+    return _stored_content(article, lang) or article.content_en
 
 
-def _to_news_payload(row: NewsArticle, lang: str) -> dict:
+def _to_news_payload(row: NewsArticle, lang: str, translation: ArticleTranslation | None = None) -> dict:
     return {
         'id': row.id,
         'source_name': row.source_name,
         'source_url': row.source_url,
         'article_url': row.article_url,
-        'title': row.title,
-        'summary': row.summary,
-        'content': _choose_content(row, lang),
+        'title': translation.title if translation is not None else row.title,
+        'summary': translation.summary if translation is not None else row.summary,
+        'content': _choose_content(row, lang, translation),
         'language': lang,
+        'source_lang': row.language_detected,
         'published_at': row.published_at,
         'fetched_at': row.fetched_at,
         'china_related': row.china_related,
         'image_url': row.image_url,
-        'country_tags': blob_to_tags(row.country_tags_blob),
-        'topic_tags': blob_to_tags(row.topic_tags_blob),
+        'country_tags': blob_to_tag_tuple(row.country_tags_blob),
+        'topic_tags': blob_to_tag_tuple(row.topic_tags_blob),
     }
 
 
-async def query_news(
-    db: AsyncSession,
+def _to_article_event(row: NewsArticle, translations: dict[str, ArticleTranslation] | None = None) -> ArticleEvent:
+    # The same card the list API would serve in every reader language, so push
+    # subscribers and REST readers see one article the same way.
+    cards = {}
+    for lang in READER_LANGUAGES:
+        card = _to_news_payload(row, lang, (translations or {}).get(lang))
+        # Cards only render a preview; the detail page loads the full body.
+        card['content'] = card['content'][: settings.ws_card_content_chars]
+        cards[lang] = card
+    search_text = '\n'.join(
+        part for part in (row.title, row.summary, row.content_en, row.content_zh, row.source_name) if part
+    ).lower()
+    return ArticleEvent(
+        id=row.id,
+        source_lang=row.language_detected,
+        china_related=row.china_related,
+        country_tags=blob_to_tag_tuple(row.country_tags_blob),
+        topic_tags=blob_to_tag_tuple(row.topic_tags_blob),
+        search_text=search_text,
+        cards=cards,
+    )
+
+
+async def query_article_events(db: AsyncSession, article_ids: list[int]) -> list[ArticleEvent]:
+    if not article_ids:
+        return []
+    rows = (await db.scalars(select(NewsArticle).where(NewsArticle.id.in_(article_ids)))).all()
+    # Usually none yet, but a peer may announce an article a reader already opened.
+    translations: dict[int, dict[str, ArticleTranslation]] = {}
+    stmt = select(ArticleTranslation).where(ArticleTranslation.article_id.in_(article_ids))
+    for translation in (await db.scalars(stmt)).all():
+        translations.setdefault(translation.article_id, {})[translation.lang] = translation
+    return [_to_article_event(row, translations.get(row.id)) for row in rows]
+
+
+async def query_max_article_id(db: AsyncSession) -> int:
+    return int((await db.scalar(select(func.max(NewsArticle.id)))) or 0)
+
+
+def _news_filters(
     *,
-    lang: str,
     china_only: bool,
     q: str | None,
     country: str | None,
     topic: str | None,
-    limit: int,
-    offset: int,
-) -> tuple[int, list[dict]]:
+    source_lang: str | None,
+) -> list:
     filters = []
     if china_only:
         filters.append(NewsArticle.china_related.is_(True))
@@ -339,25 +538,232 @@ async def query_news(
         topic_slug = normalize_slug(topic)
         filters.append(NewsArticle.topic_tags_blob.like(f"%|{topic_slug}|%"))
 
+    if source_lang:
+        filters.append(NewsArticle.language_detected == source_lang)
+    return filters
+
+
+async def query_news(
+    db: AsyncSession,
+    *,
+    lang: str,
+    china_only: bool,
+    q: str | None,
+    country: str | None,
+    topic: str | None,
+    limit: int,
+    offset: int,
+    source_lang: str | None = None,
+) -> tuple[int, list[dict]]:
+    filters = _news_filters(china_only=china_only, q=q, country=country, topic=topic, source_lang=source_lang)
+    if settings.feed_window_days > 0:
+        # Bounding published_at lets Postgres prune old monthly partitions.
+        filters.append(NewsArticle.published_at >= _utcnow() - timedelta(days=settings.feed_window_days))
+
     total_stmt = select(func.count(NewsArticle.id))
     if filters:
         total_stmt = total_stmt.where(*filters)
     total = int((await db.scalar(total_stmt)) or 0)
 
     stmt = select(NewsArticle)
+    if lang != 'zh':
+        # Only Chinese pages read the translation column; skip loading it.
+        stmt = stmt.options(defer(NewsArticle.content_zh))
     if filters:
         stmt = stmt.where(*filters)
 
     stmt = stmt.order_by(NewsArticle.published_at.desc()).limit(limit).offset(offset)
     rows = (await db.scalars(stmt)).all()
-    return total, [_to_news_payload(row, lang) for row in rows]
+    translations = await _stored_translations(db, rows, lang)
+    return total, [_to_news_payload(row, lang, translations.get(row.id)) for row in rows]
 
 
-async def query_news_detail(db: AsyncSession, article_id: int, lang: str) -> dict | None:
-    row = await db.get(NewsArticle, article_id)
+async def stream_news_export(
+    maker: async_sessionmaker[AsyncSession],
+    *,
+    lang: str,
+    china_only: bool,
+    q: str | None,
+    country: str | None,
+    topic: str | None,
+    source_lang: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    after_id: int,
+    limit: int | None,
+) -> AsyncIterator[bytes]:
+    # One NDJSON line per article in id order, read through a server-side cursor so
+    # memory stays at one chunk whatever the result size. Ids only grow, so a
+    # consumer resumes with after_id=<last id received>.
+    filters = _news_filters(china_only=china_only, q=q, country=country, topic=topic, source_lang=source_lang)
+    if since is not None:
+        filters.append(NewsArticle.published_at >= _as_utc(since))
+    if until is not None:
+        filters.append(NewsArticle.published_at < _as_utc(until))
+    if after_id:
+        filters.append(NewsArticle.id > after_id)
+
+    stmt = select(NewsArticle).where(*filters).order_by(NewsArticle.id.asc())
+    if lang != 'zh':
+        stmt = stmt.options(defer(NewsArticle.content_zh))
+    if limit:
+        stmt = stmt.limit(limit)
+    stmt = stmt.execution_options(yield_per=max(1, settings.export_chunk_rows))
+
+    async with maker() as db:
+        result = await db.stream_scalars(stmt)
+        async for rows in result.partitions():
+            translations = await _stored_translations(db, rows, lang)
+            yield b''.join(dump_json(_to_news_payload(row, lang, translations.get(row.id))) + b'\n' for row in rows)
+            # Drop the chunk from the identity map before fetching the next one.
+            db.expunge_all()
+
+
+async def _stored_translations(db: AsyncSession, rows: list[NewsArticle], lang: str) -> dict[int, ArticleTranslation]:
+    # Lists only show translations that already exist; opening an article is what
+    # produces one.
+    ids = [row.id for row in rows if row.language_detected != lang]
+    if not ids:
+        return {}
+    stmt = select(ArticleTranslation).where(ArticleTranslation.lang == lang, ArticleTranslation.article_id.in_(ids))
+    return {translation.article_id: translation for translation in (await db.scalars(stmt)).all()}
+
+
+async def _produce_translation(maker: async_sessionmaker[AsyncSession], article_id: int, lang: str) -> dict | None:
+    async with maker() as db:
+        # The caller may have looked on a lagging replica, or another process may
+        # have finished first.
+        existing = await db.scalar(
+            select(ArticleTranslation).where(ArticleTranslation.article_id == article_id, ArticleTranslation.lang == lang)
+        )
+        if existing is not None:
+            return {'title': existing.title, 'summary': existing.summary, 'content': existing.content}
+        row = await db.scalar(select(NewsArticle).where(NewsArticle.id == article_id))
+        if row is None:
+            return None
+
+        target = READER_LANGUAGES[lang]
+        body = None if _stored_content(row, lang) else row.content_en
+        title, summary, content = await asyncio.gather(
+            _translate_bounded(row.title, source='auto', target=target),
+            _translate_bounded(row.summary, source='auto', target=target),
+            _translate_bounded(body or '', source='auto', target=target),
+        )
+        if not title or (body and not content):
+            return None
+
+        fields = {'title': title, 'summary': summary or row.summary, 'content': content}
+        await db.execute(
+            insert(ArticleTranslation)
+            .values(article_id=article_id, lang=lang, **fields)
+            .on_conflict_do_nothing(index_elements=['article_id', 'lang'])
+        )
+        await db.commit()
+        return fields
+
+
+async def _article_translation(
+    db: AsyncSession, maker: async_sessionmaker[AsyncSession], row: NewsArticle, lang: str
+) -> ArticleTranslation | None:
+    translation = await db.scalar(
+        select(ArticleTranslation).where(ArticleTranslation.article_id == row.id, ArticleTranslation.lang == lang)
+    )
+    if translation is not None or not settings.enable_translation:
+        return translation
+
+    task = translation_jobs.run(row.id, lang, lambda: _produce_translation(maker, row.id, lang))
+    if task is None:
+        return None
+    try:
+        # Shielded: a reader who gives up does not cancel the job others are waiting on.
+        fields = await asyncio.wait_for(asyncio.shield(task), timeout=settings.translation_request_wait_seconds)
+    except Exception:
+        return None
+    return ArticleTranslation(article_id=row.id, lang=lang, **fields) if fields else None
+
+
+async def query_news_detail(
+    db: AsyncSession, article_id: int, lang: str, maker: async_sessionmaker[AsyncSession] | None = None
+) -> dict | None:
+    # The primary key is (id, published_at) on the partitioned table.
+    row = await db.scalar(select(NewsArticle).where(NewsArticle.id == article_id))
     if row is None:
         return None
-    return _to_news_payload(row, lang)
+    translation = None
+    if row.language_detected != lang:
+        if maker is None:
+            translation = (await _stored_translations(db, [row], lang)).get(row.id)
+        else:
+            translation = await _article_translation(db, maker, row, lang)
+    return _to_news_payload(row, lang, translation)
+
+
+async def prewarm_translations(maker: async_sessionmaker[AsyncSession]) -> int:
+    # Most-viewed articles since the last pass, in every reader language.
+    warmed = 0
+    for article_id in translation_jobs.popular(settings.translation_prewarm_top):
+        async with maker() as db:
+            language = await db.scalar(select(NewsArticle.language_detected).where(NewsArticle.id == article_id))
+        if language is None:
+            continue
+        tasks = []
+        for lang in READER_LANGUAGES:
+            if lang == language:
+                continue
+            task = translation_jobs.run(article_id, lang, lambda lang=lang: _produce_translation(maker, article_id, lang))
+            if task is not None:
+                tasks.append(task)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        warmed += sum(1 for result in results if isinstance(result, dict))
+    return warmed
+
+
+async def query_related(
+    db: AsyncSession,
+    maker: async_sessionmaker[AsyncSession],
+    article_id: int,
+    *,
+    limit: int,
+) -> list[dict] | None:
+    await related_index.ensure_current(maker)
+    vector = related_index.vector_for(article_id)
+    if vector is None:
+        # Older than the in-memory window (or not yet indexed): score its stored vector.
+        row = (await db.execute(select(NewsArticle.id, NewsArticle.embedding).where(NewsArticle.id == article_id))).first()
+        if row is None:
+            return None
+        vector = decode_vector(row.embedding)
+        if vector is None:
+            return []
+
+    matches = related_index.query(vector, k=limit, exclude=article_id)
+    if not matches:
+        return []
+    stmt = select(
+        NewsArticle.id,
+        NewsArticle.title,
+        NewsArticle.source_name,
+        NewsArticle.article_url,
+        NewsArticle.image_url,
+        NewsArticle.published_at,
+        NewsArticle.china_related,
+    ).where(NewsArticle.id.in_([match_id for match_id, _ in matches]))
+    rows = {row.id: row for row in (await db.execute(stmt)).all()}
+    return [
+        {
+            'id': match_id,
+            'title': rows[match_id].title,
+            'source_name': rows[match_id].source_name,
+            'article_url': rows[match_id].article_url,
+            'image_url': rows[match_id].image_url,
+            'published_at': rows[match_id].published_at,
+            'china_related': rows[match_id].china_related,
+            'score': round(score, 4),
+        }
+        # Rows removed by retention since the index was built are skipped.
+        for match_id, score in matches
+        if match_id in rows
+    ]
 
 
 async def query_source_health(db: AsyncSession) -> list[dict]:
@@ -379,23 +785,99 @@ async def query_source_health(db: AsyncSession) -> list[dict]:
 
 
 async def query_filter_options() -> dict[str, list[str]]:
-    return {'countries': supported_countries(), 'topics': supported_topics()}
+    return {'countries': supported_countries(), 'topics': supported_topics(), 'languages': list(LANGUAGES)}
 
 
 async def query_retry_metrics(db: AsyncSession) -> dict[str, int]:
-    now = _utcnow()
-    pending = int(
-        (await db.scalar(select(func.count(IngestionFailure.id)).where(IngestionFailure.resolved.is_(False)))) or 0
-    )
-    due = int(
-        (
-            await db.scalar(
-                select(func.count(IngestionFailure.id)).where(
-                    IngestionFailure.resolved.is_(False),
-                    IngestionFailure.next_retry_at <= now,
-                )
-            )
-        )
-        or 0
+    # Both counts in one pass over idx_ingest_failure_due.
+    stmt = select(
+        func.count(IngestionFailure.id),
+        func.count(IngestionFailure.id).filter(IngestionFailure.next_retry_at <= _utcnow()),
+    ).where(IngestionFailure.resolved.is_(False))
+    pending, due = (await db.execute(stmt)).one()
+    return {'pending': int(pending or 0), 'due': int(due or 0)}
+
+
+def _rollup_filters(
+    *,
+    since: datetime,
+    china_only: bool,
+    country: str | None,
+    topic: str | None,
+    source: str | None,
+    facet: str | None = None,
+) -> list:
+    filters = [NewsRollup.bucket_start >= since]
+
+    country_slug = normalize_slug(country) if country and country.strip() else None
+    topic_slug = normalize_slug(topic) if topic and topic.strip() else None
+
+    if facet == 'country':
+        filters.append(NewsRollup.country != ANY)
+    else:
+        filters.append(NewsRollup.country == (country_slug or ANY))
+
+    if facet == 'topic':
+        filters.append(NewsRollup.topic != ANY)
+    else:
+        filters.append(NewsRollup.topic == (topic_slug or ANY))
+
+    if source and source.strip() and facet != 'source':
+        filters.append(NewsRollup.source_name == source.strip())
+
+    if china_only and facet != 'china':
+        filters.append(NewsRollup.china_related.is_(True))
+
+    return filters
+
+
+async def _facet_counts(db: AsyncSession, column, filters: list) -> list[dict]:
+    total = func.sum(NewsRollup.article_count)
+    stmt = select(column, total).where(*filters).group_by(column).having(total > 0).order_by(total.desc(), column.asc())
+    return [{'value': str(value).lower(), 'count': int(count)} for value, count in (await db.execute(stmt)).all()]
+
+
+async def query_facets(
+    db: AsyncSession,
+    *,
+    china_only: bool,
+    country: str | None,
+    topic: str | None,
+    source: str | None,
+    hours: int,
+) -> dict:
+    # Each facet applies every active filter except its own dimension, so the UI
+    # can show how many stories switching that filter would yield.
+    since = _utcnow() - timedelta(hours=hours)
+    scope = dict(since=since, china_only=china_only, country=country, topic=topic, source=source)
+
+    total = await db.scalar(select(func.sum(NewsRollup.article_count)).where(*_rollup_filters(**scope)))
+    return {
+        'total': int(total or 0),
+        'countries': await _facet_counts(db, NewsRollup.country, _rollup_filters(**scope, facet='country')),
+        'topics': await _facet_counts(db, NewsRollup.topic, _rollup_filters(**scope, facet='topic')),
+        'sources': await _facet_counts(db, NewsRollup.source_name, _rollup_filters(**scope, facet='source')),
+        'china': await _facet_counts(db, NewsRollup.china_related, _rollup_filters(**scope, facet='china')),
+    }
+
+
+async def query_trends(
+    db: AsyncSession,
+    *,
+    china_only: bool,
+    country: str | None,
+    topic: str | None,
+    source: str | None,
+    hours: int,
+    bucket: str,
+) -> list[dict]:
+    since = _utcnow() - timedelta(hours=hours)
+    filters = _rollup_filters(since=since, china_only=china_only, country=country, topic=topic, source=source)
+    bucket_col = NewsRollup.bucket_start if bucket == 'hour' else func.date_trunc('day', NewsRollup.bucket_start)
+    stmt = (
+        select(bucket_col.label('bucket'), func.sum(NewsRollup.article_count))
+        .where(*filters)
+        .group_by('bucket')
+        .order_by('bucket')
     )
-    return {'pending': pending, 'due': due}
+    return [{'bucket_start': value, 'count': int(count)} for value, count in (await db.execute(stmt)).all()]
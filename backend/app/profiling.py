@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+import threading
+from collections import Counter as StackCounter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .metrics import SLOW_QUERIES
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ('select', 'with', 'insert', 'update', 'delete')
+
+
+class RequestTimings:
+    __slots__ = ('db_seconds', 'db_queries', 'spans')
+
+    def __init__(self) -> None:
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.spans: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def header(self, total_seconds: float) -> str:
+        parts = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"']
+        parts.extend(f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.spans.items())
+        parts.append(f'app;dur={total_seconds * 1000:.1f}')
+        return ', '.join(parts)
+
+
+# Set per HTTP request by ServerTimingMiddleware. SQLAlchemy runs cursor events in a
+# greenlet that inherits the caller's context, so query time lands on the request.
+request_timings: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings = request_timings.get()
+        if timings is not None:
+            timings.add(name, perf_counter() - started)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http' or not settings.server_timing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        started = perf_counter()
+
+        async def send_wrapper(message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', timings.header(perf_counter() - started).encode('latin-1')))
+                message['headers'] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings.reset(token)
+
+
+class SlowQueryLog:
+    # Times every cursor execution on the engines it is installed on. Statements over
+    # the threshold are logged, and each distinct statement is EXPLAINed at most once
+    # per explain interval on a separate connection.
+    def __init__(self) -> None:
+        self.slow_queries = 0
+        self._explained: dict[str, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def install(self, engine: AsyncEngine, role: str) -> None:
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, 'before_cursor_execute')
+        def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+            conn.info.setdefault('query_started', []).append(perf_counter())
+
+        @event.listens_for(sync_engine, 'after_cursor_execute')
+        def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+            started = conn.info['query_started'].pop()
+            elapsed = perf_counter() - started
+            timings = request_timings.get()
+            if timings is not None:
+                timings.db_seconds += elapsed
+                timings.db_queries += 1
+            if settings.slow_query_ms > 0 and elapsed * 1000 >= settings.slow_query_ms:
+                self._record(engine, role, statement, parameters, executemany, elapsed)
+
+        @event.listens_for(sync_engine, 'handle_error')
+        def _error(context) -> None:
+            stack = context.connection.info.get('query_started') if context.connection is not None else None
+            if stack:
+                stack.pop()
+
+    def _record(
+        self,
+        engine: AsyncEngine,
+        role: str,
+        statement: str,
+        parameters,
+        executemany: bool,
+        elapsed: float,
+    ) -> None:
+        operation = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else 'unknown'
+        if operation == 'explain':
+            return
+        self.slow_queries += 1
+        SLOW_QUERIES.inc(role, operation)
+        logger.warning(
+            'slow query on %s (%.1f ms): %s | params=%s',
+            role,
+            elapsed * 1000,
+            ' '.join(statement.split()),
+            _truncate(repr(parameters), 500),
+        )
+        if not settings.slow_query_explain or executemany or operation not in _EXPLAINABLE:
+            return
+        if not self._should_explain(statement):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._explain(engine, role, statement, parameters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _should_explain(self, statement: str) -> bool:
+        key = hashlib.blake2b(statement.encode('utf-8'), digest_size=12).hexdigest()
+        now = monotonic()
+        last = self._explained.get(key)
+        if last is not None and now - last < settings.slow_query_explain_interval_seconds:
+            return False
+        if len(self._explained) >= 512:
+            self._explained.clear()
+        self._explained[key] = now
+        return True
+
+    async def _explain(self, engine: AsyncEngine, role: str, statement: str, parameters) -> None:
+        # Plain EXPLAIN does not execute the statement, so writes are safe to plan.
+        args = tuple(parameters) if isinstance(parameters, (list, tuple)) else ()
+        try:
+            async with engine.connect() as conn:
+                raw = (await conn.get_raw_connection()).driver_connection
+                rows = await raw.fetch(f'EXPLAIN {statement}', *args)
+        except Exception as exc:
+            logger.warning('EXPLAIN for slow query on %s failed: %s', role, exc)
+            return
+        plan = '\n'.join(row[0] for row in rows)
+        logger.warning('plan for slow query on %s:\n%s', role, plan)
+
+    def metrics(self) -> dict[str, int]:
+        return {'slow_queries': self.slow_queries, 'pending_explains': len(self._tasks)}
+
+
+def _truncate(value: str, limit: int) -> str:
+    return value if len(value) <= limit else value[:limit] + '...'
+
+
+class SamplingProfiler:
+    # Samples the event loop thread's Python stack from a helper thread and folds
+    # the samples into "frame;frame;frame count" lines, the collapsed-stack format
+    # read by flamegraph.pl, speedscope and inferno.
+    def __init__(self) -> None:
+        self.running = False
+
+    async def capture(self, seconds: float, interval_seconds: float) -> str:
+        if self.running:
+            raise RuntimeError('profiler already running')
+        self.running = True
+        target = threading.get_ident()
+        stop = threading.Event()
+        samples: StackCounter[str] = StackCounter()
+        sampler = threading.Thread(
+            target=self._sample,
+            args=(target, stop, interval_seconds, samples),
+            name='sampling-profiler',
+            daemon=True,
+        )
+        try:
+            sampler.start()
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+            self.running = False
+        lines = [f'{stack} {count}' for stack, count in samples.most_common()]
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _sample(target: int, stop: threading.Event, interval_seconds: float, samples: StackCounter[str]) -> None:
+        while not stop.wait(interval_seconds):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            stack.reverse()
+            samples[';'.join(stack)] += 1
+
+
+slow_query_log = SlowQueryLog()
+profiler = SamplingProfiler()
@@ -1,40 +1,222 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Iterable
+import logging
+from collections import deque
+from dataclasses import dataclass
+from time import time
 
 from fastapi import WebSocket
 
+from .config import settings
+from .language import LANGUAGES
+from .translations import READER_LANGUAGES
+from .utils import dump_json, normalize_slug
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArticleEvent:
+    id: int
+    source_lang: str
+    china_related: bool
+    country_tags: tuple[str, ...]
+    topic_tags: tuple[str, ...]
+    # Lower-cased text of every column the list API searches with ILIKE.
+    search_text: str
+    cards: dict[str, dict]
+
+
+@dataclass(frozen=True)
+class Subscription:
+    lang: str = 'en'
+    china_only: bool = False
+    country: str = ''
+    topic: str = ''
+    q: str = ''
+    source_lang: str = ''
+
+    @classmethod
+    def from_message(cls, message: dict) -> Subscription:
+        lang = message.get('lang')
+        country = str(message.get('country') or '')
+        topic = str(message.get('topic') or '')
+        source_lang = str(message.get('source_lang') or '').strip().lower()
+        return cls(
+            lang=lang if lang in READER_LANGUAGES else 'en',
+            china_only=bool(message.get('china_only')),
+            country=normalize_slug(country) if country.strip() else '',
+            topic=normalize_slug(topic) if topic.strip() else '',
+            q=str(message.get('q') or '').strip().lower(),
+            source_lang=source_lang if source_lang in LANGUAGES else '',
+        )
+
+    def matches(self, event: ArticleEvent) -> bool:
+        if self.china_only and not event.china_related:
+            return False
+        if self.country and self.country not in event.country_tags:
+            return False
+        if self.topic and self.topic not in event.topic_tags:
+            return False
+        if self.source_lang and self.source_lang != event.source_lang:
+            return False
+        if self.q and self.q not in event.search_text:
+            return False
+        return True
+
+
+def _parse_resume_token(raw: object) -> int | None:
+    try:
+        return int(str(raw))
+    except (TypeError, ValueError):
+        return None
+
+
+class _Client:
+    __slots__ = ('websocket', 'queue', 'task', 'subscription')
+
+    def __init__(self, websocket: WebSocket, queue_size: int) -> None:
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max(1, queue_size))
+        self.task: asyncio.Task | None = None
+        self.subscription: Subscription | None = None
+
 
 class ConnectionManager:
+    # Each connection gets a bounded send queue drained by its own task, so a slow
+    # browser only ever delays itself. Messages are encoded once per broadcast.
     def __init__(self) -> None:
-        self._connections: set[WebSocket] = set()
-        self._lock = asyncio.Lock()
+        self._clients: dict[WebSocket, _Client] = {}
+        self._heartbeat_task: asyncio.Task | None = None
+        self.slow_disconnects = 0
+        # Recently published articles for resuming clients. Every article with
+        # id > _floor_id is in _recent; None means we cannot vouch for any range.
+        self._recent: deque[ArticleEvent] = deque()
+        self._floor_id: int | None = None
+        self._last_id = 0
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._clients)
 
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
-        async with self._lock:
-            self._connections.add(websocket)
+        client = _Client(websocket, settings.ws_send_queue_size)
+        client.task = asyncio.create_task(self._drain(client))
+        self._clients[websocket] = client
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
 
     async def disconnect(self, websocket: WebSocket) -> None:
-        async with self._lock:
-            self._connections.discard(websocket)
+        client = self._clients.pop(websocket, None)
+        if client is not None and client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
 
     async def broadcast_json(self, payload: dict) -> None:
-        async with self._lock:
-            conns: Iterable[WebSocket] = tuple(self._connections)
-
-        stale: list[WebSocket] = []
-        for conn in conns:
-            try:
-                await conn.send_json(payload)
-            except Exception:
-                stale.append(conn)
-
-        if stale:
-            async with self._lock:
-                for conn in stale:
-                    self._connections.discard(conn)
+        self.broadcast_text(dump_json(payload).decode())
+
+    def broadcast_text(self, message: str) -> None:
+        for client in tuple(self._clients.values()):
+            self._enqueue(client, message)
+
+    def _enqueue(self, client: _Client, message: str) -> None:
+        try:
+            client.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client is more than a full queue behind; it would only
+            # receive stale pushes, so cut it loose and let it reconnect.
+            self.slow_disconnects += 1
+            asyncio.create_task(self._drop(client, code=1013, reason='client too slow'))
+
+    def seed_resume_floor(self, max_article_id: int) -> None:
+        if self._floor_id is None:
+            self._floor_id = max_article_id
+            self._last_id = max(self._last_id, max_article_id)
+
+    async def subscribe(self, websocket: WebSocket, message: dict) -> None:
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        client.subscription = Subscription.from_message(message)
+
+        token = _parse_resume_token(message.get('resume_token'))
+        if token is not None:
+            if self._floor_id is None or token < self._floor_id:
+                self._enqueue(client, dump_json({'type': 'resync', 'resume_token': str(self._last_id)}).decode())
+                return
+            missed = [event for event in self._recent if event.id > token and client.subscription.matches(event)]
+            if missed:
+                self._enqueue(client, self._delta_message(client.subscription, missed))
+                return
+        self._enqueue(client, dump_json({'type': 'subscribed', 'resume_token': str(self._last_id)}).decode())
+
+    def _delta_message(self, subscription: Subscription, events: list[ArticleEvent]) -> str:
+        # Events carry a card per reader language; the fallback only covers a peer
+        # started with a different READER_LANGUAGES.
+        items = [
+            event.cards.get(subscription.lang) or event.cards['en']
+            for event in sorted(events, key=lambda e: e.id, reverse=True)
+        ]
+        return dump_json({'type': 'news_delta', 'items': items, 'resume_token': str(self._last_id)}).decode()
+
+    async def publish_articles(self, events: list[ArticleEvent]) -> None:
+        if not events:
+            return
+        limit = max(1, settings.ws_replay_buffer_size)
+        for event in sorted(events, key=lambda e: e.id):
+            self._recent.append(event)
+            self._last_id = max(self._last_id, event.id)
+        while len(self._recent) > limit:
+            evicted = self._recent.popleft()
+            self._floor_id = max(self._floor_id or 0, evicted.id)
+
+        # One encoded message per distinct filter set, shared by its subscribers.
+        encoded: dict[Subscription | None, str] = {}
+        for client in tuple(self._clients.values()):
+            subscription = client.subscription
+            message = encoded.get(subscription)
+            if message is None:
+                if subscription is None:
+                    message = dump_json({'type': 'news_inserted', 'count': len(events)}).decode()
+                else:
+                    message = self._delta_message(subscription, [e for e in events if subscription.matches(e)])
+                encoded[subscription] = message
+            self._enqueue(client, message)
+
+    async def _drain(self, client: _Client) -> None:
+        timeout = max(0.1, settings.ws_send_timeout_seconds)
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send_text(message), timeout=timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await self._drop(client)
+
+    async def _drop(self, client: _Client, *, code: int = 1011, reason: str = '') -> None:
+        if self._clients.get(client.websocket) is not client:
+            return
+        await self.disconnect(client.websocket)
+        try:
+            await asyncio.wait_for(client.websocket.close(code=code, reason=reason), timeout=1)
+        except Exception:
+            pass
+
+    async def _heartbeat(self) -> None:
+        interval = max(1.0, settings.ws_heartbeat_seconds)
+        while self._clients:
+            await asyncio.sleep(interval)
+            self.broadcast_text(dump_json({'type': 'heartbeat', 'ts': time()}).decode())
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            'connections': len(self._clients),
+            'queued': sum(client.queue.qsize() for client in self._clients.values()),
+            'slow_disconnects': self.slow_disconnects,
+            'replay_buffer': len(self._recent),
+        }
 
 
 ws_manager = ConnectionManager()
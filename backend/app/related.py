@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .config import settings
+from .models import NewsArticle
+
+# Related coverage by cosine similarity of hashed bag-of-words vectors.
+#
+# At ingest each article gets a signed feature-hashing vector of its title (double
+# weight), summary and the start of its body, stored L2-normalized as packed
+# float16 in news_articles.embedding. Each API process keeps the newest
+# RELATED_INDEX_MAX_ARTICLES vectors in a float32 ring-buffer matrix, so a lookup
+# is one matrix-vector product plus argpartition.
+
+_CONTENT_CHARS = 2000
+_REBUILD_CHUNK_ROWS = 5000
+_TOKEN = re.compile(r'[a-z0-9]{3,}|[一-鿿]+')
+_STOPWORDS = frozenset(
+    (
+        'the and for that with from this have has had was were are been will would could should about after '
+        'before into over their there they them than then also its but not you your our his her she him who '
+        'what when where which while more most some such only other new one two three said says say told '
+        'according reported report reports year years week day days time news people just like can may'
+    ).split()
+)
+
+
+def _tokens(text: str) -> list[str]:
+    tokens: list[str] = []
+    for match in _TOKEN.findall(text.lower()):
+        if match[0] >= '一':
+            # CJK runs have no spaces; overlapping bigrams stand in for words.
+            tokens.extend(match[i : i + 2] for i in range(max(1, len(match) - 1)))
+        elif match not in _STOPWORDS:
+            tokens.append(match)
+    return tokens
+
+
+def encode_vector(title: str, summary: str, content: str) -> bytes | None:
+    counts: Counter[str] = Counter()
+    for token in _tokens(title):
+        counts[token] += 2
+    counts.update(_tokens(summary or ''))
+    counts.update(_tokens((content or '')[:_CONTENT_CHARS]))
+    if not counts:
+        return None
+
+    vector = np.zeros(settings.related_vector_dim, dtype=np.float32)
+    for token, count in counts.items():
+        digest = zlib.crc32(token.encode('utf-8'))
+        # The sign bit spreads collisions around zero instead of piling them up.
+        weight = 1.0 + math.log(count)
+        vector[digest % vector.size] += weight if digest & 0x80000000 else -weight
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return None
+    return (vector / norm).astype('<f2').tobytes()
+
+
+def decode_vector(blob: bytes | None) -> np.ndarray | None:
+    if not blob or len(blob) != settings.related_vector_dim * 2:
+        # Missing, or written with a different RELATED_VECTOR_DIM.
+        return None
+    return np.frombuffer(blob, dtype='<f2').astype(np.float32)
+
+
+class RelatedIndex:
+    def __init__(self, capacity: int, dim: int) -> None:
+        self.capacity = max(1, capacity)
+        self._matrix = np.zeros((self.capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(self.capacity, dtype=np.int64)
+        self._slots: dict[int, int] = {}
+        self._next = 0
+        self.max_id = 0
+        self.loaded = False
+        self._stale = False
+        # Existing articles whose vector was rewritten, and whether to re-read everything.
+        self._changed: set[int] = set()
+        self._reload = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, article_id: int, vector: np.ndarray) -> None:
+        slot = self._slots.get(article_id)
+        if slot is None:
+            # Ring buffer: the oldest article makes room for the newest.
+            slot = self._next
+            self._next = (self._next + 1) % self.capacity
+            previous = int(self._ids[slot])
+            if previous:
+                del self._slots[previous]
+            self._ids[slot] = article_id
+            self._slots[article_id] = slot
+        self._matrix[slot] = vector
+        self.max_id = max(self.max_id, article_id)
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    def mark_changed(self, article_ids: list[int]) -> None:
+        # Before the first load there is nothing to update; the full load reads them.
+        if not self.loaded:
+            return
+        self._changed.update(article_ids)
+        self._stale = True
+
+    def mark_reload(self) -> None:
+        self._changed.clear()
+        self._reload = True
+        self._stale = True
+
+    async def _load(self, db: AsyncSession, *, after_id: int = 0, ids: list[int] | None = None) -> int:
+        stmt = select(NewsArticle.id, NewsArticle.embedding).where(NewsArticle.embedding.is_not(None))
+        if after_id:
+            stmt = stmt.where(NewsArticle.id > after_id)
+        if ids is not None:
+            stmt = stmt.where(NewsArticle.id.in_(ids))
+        stmt = stmt.order_by(NewsArticle.id.desc()).limit(self.capacity)
+        rows: list[tuple[int, bytes]] = []
+        result = await db.stream(stmt.execution_options(yield_per=_REBUILD_CHUNK_ROWS))
+        async for article_id, blob in result:
+            rows.append((article_id, blob))
+        # Oldest first, so the ring buffer keeps the newest.
+        added = 0
+        for article_id, blob in reversed(rows):
+            vector = decode_vector(blob)
+            if vector is None:
+                continue
+            # A re-embedded article that already aged out of a full ring stays out.
+            if ids is not None and article_id not in self._slots and len(self._slots) >= self.capacity:
+                continue
+            self.add(article_id, vector)
+            added += 1
+        return added
+
+    async def ensure_current(self, maker: async_sessionmaker[AsyncSession]) -> None:
+        # Full load on first use, then only rows newer than max_id after new
+        # articles were announced plus re-embedded ids; otherwise lookups never
+        # touch the database. A reload upserts in place, so lookups keep working.
+        if self.loaded and not self._stale:
+            return
+        async with self._lock:
+            if self.loaded and not self._stale:
+                return
+            self._stale = False
+            changed, self._changed = sorted(self._changed), set()
+            reload, self._reload = self._reload or not self.loaded, False
+            async with maker() as db:
+                await self._load(db, after_id=0 if reload else self.max_id)
+                if changed and not reload:
+                    await self._load(db, ids=changed)
+            self.loaded = True
+
+    def query(self, vector: np.ndarray, *, k: int, exclude: int = 0) -> list[tuple[int, float]]:
+        if not self._slots:
+            return []
+        # Slots fill in order and are only ever reused, so until the ring wraps
+        # the occupied rows are exactly the first len(self._slots).
+        scores = self._matrix[: len(self._slots)] @ vector
+        if exclude in self._slots:
+            scores[self._slots[exclude]] = -1.0
+        count = min(k, scores.size)
+        top = np.argpartition(scores, -count)[-count:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [
+            (int(self._ids[slot]), float(scores[slot]))
+            for slot in top
+            if scores[slot] >= settings.related_min_score
+        ]
+
+    def vector_for(self, article_id: int) -> np.ndarray | None:
+        slot = self._slots.get(article_id)
+        return None if slot is None else self._matrix[slot]
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            'articles': float(len(self._slots)),
+            'bytes': float(self._matrix.nbytes),
+            'max_id': float(self.max_id),
+        }
+
+
+related_index = RelatedIndex(settings.related_index_max_articles, settings.related_vector_dim)
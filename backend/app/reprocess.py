@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+# Recomputes derived columns of stored articles after COUNTRY_KEYWORDS,
+# TOPIC_KEYWORDS, CHINA_TERMS or the extractor change.
+#
+#   cd backend && python -m app.reprocess                        # tags + china_related
+#   cd backend && python -m app.reprocess --extract --since-id 120000
+#   cd backend && python -m app.reprocess --embed                # backfill related-article vectors
+#   cd backend && python -m app.reprocess --resume               # continue from the checkpoint
+#
+# Rows are read in id order one keyset page at a time, each page in its own short
+# transaction, so a long run never holds locks that queue partition maintenance
+# (and the ingest behind it) or keeps vacuum from reclaiming rows. Tagging runs in
+# a process pool, and each batch's changed rows are written with a single
+# UPDATE ... FROM unnest(...). The batch's rollup deltas go in the same transaction. The last
+# committed id is checkpointed so an interrupted run can resume, and
+# --rows-per-second paces the scan so live ingest keeps its share of the database.
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import delete, select, text
+
+from .classifier import is_china_related
+from .config import settings
+from .database import SessionLocal, engine
+from .events import event_bus
+from .extractor import extract_article_text
+from .language import detect_language, language_family
+from .models import ArticleTranslation, NewsArticle
+from .news_service import localize_content
+from .related import encode_vector
+from .rollups import flush_rollups, record_cells
+from .tagger import extract_country_topic_tags
+from .utils import tags_to_blob
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    NewsArticle.id,
+    NewsArticle.published_at,
+    NewsArticle.source_name,
+    NewsArticle.article_url,
+    NewsArticle.title,
+    NewsArticle.summary,
+    NewsArticle.content_en,
+    NewsArticle.content_zh,
+    NewsArticle.language_detected,
+    NewsArticle.china_related,
+    NewsArticle.country_tags_blob,
+    NewsArticle.topic_tags_blob,
+)
+_TAG_FIELDS = ('china_related', 'country_tags_blob', 'topic_tags_blob')
+_CONTENT_FIELDS = ('language_detected', 'content_en', 'content_zh')
+# Caches on the API processes are invalidated at most this often during a run.
+_PUBLISH_INTERVAL_SECONDS = 30.0
+
+# The partition key is part of the match so each row is looked up in its own partition.
+_UPDATE_TAGS = text(
+    f'UPDATE {NewsArticle.__tablename__} AS a '
+    'SET china_related = v.china_related, country_tags_blob = v.country_tags_blob, topic_tags_blob = v.topic_tags_blob '
+    'FROM unnest(CAST(:ids AS integer[]), CAST(:published AS timestamptz[]), CAST(:china AS boolean[]), '
+    'CAST(:countries AS text[]), CAST(:topics AS text[])) '
+    'AS v(id, published_at, china_related, country_tags_blob, topic_tags_blob) '
+    'WHERE a.id = v.id AND a.published_at = v.published_at'
+)
+_UPDATE_EMBEDDINGS = text(
+    f'UPDATE {NewsArticle.__tablename__} AS a SET embedding = v.embedding '
+    'FROM unnest(CAST(:ids AS integer[]), CAST(:published AS timestamptz[]), CAST(:embeddings AS bytea[])) '
+    'AS v(id, published_at, embedding) '
+    'WHERE a.id = v.id AND a.published_at = v.published_at'
+)
+_UPDATE_CONTENT = text(
+    f'UPDATE {NewsArticle.__tablename__} AS a '
+    'SET language_detected = v.language_detected, content_en = v.content_en, content_zh = v.content_zh '
+    'FROM unnest(CAST(:ids AS integer[]), CAST(:published AS timestamptz[]), CAST(:languages AS text[]), '
+    'CAST(:content_en AS text[]), CAST(:content_zh AS text[])) '
+    'AS v(id, published_at, language_detected, content_en, content_zh) '
+    'WHERE a.id = v.id AND a.published_at = v.published_at'
+)
+
+
+def retag(texts: list[tuple[str, str, str]], embed: bool) -> list[tuple[tuple[bool, str, str], bytes | None]]:
+    # Runs in the worker processes; takes (title, summary, content_en) per row.
+    results: list[tuple[tuple[bool, str, str], bytes | None]] = []
+    for title, summary, content_en in texts:
+        countries, topics = extract_country_topic_tags(title, summary, content_en)
+        china_related = 'china' in countries or is_china_related(title, summary, content_en)
+        embedding = encode_vector(title, summary, content_en) if embed else None
+        results.append(((china_related, tags_to_blob(countries), tags_to_blob(topics)), embedding))
+    return results
+
+
+def _cells(row: dict) -> dict:
+    return {
+        'published_at': row['published_at'],
+        'source_name': row['source_name'],
+        'china_related': row['china_related'],
+        'country_tags_blob': row['country_tags_blob'],
+        'topic_tags_blob': row['topic_tags_blob'],
+    }
+
+
+async def _refresh_content(row: dict, args: argparse.Namespace, semaphore: asyncio.Semaphore) -> bool:
+    # Articles written in the target language keep their original text in content_zh.
+    target_family = language_family(settings.translation_target_lang)
+    original = (row['content_zh'] if row['language_detected'] == target_family else row['content_en']) or ''
+    body = original
+    async with semaphore:
+        if args.extract:
+            fresh = await extract_article_text(row['article_url'], cached=True)
+            if fresh:
+                body = fresh
+        if body == original and not args.translate:
+            return False
+        language = detect_language(row['title'], body)
+        content_en, content_zh = await localize_content(body, language)
+    if content_zh is None and body == original and language == row['language_detected']:
+        # A failed translation must not wipe the one already stored.
+        content_zh = row['content_zh']
+    if (language, content_en, content_zh) == tuple(row[field] for field in _CONTENT_FIELDS):
+        return False
+    row.update(language_detected=language, content_en=content_en, content_zh=content_zh)
+    return True
+
+
+async def _process_batch(
+    rows: list[dict],
+    pool: ProcessPoolExecutor,
+    workers: int,
+    args: argparse.Namespace,
+    semaphore: asyncio.Semaphore,
+) -> tuple[int, int]:
+    content_rows: list[dict] = []
+    if args.extract or args.translate:
+        changed = await asyncio.gather(*(_refresh_content(row, args, semaphore) for row in rows))
+        content_rows = [row for row, flag in zip(rows, changed) if flag]
+
+    # New body text means a new vector, too.
+    embed = args.embed or bool(content_rows)
+    loop = asyncio.get_running_loop()
+    size = math.ceil(len(rows) / workers)
+    parts = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool, retag, [(row['title'], row['summary'], row['content_en']) for row in rows[i : i + size]], embed
+            )
+            for i in range(0, len(rows), size)
+        )
+    )
+    results = [result for part in parts for result in part]
+    changed_ids = {row['id'] for row in content_rows}
+    embed_rows = [
+        (row, embedding)
+        for row, (_, embedding) in zip(rows, results)
+        if embedding is not None and (args.embed or row['id'] in changed_ids)
+    ]
+
+    async with SessionLocal() as db:
+        tag_rows: list[dict] = []
+        for row, (values, _) in zip(rows, results):
+            if values == tuple(row[field] for field in _TAG_FIELDS):
+                continue
+            record_cells(db, -1, **_cells(row))
+            row.update(zip(_TAG_FIELDS, values))
+            record_cells(db, 1, **_cells(row))
+            tag_rows.append(row)
+        if args.dry_run:
+            return len(tag_rows), len(content_rows)
+
+        if content_rows:
+            await db.execute(
+                _UPDATE_CONTENT,
+                {
+                    'ids': [row['id'] for row in content_rows],
+                    'published': [row['published_at'] for row in content_rows],
+                    'languages': [row['language_detected'] for row in content_rows],
+                    'content_en': [row['content_en'] for row in content_rows],
+                    'content_zh': [row['content_zh'] for row in content_rows],
+                },
+            )
+            # Reader-language translations were made from the old bodies.
+            await db.execute(
+                delete(ArticleTranslation).where(ArticleTranslation.article_id.in_([row['id'] for row in content_rows]))
+            )
+        if embed_rows:
+            await db.execute(
+                _UPDATE_EMBEDDINGS,
+                {
+                    'ids': [row['id'] for row, _ in embed_rows],
+                    'published': [row['published_at'] for row, _ in embed_rows],
+                    'embeddings': [embedding for _, embedding in embed_rows],
+                },
+            )
+        if tag_rows:
+            await db.execute(
+                _UPDATE_TAGS,
+                {
+                    'ids': [row['id'] for row in tag_rows],
+                    'published': [row['published_at'] for row in tag_rows],
+                    'china': [row['china_related'] for row in tag_rows],
+                    'countries': [row['country_tags_blob'] for row in tag_rows],
+                    'topics': [row['topic_tags_blob'] for row in tag_rows],
+                },
+            )
+        await flush_rollups(db)
+        await db.commit()
+    return len(tag_rows), len(content_rows)
+
+
+def _load_checkpoint(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return int(json.loads(path.read_text(encoding='utf-8'))['last_id'])
+
+
+def _save_checkpoint(path: Path, stats: dict) -> None:
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(stats), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+async def _next_page(after_id: int, args: argparse.Namespace) -> list[dict]:
+    stmt = select(*_COLUMNS).where(NewsArticle.id > after_id).order_by(NewsArticle.id).limit(args.batch_size)
+    if args.until_id:
+        stmt = stmt.where(NewsArticle.id <= args.until_id)
+    async with engine.connect() as conn:
+        return [dict(row) for row in (await conn.execute(stmt)).mappings()]
+
+
+async def reprocess(args: argparse.Namespace) -> dict:
+    checkpoint = Path(args.checkpoint)
+    start_id = max(args.since_id, _load_checkpoint(checkpoint) if args.resume else 0)
+
+    workers = max(1, args.workers or os.cpu_count() or 1)
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+    stats = {'last_id': start_id, 'scanned': 0, 'tags_updated': 0, 'content_updated': 0}
+    started = time.monotonic()
+    last_publish = started
+    pending_publish = False
+
+    # spawn: forking a process that runs an event loop and DB pool threads is unsafe.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        while True:
+            rows = await _next_page(stats['last_id'], args)
+            if not rows:
+                break
+            tags_updated, content_updated = await _process_batch(rows, pool, workers, args, semaphore)
+            stats['last_id'] = rows[-1]['id']
+            stats['scanned'] += len(rows)
+            stats['tags_updated'] += tags_updated
+            stats['content_updated'] += content_updated
+            if not args.dry_run:
+                _save_checkpoint(checkpoint, stats)
+                pending_publish = pending_publish or bool(tags_updated or content_updated)
+                if pending_publish and time.monotonic() - last_publish >= _PUBLISH_INTERVAL_SECONDS:
+                    await event_bus.publish_commit()
+                    last_publish = time.monotonic()
+                    pending_publish = False
+            logger.info('reprocess progress: %s', stats)
+
+            if args.rows_per_second > 0:
+                ahead = stats['scanned'] / args.rows_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+
+    if pending_publish:
+        await event_bus.publish_commit()
+    if not args.dry_run and (args.embed or stats['content_updated']):
+        # Every API process re-reads its related-article index once the pass is done.
+        await event_bus.publish_embeddings(None)
+    return stats
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    try:
+        return await reprocess(args)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Recompute tags, classification and optionally content of stored articles.')
+    parser.add_argument('--extract', action='store_true', help='re-extract article text (HTML cache first)')
+    parser.add_argument('--translate', action='store_true', help='re-run translation of the stored text')
+    parser.add_argument('--embed', action='store_true', help='recompute related-article vectors')
+    parser.add_argument('--since-id', type=int, default=0, help='only rows with id greater than this')
+    parser.add_argument('--until-id', type=int, default=0, help='only rows with id up to this (0: no limit)')
+    parser.add_argument('--resume', action='store_true', help='continue after the id in the checkpoint file')
+    parser.add_argument('--checkpoint', default='reprocess.checkpoint.json')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=0, help='tagging processes (0: CPU count)')
+    parser.add_argument('--concurrency', type=int, default=4, help='parallel extractions/translations')
+    parser.add_argument('--rows-per-second', type=float, default=2000, help='scan rate cap (0: unlimited)')
+    parser.add_argument('--dry-run', action='store_true', help='count changes without writing')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    print(json.dumps(asyncio.run(_main(args))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import NewsArticle, NewsRollup
+from .utils import blob_to_tags
+
+ANY = '*'
+_PENDING_KEY = 'rollup_deltas'
+_FLUSH_CHUNK_ROWS = 2000
+# Arbitrary application-wide key so concurrent rebuilds (several workers starting at
+# once) run one at a time; the upsert adds to existing cells, so overlapping
+# rebuilds would count every article twice.
+_REBUILD_LOCK_KEY = 7_340_022
+
+RollupCell = tuple[datetime, str, bool, str, str]
+
+
+def bucket_for(published_at: datetime) -> datetime:
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=timezone.utc)
+    return published_at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_cells(
+    *,
+    published_at: datetime,
+    source_name: str,
+    china_related: bool,
+    country_tags_blob: str,
+    topic_tags_blob: str,
+) -> list[RollupCell]:
+    bucket = bucket_for(published_at)
+    countries = [ANY, *blob_to_tags(country_tags_blob)]
+    topics = [ANY, *blob_to_tags(topic_tags_blob)]
+    return [(bucket, source_name, china_related, country, topic) for country in countries for topic in topics]
+
+
+def _pending(db: AsyncSession) -> Counter:
+    return db.info.setdefault(_PENDING_KEY, Counter())
+
+
+def record_cells(db: AsyncSession, delta: int = 1, **row) -> None:
+    # Deltas ride along with the session and are written by flush_rollups in the
+    # same transaction as the articles they describe.
+    pending = _pending(db)
+    for cell in rollup_cells(**row):
+        pending[cell] += delta
+
+
+def record_article(db: AsyncSession, article: NewsArticle, delta: int = 1) -> None:
+    record_cells(
+        db,
+        delta,
+        published_at=article.published_at,
+        source_name=article.source_name,
+        china_related=article.china_related,
+        country_tags_blob=article.country_tags_blob,
+        topic_tags_blob=article.topic_tags_blob,
+    )
+
+
+async def flush_rollups(db: AsyncSession) -> None:
+    pending: Counter | None = db.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    rows = [
+        {
+            'bucket_start': bucket,
+            'source_name': source_name,
+            'china_related': china_related,
+            'country': country,
+            'topic': topic,
+            'article_count': count,
+        }
+        for (bucket, source_name, china_related, country, topic), count in pending.items()
+        if count
+    ]
+    # Stay well below the asyncpg bind-parameter limit on large rebuilds.
+    for start in range(0, len(rows), _FLUSH_CHUNK_ROWS):
+        stmt = insert(NewsRollup).values(rows[start : start + _FLUSH_CHUNK_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_news_rollup_cell',
+            set_={'article_count': NewsRollup.article_count + stmt.excluded.article_count},
+        )
+        await db.execute(stmt)
+
+
+async def rebuild_rollups(db: AsyncSession, *, chunk_size: int = 2000, only_if_empty: bool = False) -> int:
+    # Held until the commit below; a waiting worker then sees the finished table.
+    await db.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': _REBUILD_LOCK_KEY})
+    if only_if_empty and not await rollups_empty(db):
+        await db.commit()
+        return 0
+    await db.execute(delete(NewsRollup))
+    stmt = select(
+        NewsArticle.published_at,
+        NewsArticle.source_name,
+        NewsArticle.china_related,
+        NewsArticle.country_tags_blob,
+        NewsArticle.topic_tags_blob,
+    ).execution_options(yield_per=chunk_size)
+
+    scanned = 0
+    pending = _pending(db)
+    async for row in await db.stream(stmt):
+        scanned += 1
+        for cell in rollup_cells(
+            published_at=row.published_at,
+            source_name=row.source_name,
+            china_related=row.china_related,
+            country_tags_blob=row.country_tags_blob,
+            topic_tags_blob=row.topic_tags_blob,
+        ):
+            pending[cell] += 1
+
+    await flush_rollups(db)
+    await db.commit()
+    return scanned
+
+
+async def rollups_empty(db: AsyncSession) -> bool:
+    return (await db.scalar(select(NewsRollup.id).limit(1))) is None
@@ -16,6 +16,7 @@ class NewsItem(BaseModel):
     summary: str
     content: str
     language: str
+    source_lang: str
     published_at: datetime
     fetched_at: datetime
     china_related: bool
@@ -34,6 +35,21 @@ class PushEvent(BaseModel):
     count: int
 
 
+class RelatedItem(BaseModel):
+    id: int
+    title: str
+    source_name: str
+    article_url: str
+    image_url: str | None
+    published_at: datetime
+    china_related: bool
+    score: float
+
+
+class RelatedResponse(BaseModel):
+    items: list[RelatedItem]
+
+
 class SourceHealthItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -55,3 +71,55 @@ class SourceHealthResponse(BaseModel):
 class RetryMetrics(BaseModel):
     pending: int
     due: int
+
+
+class IngestStats(BaseModel):
+    finished_at: datetime
+    duration_ms: int
+    inserted: int
+    sources_ok: int
+    sources_failed: int
+    items_fetched: int
+    items_new: int
+
+
+class DashboardResponse(BaseModel):
+    news: NewsListResponse
+    sources: list[SourceHealthItem]
+    retry: RetryMetrics
+    ingest: IngestStats | None
+    generated_at: datetime | None
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    total: int
+    countries: list[FacetCount]
+    topics: list[FacetCount]
+    sources: list[FacetCount]
+    china: list[FacetCount]
+
+
+class TrendPoint(BaseModel):
+    bucket_start: datetime
+    count: int
+
+
+class TrendResponse(BaseModel):
+    bucket: str
+    points: list[TrendPoint]
+
+
+class CacheMetrics(BaseModel):
+    generation: int
+    entries: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    not_modified: int
+    unsettled: int
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .models import NewsArticle
+
+if TYPE_CHECKING:
+    from .sources import FeedItem
+
+# In-memory "already ingested" checks that run before any database query:
+#
+# - per source, a high-water mark (newest published_at) and the GUIDs of recently
+#   handled entries, so a re-polled feed's old entries are dropped immediately;
+# - a process-wide Bloom filter of normalized article URLs, bounded by rotating two
+#   generations and rebuilt from recent articles when the ingest process starts.
+#
+# A Bloom filter can report a URL it has never seen (rate SEEN_URL_ERROR_RATE), so a
+# tiny fraction of new entries may be skipped; it never misses one it has seen.
+# Entries are only remembered after the transaction that handled them commits.
+
+_PENDING_KEY = 'seen_entries'
+_REBUILD_CHUNK_ROWS = 5000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing: k positions from one 128-bit digest.
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SourceMark:
+    __slots__ = ('published_at', 'guids')
+
+    def __init__(self) -> None:
+        self.published_at: datetime | None = None
+        self.guids: OrderedDict[str, None] = OrderedDict()
+
+
+class SeenIndex:
+    def __init__(self) -> None:
+        self._current = self._new_generation()
+        self._previous: BloomFilter | None = None
+        self._marks: dict[str, SourceMark] = {}
+
+    @staticmethod
+    def _new_generation() -> BloomFilter:
+        return BloomFilter(settings.seen_url_capacity, settings.seen_url_error_rate)
+
+    def _mark(self, source_name: str) -> SourceMark:
+        mark = self._marks.get(source_name)
+        if mark is None:
+            mark = self._marks[source_name] = SourceMark()
+        return mark
+
+    def add_url(self, url: str) -> None:
+        if self._current.count >= settings.seen_url_capacity:
+            self._previous, self._current = self._current, self._new_generation()
+        self._current.add(url)
+
+    def has_url(self, url: str) -> bool:
+        return url in self._current or (self._previous is not None and url in self._previous)
+
+    def known(self, item: FeedItem) -> str | None:
+        # Returns why the entry is already known, or None if it has to be looked at.
+        mark = self._marks.get(item.source_name)
+        if mark is not None:
+            if item.guid in mark.guids:
+                return 'guid'
+            grace = timedelta(hours=settings.source_high_water_grace_hours)
+            if mark.published_at is not None and item.published_at < mark.published_at - grace:
+                return 'high_water'
+        if self.has_url(item.article_url):
+            return 'url'
+        return None
+
+    def remember(self, item: FeedItem) -> None:
+        self.add_url(item.article_url)
+        mark = self._mark(item.source_name)
+        if mark.published_at is None or item.published_at > mark.published_at:
+            mark.published_at = item.published_at
+        mark.guids[item.guid] = None
+        mark.guids.move_to_end(item.guid)
+        while len(mark.guids) > settings.seen_guids_per_source:
+            mark.guids.popitem(last=False)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        self._current = self._new_generation()
+        self._previous = None
+        self._marks = {}
+        since = datetime.now(timezone.utc) - timedelta(days=settings.seen_url_rebuild_days)
+        stmt = (
+            select(NewsArticle.article_url, NewsArticle.source_name, NewsArticle.published_at)
+            # published_at prunes partitions and walks idx_news_published_at.
+            .where(NewsArticle.published_at >= since)
+            .order_by(NewsArticle.published_at.desc())
+            .limit(settings.seen_url_capacity)
+            .execution_options(yield_per=_REBUILD_CHUNK_ROWS)
+        )
+        loaded = 0
+        result = await db.stream(stmt)
+        async for url, source_name, published_at in result:
+            self._current.add(url)
+            mark = self._mark(source_name)
+            if mark.published_at is None or published_at > mark.published_at:
+                mark.published_at = published_at
+            loaded += 1
+        return loaded
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            'urls': float(self._current.count + (self._previous.count if self._previous else 0)),
+            'bytes': float(self._current.nbytes + (self._previous.nbytes if self._previous else 0)),
+            'sources': float(len(self._marks)),
+        }
+
+
+def remember_entry(db: AsyncSession, item: FeedItem) -> None:
+    db.info.setdefault(_PENDING_KEY, []).append(item)
+
+
+def apply_remembered(db: AsyncSession) -> None:
+    for item in db.info.pop(_PENDING_KEY, []):
+        seen_index.remember(item)
+
+
+seen_index = SeenIndex()
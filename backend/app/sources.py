@@ -5,17 +5,50 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from time import perf_counter
-
-import aiohttp
-import feedparser
+from typing import TYPE_CHECKING
 
 from .config import settings
+from .downloads import check_feed_type, read_bytes
+from .feed_parser import parse_feed_entries
+from .metrics import stage_timer
+from .utils import strip_tracking_params
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+FETCH_ALWAYS = 'always'
+FETCH_FEED_FIRST = 'feed_first'
+FETCH_NEVER = 'never'
 
 
 @dataclass(frozen=True)
 class SourceConfig:
     name: str
     feed_url: str
+    # always: download every article page; feed_first: use the feed's full-text
+    # content when it is good enough; never: rely on the feed alone.
+    fetch_policy: str = FETCH_FEED_FIRST
+
+
+@dataclass(frozen=True, slots=True)
+class FeedItem:
+    # One feed entry on its way through dedupe and ingest. Thousands are alive per
+    # cycle, so no per-instance __dict__, and the source is shared by reference.
+    source: SourceConfig
+    # Normalized once here; every later step compares and stores this form.
+    article_url: str
+    # RSS guid / Atom id, used by the per-source high-water mark.
+    guid: str
+    title: str
+    summary: str
+    content_html: str
+    published_at: datetime
+    image_url: str | None = None
+
+    @property
+    def source_name(self) -> str:
+        return self.source.name
 
 
 @dataclass(frozen=True)
@@ -24,7 +57,7 @@ class SourceFetchResult:
     success: bool
     attempts: int
     latency_ms: int | None
-    items: list[dict]
+    items: list[FeedItem]
     error: str | None
 
 
@@ -40,54 +73,79 @@ SOURCES: list[SourceConfig] = [
     SourceConfig(name='CNBC Asia', feed_url='https://www.cnbc.com/id/19832390/device/rss/rss.html'),
     SourceConfig(name='China Daily China', feed_url='https://www.chinadaily.com.cn/rss/china_rss.xml'),
 ]
+_SOURCES_BY_NAME = {source.name: source for source in SOURCES}
 
 
-async def _download_text(session: aiohttp.ClientSession, url: str) -> str:
-    async with session.get(url, allow_redirects=True) as response:
-        response.raise_for_status()
-        return await response.text()
+def source_config(name: str, feed_url: str) -> SourceConfig:
+    # Retries are stored by name; keep the configured fetch policy. A source that
+    # was removed from SOURCES since the job was queued falls back to the defaults.
+    return _SOURCES_BY_NAME.get(name) or SourceConfig(name=name, feed_url=feed_url)
 
 
-async def fetch_feed(source: SourceConfig) -> list[dict]:
-    timeout = aiohttp.ClientTimeout(total=settings.request_timeout_seconds)
-    headers = {'User-Agent': settings.user_agent}
-
-    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-        xml = await _download_text(session, source.feed_url)
+async def _download_feed(session: aiohttp.ClientSession, url: str) -> tuple[bytes, str]:
+    async with session.get(url, allow_redirects=True) as response:
+        response.raise_for_status()
+        check_feed_type(response)
+        body = await read_bytes(response, kind='feed', max_bytes=settings.feed_max_bytes)
+        return body, response.headers.get('Content-Type', '')
 
-    parsed = await asyncio.to_thread(feedparser.parse, xml)
 
-    items: list[dict] = []
-    for entry in parsed.entries[: settings.max_articles_per_source]:
-        article_url = entry.get('link', '').strip()
+def _feed_items(source: SourceConfig, entries: list[dict]) -> list[FeedItem]:
+    items: list[FeedItem] = []
+    for entry in entries:
+        link = entry.get('link', '').strip()
+        article_url = strip_tracking_params(link)
         title = entry.get('title', '').strip()
         if not article_url or not title:
             continue
 
         summary = (entry.get('summary') or entry.get('description') or '').strip()
         image_url = None
+        # feedparser exposes content:encoded and Atom <content> as entry.content.
+        bodies = [block.get('value') or '' for block in entry.get('content') or [] if isinstance(block, dict)]
+        content = max(bodies, key=len, default='')
 
         media_content = entry.get('media_content') or []
         if media_content and isinstance(media_content, list):
             image_url = media_content[0].get('url')
 
-        pub_dt = _parse_published(entry)
-
         items.append(
-            {
-                'source_name': source.name,
-                'source_url': source.feed_url,
-                'article_url': article_url,
-                'title': title,
-                'summary': summary,
-                'published_at': pub_dt,
-                'image_url': image_url,
-            }
+            FeedItem(
+                source=source,
+                article_url=article_url,
+                guid=(entry.get('id') or '').strip() or article_url,
+                title=title,
+                summary=summary,
+                content_html=content,
+                published_at=_parse_published(entry),
+                image_url=image_url,
+            )
         )
-
     return items
 
 
+async def fetch_feed(source: SourceConfig) -> list[FeedItem]:
+    # Ingest-only dependencies are imported on first use so API-only workers skip them.
+    import aiohttp
+
+    timeout = aiohttp.ClientTimeout(total=settings.request_timeout_seconds)
+    headers = {'User-Agent': settings.user_agent}
+
+    with stage_timer('feed_download', source.name):
+        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+            body, content_type = await _download_feed(session, source.feed_url)
+
+    # Parsers decode the raw bytes themselves from the XML prolog (or the header charset).
+    with stage_timer('feed_parse', source.name):
+        entries = await asyncio.to_thread(
+            parse_feed_entries,
+            body,
+            max_entries=settings.max_articles_per_source,
+            content_type=content_type,
+        )
+    return _feed_items(source, entries)
+
+
 async def fetch_feed_with_retry(
     source: SourceConfig,
     *,
@@ -132,13 +190,15 @@ async def fetch_feed_with_retry(
 def _parse_published(entry: dict) -> datetime:
     raw = entry.get('published') or entry.get('updated')
     if raw:
-        try:
-            dt = parsedate_to_datetime(raw)
+        # RSS uses RFC 822 dates, Atom and dc:date use ISO 8601.
+        for parse in (parsedate_to_datetime, datetime.fromisoformat):
+            try:
+                dt = parse(raw)
+            except Exception:
+                continue
             if dt.tzinfo is None:
                 return dt.replace(tzinfo=timezone.utc)
             return dt.astimezone(timezone.utc)
-        except Exception:
-            pass
     return datetime.now(timezone.utc)
 
 
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from time import monotonic
+
+from .config import settings
+from .language import language_family
+
+# Reader languages beyond the two stored columns. Translations of title, summary
+# and body are produced on first request and kept in article_translations; this
+# module only holds the per-process job state: one in-flight task per
+# (article, language) that concurrent requests share, a short cooldown after a
+# failed attempt, and view counts that pick articles to pre-warm.
+
+_FAILURE_COOLDOWN_SECONDS = 600.0
+_MAX_TRACKED_VIEWS = 10000
+
+
+def _reader_languages() -> dict[str, str]:
+    # API `lang` (language family) -> translator code.
+    codes = {
+        language_family(settings.translation_source_lang): settings.translation_source_lang,
+        language_family(settings.translation_target_lang): settings.translation_target_lang,
+    }
+    for code in settings.reader_languages.split(','):
+        code = code.strip()
+        if code:
+            codes.setdefault(language_family(code), code)
+    return codes
+
+
+READER_LANGUAGES = _reader_languages()
+
+
+class TranslationJobs:
+    def __init__(self) -> None:
+        self._inflight: dict[tuple[int, str], asyncio.Task] = {}
+        self._failed: dict[tuple[int, str], float] = {}
+        self._views: Counter[int] = Counter()
+        self.started = 0
+        self.joined = 0
+        self.failures = 0
+
+    def pending(self, article_id: int, lang: str) -> bool:
+        return (article_id, lang) in self._inflight
+
+    def run(self, article_id: int, lang: str, produce: Callable[[], Awaitable[dict | None]]) -> asyncio.Task | None:
+        key = (article_id, lang)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.joined += 1
+            return task
+        if self._failed.get(key, 0.0) > monotonic():
+            return None
+        self.started += 1
+        # The task outlives the request that started it, so a slow translation
+        # still lands in the table for the next reader.
+        task = asyncio.create_task(produce())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return task
+
+    def _finished(self, key: tuple[int, str], task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            self.failures += 1
+            self._failed[key] = monotonic() + _FAILURE_COOLDOWN_SECONDS
+        else:
+            self._failed.pop(key, None)
+
+    def record_view(self, article_id: int) -> None:
+        self._views[article_id] += 1
+        if len(self._views) > _MAX_TRACKED_VIEWS:
+            self._views = Counter(dict(self._views.most_common(_MAX_TRACKED_VIEWS // 2)))
+
+    def popular(self, limit: int) -> list[int]:
+        top = [article_id for article_id, _ in self._views.most_common(limit)]
+        # Halve every count so popularity follows recent traffic.
+        self._views = Counter({article_id: count // 2 for article_id, count in self._views.items() if count > 1})
+        now = monotonic()
+        self._failed = {key: until for key, until in self._failed.items() if until > now}
+        return top
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            'inflight': float(len(self._inflight)),
+            'started': float(self.started),
+            'joined': float(self.joined),
+            'failures': float(self.failures),
+            'tracked_views': float(len(self._views)),
+        }
+
+
+translation_jobs = TranslationJobs()
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 import asyncio
 
-from deep_translator import GoogleTranslator
-
 from .config import settings
+from .metrics import stage_timer
 
 
 def _chunk_text(text: str, size: int = 1800) -> list[str]:
@@ -26,7 +25,7 @@ def _chunk_text(text: str, size: int = 1800) -> list[str]:
     return chunks
 
 
-async def translate_en_to_zh(text: str) -> str | None:
+async def translate_text(text: str, *, source: str, target: str) -> str | None:
     if not settings.enable_translation:
         return None
 
@@ -35,11 +34,10 @@ async def translate_en_to_zh(text: str) -> str | None:
         return None
 
     def _translate() -> str | None:
+        from deep_translator import GoogleTranslator
+
         try:
-            translator = GoogleTranslator(
-                source=settings.translation_source_lang,
-                target=settings.translation_target_lang,
-            )
+            translator = GoogleTranslator(source=source, target=target)
             parts = _chunk_text(text[:24000])
             if not parts:
                 return None
@@ -48,4 +46,8 @@ async def translate_en_to_zh(text: str) -> str | None:
         except Exception:
             return None
 
-    return await asyncio.to_thread(_translate)
+    with stage_timer('translate') as timer:
+        translated = await asyncio.to_thread(_translate)
+        if not translated:
+            timer.outcome = 'empty'
+    return translated
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Any
 from urllib.parse import urlsplit, urlunsplit
 
+import orjson
+
 
 def strip_tracking_params(url: str) -> str:
     if not url:
@@ -26,3 +30,14 @@ def blob_to_tags(blob: str) -> list[str]:
     if not blob or blob == '|':
         return []
     return [part for part in blob.split('|') if part]
+
+
+@lru_cache(maxsize=4096)
+def blob_to_tag_tuple(blob: str) -> tuple[str, ...]:
+    # Tag blobs come from a small keyword vocabulary, so the same few hundred
+    # strings repeat across every page; split each one once.
+    return tuple(blob_to_tags(blob))
+
+
+def dump_json(payload: Any) -> bytes:
+    return orjson.dumps(payload)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+# Memory of one ingest cycle's feed items: per-entry dicts (the previous shape) vs
+# the slotted FeedItem.
+#
+#   cd backend && python -m benchmarks.bench_feed_items --items 50000
+#
+# Each representation runs in its own child process so peak RSS is comparable;
+# the child first parses synthetic feeds whose links carry tracking parameters.
+# The child builds every item, runs the in-memory seen filter, the newest-first
+# sort and the per-URL dedupe, and reports traced bytes per item, the peak traced
+# during that pass, RSS growth over the parsed-entries baseline, the process's
+# peak RSS and the wall time of an untraced pass.
+
+import argparse
+import resource
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+
+from app.feed_parser import parse_feed_entries
+from app.news_service import _select_new_items
+from app.seen import seen_index
+from app.sources import SourceConfig, _feed_items, _parse_published
+from app.utils import strip_tracking_params
+
+from .fixtures import synthetic_feeds
+
+_MODES = ('dict', 'slots')
+
+
+def _rss_kb() -> int:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def _dict_items(source: SourceConfig, entries: list[dict]) -> list[dict]:
+    # The representation fetch_feed returned before FeedItem.
+    items: list[dict] = []
+    for entry in entries:
+        article_url = entry.get('link', '').strip()
+        title = entry.get('title', '').strip()
+        if not article_url or not title:
+            continue
+        bodies = [block.get('value') or '' for block in entry.get('content') or [] if isinstance(block, dict)]
+        media_content = entry.get('media_content') or []
+        items.append(
+            {
+                'source_name': source.name,
+                'source_url': source.feed_url,
+                'article_url': article_url,
+                'guid': (entry.get('id') or '').strip() or article_url,
+                'title': title,
+                'summary': (entry.get('summary') or entry.get('description') or '').strip(),
+                'content_html': max(bodies, key=len, default=''),
+                'fetch_policy': source.fetch_policy,
+                'published_at': _parse_published(entry),
+                'image_url': media_content[0].get('url') if media_content else None,
+            }
+        )
+    return items
+
+
+def _dict_select(items: list[dict], limit: int) -> list[dict]:
+    # Seen filter and dedupe as they were, normalizing the URL in each pass.
+    fresh = [item for item in items if not seen_index.has_url(strip_tracking_params(item['article_url']))]
+    seen_urls: set[str] = set()
+    selected: list[dict] = []
+    for item in sorted(fresh, key=lambda x: x['published_at'], reverse=True):
+        url = strip_tracking_params(item['article_url'])
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        selected.append(item)
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+def _load(items: int, per_feed: int) -> list[tuple[SourceConfig, list[dict]]]:
+    # One feed at a time so the generated XML never piles up in the baseline.
+    parsed = []
+    for seed in range(max(1, items // per_feed)):
+        fixture = synthetic_feeds(feeds=1, items=per_feed, paragraphs=1, seed=seed)[0]
+        xml = fixture.xml.replace('.html</link>', '.html?utm_source=rss&amp;utm_medium=feed</link>')
+        source = SourceConfig(name=f'Bench Feed {seed}', feed_url=f'https://news.example.com/{seed}/rss')
+        parsed.append((source, parse_feed_entries(xml.encode('utf-8'), max_entries=per_feed, content_type='')))
+    return parsed
+
+
+def _run(mode: str, items: int, per_feed: int) -> None:
+    parsed = _load(items, per_feed)
+    build = _dict_items if mode == 'dict' else _feed_items
+    select_new = _dict_select if mode == 'dict' else _select_new_items
+
+    rss_before = _rss_kb()
+    tracemalloc.start()
+    collected: list = []
+    for source, entries in parsed:
+        collected.extend(build(source, entries))
+    built = tracemalloc.get_traced_memory()[0]
+    # No cap: every item survives, as in a cycle where all entries are new.
+    selected = select_new(collected, len(collected))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    rss_growth = _rss_kb() - rss_before
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    count = len(collected)
+    del collected, selected
+
+    # Timed again without tracemalloc, which slows allocation-heavy code several-fold.
+    started = perf_counter()
+    collected = []
+    for source, entries in parsed:
+        collected.extend(build(source, entries))
+    select_new(collected, len(collected))
+    elapsed_ms = (perf_counter() - started) * 1000
+
+    print(
+        f'{mode:5s}  items={count}  {built / count:5.0f} B/item  traced_peak={peak / 2**20:5.1f} MB  '
+        f'rss_growth={rss_growth / 1024:5.1f} MB  peak_rss={peak_rss / 1024:6.1f} MB  {elapsed_ms:6.0f} ms'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=50000)
+    parser.add_argument('--per-feed', type=int, default=50)
+    parser.add_argument('--mode', choices=_MODES, help='run one representation in this process')
+    args = parser.parse_args()
+
+    if args.mode:
+        _run(args.mode, args.items, args.per_feed)
+        return
+    for mode in _MODES:
+        command = [sys.executable, '-m', 'benchmarks.bench_feed_items', '--mode', mode]
+        command += ['--items', str(args.items), '--per-feed', str(args.per_feed)]
+        subprocess.run(command, check=True)
+
+
+if __name__ == '__main__':
+    main()
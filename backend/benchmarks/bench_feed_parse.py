@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+# CPU time and peak memory of feed parsing: feedparser vs the streaming parser.
+#
+#   cd backend && python -m benchmarks.bench_feed_parse --rounds 20
+#
+# Uses the recorded feeds from benchmarks.fixtures when present (falls back to the
+# synthetic corpus), parses each one the way fetch_feed does and checks that both
+# parsers agree on the links and titles of the first max_entries items.
+
+import argparse
+import tracemalloc
+from time import process_time
+
+import feedparser
+
+from app.feed_parser import FeedFormatError, parse_feed_fast
+
+from .fixtures import load_feeds
+
+
+def _feedparser(data: bytes, max_entries: int) -> list:
+    return feedparser.parse(data).entries[:max_entries]
+
+
+def _fast(data: bytes, max_entries: int) -> list:
+    return parse_feed_fast(data, max_entries=max_entries)
+
+
+def _cpu_ms(fn, docs: list[bytes], max_entries: int, rounds: int) -> float:
+    started = process_time()
+    for _ in range(rounds):
+        for data in docs:
+            fn(data, max_entries)
+    return (process_time() - started) * 1000 / rounds
+
+
+def _peak_kb(fn, docs: list[bytes], max_entries: int) -> float:
+    peak = 0
+    for data in docs:
+        tracemalloc.start()
+        fn(data, max_entries)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def _key(entry) -> tuple[str, str]:
+    return (entry.get('link') or '').strip(), (entry.get('title') or '').strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--max-entries', type=int, default=30)
+    parser.add_argument('--synthetic', action='store_true', help='ignore recorded fixtures')
+    parser.add_argument('--items', type=int, default=100, help='items per synthetic feed')
+    args = parser.parse_args()
+
+    fixtures = load_feeds(synthetic=args.synthetic, items=args.items)
+    docs: list[bytes] = []
+    mismatched: list[str] = []
+    for fixture in fixtures:
+        data = fixture.xml.encode('utf-8')
+        try:
+            fast = _fast(data, args.max_entries)
+        except FeedFormatError as exc:
+            print(f'{fixture.name}: fast parser falls back ({exc})')
+            continue
+        docs.append(data)
+        if [_key(entry) for entry in fast] != [_key(entry) for entry in _feedparser(data, args.max_entries)]:
+            mismatched.append(fixture.name)
+
+    if not docs:
+        print('no feeds parsed by the fast parser')
+        return
+
+    total_kb = sum(len(data) for data in docs) / 1024
+    print(f'feeds={len(docs)}/{len(fixtures)} size={total_kb:.0f} KB max_entries={args.max_entries} rounds={args.rounds}')
+    results = {}
+    for name, fn in (('feedparser', _feedparser), ('fast', _fast)):
+        results[name] = _cpu_ms(fn, docs, args.max_entries, args.rounds)
+        print(f'{name:<10}  cpu/pass={results[name]:9.2f} ms  peak alloc={_peak_kb(fn, docs, args.max_entries):8.0f} KB')
+    print(f'speedup x{results["feedparser"] / results["fast"]:.1f}')
+    print(f'link/title parity: {"ok" if not mismatched else "differs for " + ", ".join(mismatched)}')
+
+
+if __name__ == '__main__':
+    main()
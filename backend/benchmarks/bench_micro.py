@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+# Micro-benchmarks for the CPU-bound ingest helpers.
+#
+#   cd backend && python -m benchmarks.bench_micro --rounds 50
+
+import argparse
+from time import perf_counter
+
+import feedparser
+
+from app.extractor import extract_text_from_html
+from app.tagger import extract_country_topic_tags
+from app.translator import _chunk_text
+
+from .fixtures import load_feeds
+
+
+def _median_ms(fn, rounds: int) -> float:
+    fn()
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = perf_counter()
+        fn()
+        samples.append(perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--synthetic', action='store_true', help='ignore recorded fixtures')
+    args = parser.parse_args()
+
+    feeds = load_feeds(synthetic=args.synthetic)
+    feed = max(feeds, key=lambda f: len(f.xml))
+    html = max((page for f in feeds for page in f.articles.values()), key=len)
+    text = extract_text_from_html(html) or ''
+    long_text = '\n'.join([text] * max(1, 24000 // max(1, len(text))))
+
+    cases = [
+        (f'feedparser.parse ({len(feed.xml) // 1024} KB feed)', lambda: feedparser.parse(feed.xml)),
+        (f'extract_text_from_html ({len(html) // 1024} KB page)', lambda: extract_text_from_html(html)),
+        (f'extract_country_topic_tags ({len(text)} chars)', lambda: extract_country_topic_tags('title', 'summary', text)),
+        (f'_chunk_text ({len(long_text)} chars)', lambda: _chunk_text(long_text[:24000])),
+    ]
+    print(f'rounds={args.rounds}')
+    for label, fn in cases:
+        print(f'{label:<50} median={_median_ms(fn, args.rounds):9.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+# Related-article lookup latency over a full in-memory index.
+#
+#   cd backend && python -m benchmarks.bench_related --articles 200000 --queries 500
+#
+# Articles are synthetic: each belongs to one of --stories stories that share a
+# handful of salient words, padded with random vocabulary. The report covers the
+# encode cost per article, lookup latency percentiles (matrix product + top-k) and
+# how often the top results come from the same story.
+
+import argparse
+import random
+from time import perf_counter
+
+import numpy as np
+
+from app.config import settings
+from app.related import RelatedIndex, decode_vector, encode_vector
+
+from .common import percentile
+from .fixtures import _WORDS
+
+
+def _article(rng: random.Random, story_words: list[str]) -> tuple[str, str, str]:
+    title = ' '.join(rng.sample(story_words, 4) + rng.choices(_WORDS, k=4))
+    summary = ' '.join(rng.sample(story_words, 3) + rng.choices(_WORDS, k=20))
+    body = ' '.join(rng.choices(story_words, k=15) + rng.choices(_WORDS, k=120))
+    return title, summary, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--articles', type=int, default=200000)
+    parser.add_argument('--stories', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--k', type=int, default=6)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    vocabulary = [f'term{idx}' for idx in range(args.stories * 4)]
+    stories = [rng.sample(vocabulary, 8) for _ in range(args.stories)]
+    index = RelatedIndex(args.articles, settings.related_vector_dim)
+    story_of: dict[int, int] = {}
+
+    started = perf_counter()
+    for article_id in range(1, args.articles + 1):
+        story = rng.randrange(args.stories)
+        vector = decode_vector(encode_vector(*_article(rng, stories[story])))
+        index.add(article_id, vector)
+        story_of[article_id] = story
+    encode_us = (perf_counter() - started) * 1e6 / args.articles
+
+    samples: list[float] = []
+    same_story = 0
+    returned = 0
+    for _ in range(args.queries):
+        article_id = rng.randint(1, args.articles)
+        vector = index.vector_for(article_id)
+        started = perf_counter()
+        matches = index.query(vector, k=args.k, exclude=article_id)
+        samples.append((perf_counter() - started) * 1000)
+        returned += len(matches)
+        same_story += sum(1 for match_id, _ in matches if story_of[match_id] == story_of[article_id])
+
+    samples.sort()
+    print(f'articles={args.articles} dim={settings.related_vector_dim} matrix={index.metrics()["bytes"] / 2**20:.0f} MB')
+    print(f'encode+index  {encode_us:7.1f} us/article')
+    print(
+        f'lookup        p50={percentile(samples, 50):6.2f} ms  p95={percentile(samples, 95):6.2f} ms  '
+        f'p99={percentile(samples, 99):6.2f} ms'
+    )
+    print(f'precision     {same_story / max(1, returned):.2f} of {returned / args.queries:.1f} results/query from the same story')
+    print(f'numpy {np.__version__}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+# Serialization cost of one /api/news page.
+#
+#   cd backend && python -m benchmarks.bench_serialization --items 100 --rounds 200
+
+import argparse
+import random
+import string
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from app.models import NewsArticle
+from app.news_service import _to_news_payload
+from app.schemas import NewsItem, NewsListResponse
+from app.utils import blob_to_tags, dump_json
+
+
+def _paragraphs(rng: random.Random, chars: int) -> str:
+    words: list[str] = []
+    size = 0
+    while size < chars:
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        words.append(word)
+        size += len(word) + 1
+    text = ' '.join(words)[:chars]
+    return '\n'.join(text[i : i + 600] for i in range(0, len(text), 600))
+
+
+def _make_rows(count: int, content_chars: int) -> list[NewsArticle]:
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    rows: list[NewsArticle] = []
+    for idx in range(count):
+        rows.append(
+            NewsArticle(
+                id=idx + 1,
+                source_name='CNN World',
+                source_url='http://rss.cnn.com/rss/edition_world.rss',
+                article_url=f'https://edition.cnn.com/2026/01/01/world/story-{idx}',
+                title=f'Headline number {idx} about world affairs',
+                summary=_paragraphs(rng, 280),
+                content_en=_paragraphs(rng, content_chars),
+                content_zh=None,
+                language_detected='en',
+                published_at=now - timedelta(minutes=idx),
+                fetched_at=now,
+                china_related=idx % 3 == 0,
+                image_url=None,
+                country_tags_blob='|china|united-states|',
+                topic_tags_blob='|economy|politics|',
+            )
+        )
+    return rows
+
+
+def _legacy_payload(row: NewsArticle) -> dict:
+    payload = _to_news_payload(row, 'en')
+    payload['country_tags'] = blob_to_tags(row.country_tags_blob)
+    payload['topic_tags'] = blob_to_tags(row.topic_tags_blob)
+    return payload
+
+
+def _legacy(rows: list[NewsArticle]) -> bytes:
+    # Dict -> NewsItem -> NewsListResponse -> response_model re-validation -> JSON.
+    items = [NewsItem(**_legacy_payload(row)) for row in rows]
+    response = NewsListResponse(total=len(rows), items=items)
+    validated = NewsListResponse.model_validate(response.model_dump())
+    return validated.model_dump_json().encode()
+
+
+def _fast(rows: list[NewsArticle]) -> bytes:
+    return dump_json({'total': len(rows), 'items': [_to_news_payload(row, 'en') for row in rows]})
+
+
+def _measure(fn, rows: list[NewsArticle], rounds: int) -> tuple[float, int]:
+    body = fn(rows)
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = perf_counter()
+        fn(rows)
+        samples.append(perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--content-chars', type=int, default=30000)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    rows = _make_rows(args.items, args.content_chars)
+    legacy_ms, legacy_bytes = _measure(_legacy, rows, args.rounds)
+    fast_ms, fast_bytes = _measure(_fast, rows, args.rounds)
+
+    print(f'items={args.items} content_chars={args.content_chars} rounds={args.rounds}')
+    print(f'legacy  median={legacy_ms:8.3f} ms  body={legacy_bytes} bytes')
+    print(f'fast    median={fast_ms:8.3f} ms  body={fast_bytes} bytes')
+    print(f'speedup x{legacy_ms / fast_ms:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+# Cold import time and resident memory of a worker process.
+#
+#   cd backend && python -m benchmarks.bench_startup --runs 5
+#
+# Each run is a fresh interpreter that imports app.main (what an API-only worker
+# loads) and then the ingest-only dependencies the scheduler process pulls in on
+# its first cycle, reporting the time and RSS after each step.
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = r'''
+import json, sys, time
+
+def rss_mb():
+    with open('/proc/self/statm') as fh:
+        return int(fh.read().split()[1]) * 4096 / 2**20
+
+started = time.perf_counter()
+import app.main
+api_ms = (time.perf_counter() - started) * 1000
+api_rss = rss_mb()
+heavy = sorted(m for m in ('aiohttp', 'apscheduler', 'deep_translator', 'feedparser', 'trafilatura') if m in sys.modules)
+
+started = time.perf_counter()
+import aiohttp, apscheduler.schedulers.asyncio, deep_translator, feedparser, trafilatura
+ingest_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({'api_ms': api_ms, 'api_rss': api_rss, 'heavy': heavy, 'ingest_ms': ingest_ms, 'ingest_rss': rss_mb()}))
+'''
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, '-c', _PROBE], check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    def median(key: str) -> float:
+        return statistics.median(result[key] for result in results)
+
+    print(f'runs={args.runs}')
+    print(f'API-only worker   import app.main      {median("api_ms"):7.0f} ms   rss {median("api_rss"):6.1f} MB')
+    print(f'ingest worker     + ingest dependencies {median("api_ms") + median("ingest_ms"):6.0f} ms   rss {median("ingest_rss"):6.1f} MB')
+    print(f'ingest-only modules loaded by app.main: {", ".join(results[-1]["heavy"]) or "none"}')
+
+
+if __name__ == '__main__':
+    main()
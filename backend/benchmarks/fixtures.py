@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+# Feed and article fixtures for the offline benchmarks.
+#
+# Recorded fixtures live under benchmarks/fixtures/recorded and are captured from
+# the configured SOURCES with:
+#
+#   cd backend && python -m benchmarks.fixtures --record --articles 10
+#
+# When nothing has been recorded, a deterministic synthetic corpus shaped like the
+# real feeds (RSS 2.0, media:content, boilerplate-heavy article pages) is used.
+
+import argparse
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from pathlib import Path
+
+RECORDED_DIR = Path(__file__).parent / 'fixtures' / 'recorded'
+
+_WORDS = (
+    'government minister election market economy inflation trade china beijing washington '
+    'officials said report security military talks summit energy oil climate research '
+    'technology chip company shares investors central bank policy growth ukraine russia '
+    'europe india japan health vaccine outbreak court ruling agreement sanctions exports'
+).split()
+
+
+@dataclass
+class FeedFixture:
+    slug: str
+    name: str
+    xml: str
+    # Original article URL -> article HTML.
+    articles: dict[str, str] = field(default_factory=dict)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(8, 22))
+    return ' '.join(words).capitalize() + '.'
+
+
+def _article_html(rng: random.Random, title: str, paragraphs: int) -> str:
+    body = '\n'.join(f'<p>{" ".join(_sentence(rng) for _ in range(rng.randint(2, 5)))}</p>' for _ in range(paragraphs))
+    nav = ''.join(f'<li><a href="/section/{word}">{word.title()}</a></li>' for word in _WORDS[:25])
+    scripts = '\n'.join(f'<script>window.__cfg{idx} = {{"k": "{"x" * 200}"}};</script>' for idx in range(12))
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{escape(title)}</title>
+<meta property="og:title" content="{escape(title)}">
+{scripts}
+</head><body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main><article>
+<h1>{escape(title)}</h1>
+<div class="byline">By Staff Reporter</div>
+{body}
+</article>
+<aside><h2>Most read</h2><ul>{nav}</ul></aside></main>
+<footer><p>Copyright. All rights reserved.</p><ul>{nav}</ul></footer>
+</body></html>"""
+
+
+def synthetic_feeds(feeds: int = 10, items: int = 30, paragraphs: int = 12, seed: int = 42) -> list[FeedFixture]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    fixtures: list[FeedFixture] = []
+    for feed_idx in range(feeds):
+        slug = f'feed{feed_idx}'
+        fixture = FeedFixture(slug=slug, name=f'Bench Feed {feed_idx}', xml='')
+        entries: list[str] = []
+        for item_idx in range(items):
+            title = f'{_sentence(rng)[:-1]} ({feed_idx}-{item_idx})'
+            url = f'https://news.example.com/{slug}/{item_idx}.html'
+            published = format_datetime(now - timedelta(minutes=feed_idx * items + item_idx))
+            entries.append(
+                f"""<item>
+<title>{escape(title)}</title>
+<link>{url}</link>
+<guid isPermaLink="true">{url}</guid>
+<description>{escape(_sentence(rng) + ' ' + _sentence(rng))}</description>
+<pubDate>{published}</pubDate>
+<media:content url="https://img.example.com/{slug}/{item_idx}.jpg" medium="image" width="1280" height="720"/>
+</item>"""
+            )
+            fixture.articles[url] = _article_html(rng, title, paragraphs)
+        fixture.xml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>{fixture.name}</title><link>https://news.example.com/{slug}</link>
+<description>Synthetic benchmark feed</description>
+{''.join(entries)}
+</channel></rss>"""
+        fixtures.append(fixture)
+    return fixtures
+
+
+def recorded_feeds() -> list[FeedFixture]:
+    manifest_path = RECORDED_DIR / 'manifest.json'
+    if not manifest_path.exists():
+        return []
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    fixtures: list[FeedFixture] = []
+    for entry in manifest['feeds']:
+        fixture = FeedFixture(
+            slug=entry['slug'],
+            name=entry['name'],
+            xml=(RECORDED_DIR / entry['feed_file']).read_text(encoding='utf-8'),
+        )
+        for url, filename in entry['articles'].items():
+            fixture.articles[url] = (RECORDED_DIR / filename).read_text(encoding='utf-8')
+        fixtures.append(fixture)
+    return fixtures
+
+
+def load_feeds(*, synthetic: bool = False, **synthetic_options) -> list[FeedFixture]:
+    if not synthetic:
+        recorded = recorded_feeds()
+        if recorded:
+            return recorded
+    return synthetic_feeds(**synthetic_options)
+
+
+async def record(articles_per_feed: int) -> None:
+    import aiohttp
+    import feedparser
+
+    from app.config import settings
+    from app.sources import SOURCES
+
+    RECORDED_DIR.mkdir(parents=True, exist_ok=True)
+    timeout = aiohttp.ClientTimeout(total=settings.request_timeout_seconds)
+    manifest: dict = {'recorded_at': datetime.now(timezone.utc).isoformat(), 'feeds': []}
+    async with aiohttp.ClientSession(timeout=timeout, headers={'User-Agent': settings.user_agent}) as session:
+        for idx, source in enumerate(SOURCES):
+            slug = re.sub(r'[^a-z0-9]+', '-', source.name.lower()).strip('-') or f'feed{idx}'
+            try:
+                async with session.get(source.feed_url) as response:
+                    xml = await response.text()
+            except Exception as exc:
+                print(f'skip {source.name}: {exc}')
+                continue
+
+            feed_file = f'{slug}.xml'
+            (RECORDED_DIR / feed_file).write_text(xml, encoding='utf-8')
+            entry = {'slug': slug, 'name': source.name, 'feed_file': feed_file, 'articles': {}}
+            for item_idx, item in enumerate(feedparser.parse(xml).entries[:articles_per_feed]):
+                url = item.get('link', '').strip()
+                if not url:
+                    continue
+                try:
+                    async with session.get(url) as response:
+                        html = await response.text()
+                except Exception:
+                    continue
+                filename = f'{slug}-{item_idx}.html'
+                (RECORDED_DIR / filename).write_text(html, encoding='utf-8')
+                entry['articles'][url] = filename
+            manifest['feeds'].append(entry)
+            print(f'recorded {source.name}: {len(entry["articles"])} articles')
+
+    (RECORDED_DIR / 'manifest.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--record', action='store_true')
+    parser.add_argument('--articles', type=int, default=10)
+    args = parser.parse_args()
+    if args.record:
+        asyncio.run(record(args.articles))
+        return
+    feeds = load_feeds()
+    print(f'{len(feeds)} feeds, {sum(len(feed.articles) for feed in feeds)} articles')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+# Read-path load test against a running API.
+#
+#   cd backend && python -m benchmarks.load_test --base-url http://127.0.0.1:8000 \
+#       --concurrency 64 --duration 60
+#
+# Drives a weighted mix of the calls the frontend makes (front page, filtered feeds,
+# search, deep pagination, detail, facets, health) and reports throughput and
+# latency percentiles per call type. Point it at a server backed by a database
+# filled with benchmarks.seed_articles. To measure the database rather than the
+# response cache, start the server with RESPONSE_CACHE_ENABLED=false.
+
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from time import perf_counter
+
+import aiohttp
+
+from app.tagger import supported_countries, supported_topics
+
+from .common import percentile
+
+_SEARCH_TERMS = ('china', 'trade', 'election', 'energy', 'chip', 'court ruling', 'central bank', 'vaccine')
+
+
+@dataclass
+class Stats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    bytes: int = 0
+
+
+class Workload:
+    def __init__(self, base_url: str, api: str, max_id: int, seed: int) -> None:
+        self.base_url = base_url
+        self.api = api
+        self.max_id = max_id
+        self.rng = random.Random(seed)
+        self.countries = supported_countries()
+        self.topics = supported_topics()
+        self.mix = [
+            ('front_page', 30, self.front_page),
+            ('front_page_zh', 10, self.front_page_zh),
+            ('country_filter', 12, self.country_filter),
+            ('topic_filter', 8, self.topic_filter),
+            ('china_only', 8, self.china_only),
+            ('search', 8, self.search),
+            ('pagination', 8, self.pagination),
+            ('detail', 12, self.detail),
+            ('facets', 3, self.facets),
+            ('health', 1, self.health),
+        ]
+        self.names = [name for name, _weight, _fn in self.mix]
+        self.weights = [weight for _name, weight, _fn in self.mix]
+
+    def pick(self) -> tuple[str, str, dict]:
+        name, _weight, fn = self.rng.choices(self.mix, weights=self.weights)[0]
+        path, params = fn()
+        return name, path, params
+
+    def front_page(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'limit': 30}
+
+    def front_page_zh(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'lang': 'zh', 'limit': 30}
+
+    def country_filter(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'country': self.rng.choice(self.countries), 'limit': 30}
+
+    def topic_filter(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'topic': self.rng.choice(self.topics), 'limit': 30}
+
+    def china_only(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'china_only': 'true', 'limit': 30}
+
+    def search(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'q': self.rng.choice(_SEARCH_TERMS), 'limit': 30}
+
+    def pagination(self) -> tuple[str, dict]:
+        return f'{self.api}/news', {'limit': 30, 'offset': 30 * self.rng.randint(1, 20)}
+
+    def detail(self) -> tuple[str, dict]:
+        # Readers mostly open recent articles.
+        article_id = max(1, self.max_id - int(self.rng.expovariate(1 / 2000)))
+        return f'{self.api}/news/{article_id}', {'lang': self.rng.choice(('en', 'zh'))}
+
+    def facets(self) -> tuple[str, dict]:
+        return f'{self.api}/facets', {'hours': self.rng.choice((24, 24 * 7))}
+
+    def health(self) -> tuple[str, dict]:
+        return f'{self.base_url}/health', {}
+
+
+async def _newest_id(session: aiohttp.ClientSession, api: str) -> int:
+    async with session.get(f'{api}/news', params={'limit': 1}) as response:
+        response.raise_for_status()
+        payload = await response.json()
+    items = payload.get('items') or []
+    if not items:
+        raise SystemExit('no articles returned; seed the database first')
+    return int(items[0]['id'])
+
+
+async def _worker(
+    session: aiohttp.ClientSession,
+    workload: Workload,
+    stats: dict[str, Stats],
+    deadline: float,
+) -> None:
+    while perf_counter() < deadline:
+        name, url, params = workload.pick()
+        bucket = stats[name]
+        started = perf_counter()
+        try:
+            async with session.get(url, params=params) as response:
+                body = await response.read()
+                # A missing detail id is an expected outcome of random sampling.
+                if response.status >= 400 and not (name == 'detail' and response.status == 404):
+                    bucket.errors += 1
+                    continue
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            bucket.errors += 1
+            continue
+        bucket.latencies.append((perf_counter() - started) * 1000)
+        bucket.bytes += len(body)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--api-prefix', default='/api')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--warmup', type=float, default=5.0)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    api = f'{base_url}{args.api_prefix}'
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        max_id = await _newest_id(session, api)
+        workload = Workload(base_url, api, max_id, args.seed)
+
+        if args.warmup > 0:
+            warmup = {name: Stats() for name in workload.names}
+            deadline = perf_counter() + args.warmup
+            await asyncio.gather(*(_worker(session, workload, warmup, deadline) for _ in range(args.concurrency)))
+
+        stats = {name: Stats() for name in workload.names}
+        started = perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(_worker(session, workload, stats, deadline) for _ in range(args.concurrency)))
+        elapsed = perf_counter() - started
+
+    total = sum(len(s.latencies) for s in stats.values())
+    errors = sum(s.errors for s in stats.values())
+    print(f'concurrency={args.concurrency} duration={elapsed:.1f}s requests={total} errors={errors} rps={total / elapsed:.1f}')
+    print(f'{"call":<16} {"count":>7} {"errors":>6} {"rps":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"avg KB":>7}')
+    for name in workload.names:
+        bucket = stats[name]
+        count = len(bucket.latencies)
+        print(
+            f'{name:<16} {count:>7} {bucket.errors:>6} {count / elapsed:>8.1f} '
+            f'{percentile(bucket.latencies, 50):>8.1f} {percentile(bucket.latencies, 95):>8.1f} '
+            f'{percentile(bucket.latencies, 99):>8.1f} {bucket.bytes / max(1, count) / 1024:>7.1f}'
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+# Local HTTP server that plays back feed and article fixtures, rewriting article
+# links inside each feed so the ingest pipeline only ever talks to localhost.
+
+import asyncio
+
+from aiohttp import web
+
+from .fixtures import FeedFixture
+
+
+class StubServer:
+    def __init__(self, feeds: list[FeedFixture], *, latency_seconds: float = 0.0) -> None:
+        self.feeds = {feed.slug: feed for feed in feeds}
+        self.latency_seconds = latency_seconds
+        self.requests = 0
+        self.base_url = ''
+        self._runner: web.AppRunner | None = None
+        self._feed_xml: dict[str, str] = {}
+        self._articles: dict[tuple[str, str], str] = {}
+
+    def feed_url(self, slug: str) -> str:
+        return f'{self.base_url}/feeds/{slug}.xml'
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get('/feeds/{slug}.xml', self._feed)
+        app.router.add_get('/articles/{slug}/{idx}.html', self._article)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+
+        for slug, feed in self.feeds.items():
+            xml = feed.xml
+            for idx, (url, html) in enumerate(feed.articles.items()):
+                local = f'{self.base_url}/articles/{slug}/{idx}.html'
+                xml = xml.replace(url, local)
+                self._articles[(slug, str(idx))] = html
+            self._feed_xml[slug] = xml
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _delay(self) -> None:
+        self.requests += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    async def _feed(self, request: web.Request) -> web.Response:
+        await self._delay()
+        xml = self._feed_xml.get(request.match_info['slug'])
+        if xml is None:
+            raise web.HTTPNotFound()
+        return web.Response(text=xml, content_type='application/rss+xml')
+
+    async def _article(self, request: web.Request) -> web.Response:
+        await self._delay()
+        html = self._articles.get((request.match_info['slug'], request.match_info['idx']))
+        if html is None:
+            raise web.HTTPNotFound()
+        return web.Response(text=html, content_type='text/html')
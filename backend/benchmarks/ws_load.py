@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+# Broadcast latency across many local WebSocket clients.
+#
+#   cd backend && python -m benchmarks.ws_load --clients 2000 --messages 20
+#
+# Serves the real /ws/news route (lifespan off, so no database is needed), opens
+# --clients aiohttp connections, then pushes --messages broadcasts through
+# ws_manager and reports the time from broadcast to receipt on every client.
+# Raise the open-file limit first for large runs (ulimit -n 65536).
+
+import argparse
+import asyncio
+import json
+import socket
+from time import perf_counter
+
+import aiohttp
+import uvicorn
+
+from app.main import app
+from app.realtime import ws_manager
+
+from .common import percentile
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _client(
+    session: aiohttp.ClientSession,
+    url: str,
+    expected: int,
+    latencies: list[float],
+    ready: asyncio.Event,
+    opened: list[int],
+    total: int,
+) -> None:
+    async with session.ws_connect(url, heartbeat=None) as ws:
+        opened[0] += 1
+        if opened[0] == total:
+            ready.set()
+        received = 0
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            payload = json.loads(msg.data)
+            if payload.get('type') != 'bench':
+                continue
+            latencies.append((perf_counter() - payload['sent_at']) * 1000)
+            received += 1
+            if received >= expected:
+                break
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--messages', type=int, default=10)
+    parser.add_argument('--interval', type=float, default=0.2)
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, lifespan='off', log_level='warning'))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    url = f'ws://127.0.0.1:{port}/ws/news'
+    latencies: list[float] = []
+    ready = asyncio.Event()
+    opened = [0]
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = perf_counter()
+        clients = [
+            asyncio.create_task(_client(session, url, args.messages, latencies, ready, opened, args.clients))
+            for _ in range(args.clients)
+        ]
+        await asyncio.wait_for(ready.wait(), timeout=120)
+        while ws_manager.connection_count < args.clients:
+            await asyncio.sleep(0.05)
+        print(f'connected {args.clients} clients in {perf_counter() - started:.2f}s')
+
+        broadcast_ms: list[float] = []
+        for _ in range(args.messages):
+            sent = perf_counter()
+            await ws_manager.broadcast_json({'type': 'bench', 'sent_at': sent})
+            broadcast_ms.append((perf_counter() - sent) * 1000)
+            await asyncio.sleep(args.interval)
+
+        await asyncio.wait_for(asyncio.gather(*clients, return_exceptions=True), timeout=120)
+
+    server.should_exit = True
+    await server_task
+
+    expected = args.clients * args.messages
+    print(f'delivered {len(latencies)}/{expected} messages, slow disconnects={ws_manager.slow_disconnects}')
+    print(f'broadcast call  p50={percentile(broadcast_ms, 50):.2f} ms  max={max(broadcast_ms):.2f} ms')
+    for pct in (50, 95, 99):
+        print(f'delivery p{pct}    {percentile(latencies, pct):.2f} ms')
+    print(f'delivery max    {max(latencies, default=0):.2f} ms')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
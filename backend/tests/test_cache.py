@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from app import cache as cache_module
+from app.cache import ResponseCache, etag_matches, make_etag, news_list_key, rollup_key
+from app.schemas import CacheMetrics
+
+
+def _cache() -> ResponseCache:
+    return ResponseCache(max_entries=2, max_bytes=100)
+
+
+def test_get_returns_entry_until_generation_bump():
+    cache = _cache()
+    cache.put(('a',), b'body', cache.generation)
+    assert cache.get(('a',)).body == b'body'
+
+    cache.bump_generation()
+    assert cache.get(('a',)) is None
+
+
+def test_put_from_previous_generation_is_not_stored():
+    cache = _cache()
+    generation = cache.generation
+    cache.bump_generation()
+    entry = cache.put(('a',), b'body', generation)
+    assert entry.body == b'body'
+    assert cache.get(('a',)) is None
+
+
+def test_evicts_least_recently_used_by_count_and_bytes():
+    cache = _cache()
+    cache.put(('a',), b'x', cache.generation)
+    cache.put(('b',), b'x', cache.generation)
+    cache.get(('a',))
+    cache.put(('c',), b'x', cache.generation)
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) is not None
+
+    cache.put(('big',), b'x' * 101, cache.generation)
+    assert cache.get(('big',)) is None
+
+
+def test_replica_reads_wait_for_generation_to_settle(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(cache_module, 'monotonic', lambda: clock[0])
+    cache = _cache()
+    cache.bump_generation()
+
+    clock[0] += 5
+    cache.put(('a',), b'body', cache.generation, min_age=40)
+    assert cache.get(('a',)) is None
+    assert cache.metrics()['unsettled'] == 1
+
+    clock[0] += 40
+    cache.put(('a',), b'body', cache.generation, min_age=40)
+    assert cache.get(('a',)) is not None
+
+
+def test_etag_matching():
+    etag = make_etag(b'body')
+    assert etag == make_etag(b'body') != make_etag(b'other')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"nope", W/{etag}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"nope"', etag)
+
+
+def test_news_list_key_normalizes_filters():
+    first = news_list_key(lang='en', china_only=False, q='  Trade ', country='United States', topic=None, limit=30, offset=0)
+    second = news_list_key(lang='en', china_only=False, q='trade', country='united-states', topic='', limit=30, offset=0)
+    assert first == second
+
+
+def test_metrics_endpoint_model_keeps_every_counter():
+    metrics = _cache().metrics()
+    assert CacheMetrics(**metrics).model_dump() == metrics
+
+
+def test_rollup_key_normalizes_filters():
+    spellings = (('US', 'Economy', 'CNN World'), (' us', 'economy ', ' CNN World '), ('us', 'economy', 'CNN World'))
+    keys = {
+        rollup_key('facets', china_only=False, country=country, topic=topic, source=source, hours=24)
+        for country, topic, source in spellings
+    }
+    assert len(keys) == 1
+
+    empty = dict(china_only=False, country=None, topic=None, source=None, hours=24)
+    assert rollup_key('facets', **empty) == rollup_key('facets', **{**empty, 'country': '', 'topic': ' '})
+    assert rollup_key('trends', **empty, bucket='day') != rollup_key('trends', **empty, bucket='hour')
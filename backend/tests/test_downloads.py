@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.downloads import RejectedContent, check_feed_type, check_html_type, read_bytes, read_text
+from app.metrics import DOWNLOADS_LIMITED
+
+
+class FakeContent:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.read = 0
+
+    async def iter_chunked(self, size: int):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+class FakeResponse:
+    # The parts of aiohttp.ClientResponse the download helpers touch.
+    def __init__(
+        self, chunks: list[bytes], *, content_type: str = 'text/html', charset: str | None = None, headers=None
+    ) -> None:
+        self.content = FakeContent(chunks)
+        self.content_type = content_type
+        self.charset = charset
+        self.headers = {'Content-Type': content_type} if headers is None else headers
+
+
+def _limited(kind: str, reason: str) -> float:
+    return DOWNLOADS_LIMITED._values.get((kind, reason), 0)
+
+
+def test_read_bytes_stops_at_the_cap():
+    response = FakeResponse([b'a' * 4, b'b' * 4, b'c' * 4, b'd' * 4])
+    before = _limited('feed', 'oversize')
+
+    body = asyncio.run(read_bytes(response, kind='feed', max_bytes=10))
+
+    assert body == b'aaaabbbbcc'
+    # The rest of the body is never pulled off the socket.
+    assert response.content.read == 3
+    assert _limited('feed', 'oversize') == before + 1
+
+
+def test_read_bytes_under_the_cap_is_not_counted():
+    before = _limited('feed', 'oversize')
+    assert asyncio.run(read_bytes(FakeResponse([b'abc', b'def']), kind='feed', max_bytes=6)) == b'abcdef'
+    assert _limited('feed', 'oversize') == before
+
+
+def test_read_text_decodes_characters_split_across_chunks():
+    encoded = '北京新闻'.encode('utf-8')
+    # Every character is three bytes; cut one in half at each chunk boundary.
+    chunks = [encoded[:4], encoded[4:8], encoded[8:]]
+    text = asyncio.run(read_text(FakeResponse(chunks, charset='utf-8'), kind='article', max_bytes=1024))
+    assert text == '北京新闻'
+
+
+def test_read_text_uses_the_meta_charset_when_the_header_has_none():
+    html = '<html><head><meta charset="gbk"></head><body>新闻</body></html>'.encode('gbk')
+    text = asyncio.run(read_text(FakeResponse([html[:50], html[50:]]), kind='article', max_bytes=1024))
+    assert '新闻' in text
+
+
+def test_read_text_cut_at_the_cap_ends_cleanly():
+    encoded = ('a' * 5 + '新闻').encode('utf-8')
+    before = _limited('article', 'oversize')
+    # The cap falls inside the first multibyte character.
+    text = asyncio.run(read_text(FakeResponse([encoded], charset='utf-8'), kind='article', max_bytes=7))
+    assert text == 'aaaaa�'
+    assert _limited('article', 'oversize') == before + 1
+
+
+def test_binary_content_types_are_rejected():
+    with pytest.raises(RejectedContent):
+        check_feed_type(FakeResponse([], content_type='application/pdf'))
+    with pytest.raises(RejectedContent):
+        check_feed_type(FakeResponse([], content_type='image/png'))
+    check_feed_type(FakeResponse([], content_type='text/html'))
+    check_feed_type(FakeResponse([], content_type='application/rss+xml'))
+
+
+def test_article_pages_must_be_html():
+    with pytest.raises(RejectedContent):
+        check_html_type(FakeResponse([], content_type='application/json'))
+    check_html_type(FakeResponse([], content_type='application/xhtml+xml'))
+    # No Content-Type header at all: aiohttp falls back to octet-stream.
+    check_html_type(FakeResponse([], content_type='application/octet-stream', headers={}))
+    with pytest.raises(RejectedContent):
+        check_html_type(FakeResponse([], content_type='application/octet-stream'))
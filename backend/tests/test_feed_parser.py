@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.feed_parser import FeedFormatError, parse_feed_entries, parse_feed_fast
+from app.sources import _parse_published
+
+_RSS = b'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"
+     xmlns:media="http://search.yahoo.com/mrss/">
+  <channel>
+    <title>World</title>
+    <item>
+      <title>First story</title>
+      <link>https://news.example.com/first.html</link>
+      <guid isPermaLink="false">story-1</guid>
+      <description>Teaser one</description>
+      <content:encoded><![CDATA[<p>Full body one</p>]]></content:encoded>
+      <media:content url="https://img.example.com/1.jpg" />
+      <pubDate>Sat, 01 Mar 2025 10:42:00 +0100</pubDate>
+    </item>
+    <item>
+      <title>Second story</title>
+      <guid>https://news.example.com/second.html</guid>
+      <description>Teaser two</description>
+    </item>
+    <item>
+      <title>Third story</title>
+      <link>https://news.example.com/third.html</link>
+    </item>
+  </channel>
+</rss>
+'''
+
+_ATOM = b'''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Wire</title>
+  <entry>
+    <title>Atom story</title>
+    <link rel="self" href="https://wire.example.com/api/1" />
+    <link href="https://wire.example.com/story/1" />
+    <id>urn:wire:1</id>
+    <summary>Atom teaser</summary>
+    <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Atom <b>body</b></p></div></content>
+    <updated>2025-03-01T09:00:00Z</updated>
+  </entry>
+</feed>
+'''
+
+
+def test_rss_entries_carry_the_fields_fetch_feed_reads():
+    first, second, _ = parse_feed_fast(_RSS, max_entries=10)
+    assert first == {
+        'title': 'First story',
+        'link': 'https://news.example.com/first.html',
+        'id': 'story-1',
+        'summary': 'Teaser one',
+        'content': [{'value': '<p>Full body one</p>'}],
+        'media_content': [{'url': 'https://img.example.com/1.jpg'}],
+        'published': 'Sat, 01 Mar 2025 10:42:00 +0100',
+    }
+    # A permalink guid stands in for a missing <link>.
+    assert second['link'] == 'https://news.example.com/second.html'
+
+
+def test_parsing_stops_at_max_entries():
+    entries = parse_feed_fast(_RSS, max_entries=2)
+    assert [entry['title'] for entry in entries] == ['First story', 'Second story']
+
+
+def test_atom_prefers_alternate_link_and_keeps_xhtml_markup():
+    (entry,) = parse_feed_fast(_ATOM, max_entries=10)
+    assert entry['link'] == 'https://wire.example.com/story/1'
+    assert entry['id'] == 'urn:wire:1'
+    assert entry['content'] == [{'value': '<div><p>Atom <b>body</b></p></div>'}]
+    assert entry['updated'] == '2025-03-01T09:00:00Z'
+
+
+def test_non_feed_documents_are_rejected():
+    with pytest.raises(FeedFormatError):
+        parse_feed_fast(b'<html><body>Not a feed</body></html>', max_entries=10)
+    with pytest.raises(FeedFormatError):
+        parse_feed_fast(b'', max_entries=10)
+
+
+def test_malformed_feed_falls_back_to_feedparser():
+    broken = _RSS.replace(b'Teaser one', b'Caf&eacute; teaser')
+    with pytest.raises(FeedFormatError):
+        parse_feed_fast(broken, max_entries=10)
+    entries = parse_feed_entries(broken, max_entries=10, content_type='application/rss+xml')
+    assert entries[0]['title'] == 'First story'
+    assert entries[0]['summary'] == 'Café teaser'
+
+
+def test_parse_published_normalizes_to_utc():
+    assert _parse_published({'published': 'Sat, 01 Mar 2025 10:42:00 +0100'}) == datetime(
+        2025, 3, 1, 9, 42, tzinfo=timezone.utc
+    )
+    assert _parse_published({'updated': '2025-03-01T09:00:00Z'}) == datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+    # Naive timestamps are taken as UTC.
+    assert _parse_published({'published': '2025-03-01T09:00:00'}) == datetime(2025, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def test_parse_published_without_usable_date_is_now():
+    for entry in ({}, {'published': 'yesterday'}):
+        assert datetime.now(timezone.utc) - _parse_published(entry) < timedelta(seconds=5)
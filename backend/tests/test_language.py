@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from app.language import detect_language, language_family
+
+
+def test_chinese_and_japanese_are_told_apart_by_kana():
+    assert detect_language('国家主席今天在北京会见了来访的外国代表团') == 'zh'
+    assert detect_language('東京都は今日、新しい経済対策を発表しました') == 'ja'
+    # One stray kana character in a long Chinese text stays under the threshold.
+    assert detect_language('国家主席今天在北京会见了来访的外国代表团，双方就经济合作交换意见の') == 'zh'
+
+
+def test_korean_russian_and_arabic_by_script():
+    assert detect_language('정부는 오늘 새로운 경제 대책을 발표했다') == 'ko'
+    assert detect_language('Правительство объявило о новых экономических мерах') == 'ru'
+    assert detect_language('أعلنت الحكومة اليوم عن إجراءات اقتصادية جديدة') == 'ar'
+
+
+def test_latin_languages_by_stopwords():
+    assert detect_language('Le gouvernement a présenté les mesures pour la relance dans une conférence') == 'fr'
+    assert detect_language('El gobierno presentó las medidas para la economía en una conferencia') == 'es'
+    assert detect_language('Die Regierung hat die Maßnahmen für die Wirtschaft und den Handel vorgestellt') == 'de'
+    assert detect_language('The government said it would present the measures to parliament') == 'en'
+
+
+def test_latin_ties_and_no_stopwords_prefer_english():
+    # 'la' counts for French and Spanish alike, 'the' for English: a three-way tie.
+    assert detect_language('the la') == 'en'
+    assert detect_language('Xylophone quartz jumps') == 'en'
+
+
+def test_english_with_a_few_cjk_quotes_stays_english():
+    text = 'The minister said the slogan 中国梦 was central to the plan announced on Monday in Beijing.'
+    assert detect_language(text) == 'en'
+
+
+def test_title_and_body_are_read_together():
+    assert detect_language('Breaking', '国家主席今天在北京会见了来访的外国代表团') == 'zh'
+
+
+def test_empty_or_digits_only_falls_back_to_default():
+    assert detect_language('') == 'en'
+    assert detect_language('', '2025 - 03 / 01', default='fr') == 'fr'
+    assert detect_language('12345', default='zh') == 'zh'
+
+
+def test_language_family():
+    assert language_family('zh-CN') == 'zh'
+    assert language_family('EN') == 'en'
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from app import maintenance
+from app.config import settings
+from app.migrations import _partition_articles
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple] = (), rowcount: int = 0) -> None:
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+
+class FakeConn:
+    # Records SQL and answers the catalog lookups maintenance and the partitioning
+    # migration make.
+    def __init__(self, *, partitioned: bool, partitions: list[str] = (), max_id: int = 0) -> None:
+        self.partitioned = partitioned
+        self.partitions = list(partitions)
+        self.max_id = max_id
+        self.statements: list[tuple[str, dict | None]] = []
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt.compile(compile_kwargs={'literal_binds': True})) if hasattr(stmt, 'table') else str(stmt)
+        self.statements.append((' '.join(sql.split()), params))
+        if 'pg_inherits' in sql:
+            return FakeResult([(name,) for name in self.partitions])
+        if 'FROM pg_index' in sql:
+            return FakeResult([('news_articles_pkey',), ('uq_news_article_url',), ('idx_news_language',)])
+        if sql.startswith('INSERT INTO news_articles'):
+            return FakeResult(rowcount=params['upper'] - params['lower'])
+        return FakeResult()
+
+    async def scalar(self, stmt, params=None):
+        sql = str(stmt)
+        if 'pg_partitioned_table' in sql:
+            return 1 if self.partitioned else None
+        if 'pg_get_serial_sequence' in sql:
+            return 'public.news_articles_id_seq'
+        if 'MIN(published_at)' in sql:
+            return datetime(2025, 1, 15, tzinfo=timezone.utc)
+        if 'MAX(id)' in sql:
+            return self.max_id
+        raise AssertionError(sql)
+
+    async def run_sync(self, fn):
+        self.statements.append(('CREATE PARTITIONED news_articles', None))
+        self.partitioned = True
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    def sql(self) -> list[str]:
+        return [sql for sql, _ in self.statements]
+
+
+def test_retention_uses_one_month_boundary_for_articles_and_rollups(monkeypatch):
+    monkeypatch.setattr(settings, 'article_retention_days', 30)
+    monkeypatch.setattr(settings, 'article_retention_mode', 'drop')
+    monkeypatch.setattr(maintenance, '_utcnow', lambda: datetime(2025, 4, 20, 12, tzinfo=timezone.utc))
+    conn = FakeConn(
+        partitioned=True,
+        partitions=['news_articles_p202502', 'news_articles_p202503', 'news_articles_p202504', 'news_articles_default'],
+    )
+
+    assert asyncio.run(maintenance.apply_article_retention(conn)) == 1
+
+    # The cutoff (March 21) falls inside March: February goes, March stays whole,
+    # and neither the default partition nor the rollups lose anything after March 1.
+    boundary = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    statements = conn.statements
+    assert ('DROP TABLE news_articles_p202502', None) in statements
+    assert not any('p202503' in sql and 'DETACH' in sql for sql, _ in statements)
+    assert ('DELETE FROM news_articles_default WHERE published_at < :boundary', {'boundary': boundary}) in statements
+    rollup_delete = next(sql for sql, _ in statements if sql.startswith('DELETE FROM news_rollups'))
+    assert "bucket_start < '2025-03-01 00:00:00+00:00'" in rollup_delete
+
+
+def test_partition_upkeep_fails_loudly_on_a_plain_table():
+    with pytest.raises(RuntimeError, match='not partitioned'):
+        asyncio.run(maintenance.ensure_article_partitions(FakeConn(partitioned=False)))
+
+
+def test_migration_converts_a_plain_table(monkeypatch):
+    monkeypatch.setattr(maintenance, '_utcnow', lambda: datetime(2025, 3, 10, tzinfo=timezone.utc))
+    monkeypatch.setattr(settings, 'article_partition_months_ahead', 1)
+    conn = FakeConn(partitioned=False, max_id=45000)
+
+    asyncio.run(_partition_articles(conn))
+    sql = conn.sql()
+
+    assert sql[0] == 'ALTER TABLE news_articles RENAME TO news_articles_unpartitioned'
+    assert 'ALTER INDEX "news_articles_pkey" RENAME TO "news_articles_pkey_legacy"' in sql
+    assert 'ALTER INDEX "uq_news_article_url" RENAME TO "uq_news_article_url_legacy"' in sql
+    assert 'ALTER SEQUENCE public.news_articles_id_seq RENAME TO news_articles_unpartitioned_id_seq' in sql
+    created = sql.index('CREATE PARTITIONED news_articles')
+    # Monthly partitions from the oldest row's month through the months ahead.
+    months = [re.search(r'news_articles_p(\d{6})', stmt).group(1) for stmt in sql if 'FOR VALUES' in stmt]
+    assert months == ['202501', '202502', '202503', '202504']
+    copies = [params for stmt, params in conn.statements if stmt.startswith('INSERT INTO news_articles')]
+    assert copies == [{'lower': 0, 'upper': 20000}, {'lower': 20000, 'upper': 40000}, {'lower': 40000, 'upper': 60000}]
+    assert sql.index(next(s for s in sql if s.startswith('INSERT'))) > created
+    setval = next(params for stmt, params in conn.statements if stmt.startswith('SELECT setval'))
+    assert setval == {'name': 'news_articles', 'next_id': 45001}
+    assert sql[-1] == 'DROP TABLE news_articles_unpartitioned'
+
+
+def test_migration_leaves_a_partitioned_table_alone():
+    conn = FakeConn(partitioned=True)
+    asyncio.run(_partition_articles(conn))
+    assert conn.statements == []
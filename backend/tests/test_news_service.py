@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app import news_service
+from app.config import settings
+from app.models import ArticleTranslation, NewsArticle
+from app.sources import FETCH_ALWAYS, FETCH_FEED_FIRST, SOURCES, SourceConfig, SourceFetchResult, source_config
+
+
+class FakeJobSession:
+    def __init__(self, jobs: list) -> None:
+        self.jobs = jobs
+
+    async def scalars(self, stmt):
+        return SimpleNamespace(all=lambda: self.jobs)
+
+
+def _feed_job(source_name: str, target_url: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        stage='feed_fetch',
+        source_name=source_name,
+        target_url=target_url,
+        resolved=False,
+        last_error='timeout',
+        retry_count=0,
+        max_retries=3,
+        next_retry_at=datetime(2025, 3, 1, tzinfo=timezone.utc),
+    )
+
+
+def _run_feed_retry(monkeypatch, job) -> list[SourceConfig]:
+    fetched: list[SourceConfig] = []
+
+    async def fake_fetch(source, *, max_attempts, backoff_seconds):
+        fetched.append(source)
+        return SourceFetchResult(source=source, success=True, attempts=1, latency_ms=5, items=[], error=None)
+
+    async def fake_health(db, result):
+        return None
+
+    async def fake_ingest(db, items):
+        return 0
+
+    monkeypatch.setattr(news_service, 'fetch_feed_with_retry', fake_fetch)
+    monkeypatch.setattr(news_service, '_update_source_health', fake_health)
+    monkeypatch.setattr(news_service, '_ingest_items', fake_ingest)
+    assert asyncio.run(news_service.process_retry_queue(FakeJobSession([job]))) == (0, 1)
+    assert job.resolved
+    return fetched
+
+
+def test_feed_retry_keeps_configured_fetch_policy(monkeypatch):
+    configured = SourceConfig(name='Full Text Wire', feed_url='https://wire.example.com/rss', fetch_policy=FETCH_ALWAYS)
+    monkeypatch.setattr('app.sources._SOURCES_BY_NAME', {configured.name: configured})
+
+    fetched = _run_feed_retry(monkeypatch, _feed_job(configured.name, configured.feed_url))
+    assert fetched == [configured]
+
+
+def test_feed_retry_for_removed_source_uses_defaults(monkeypatch):
+    fetched = _run_feed_retry(monkeypatch, _feed_job('Retired Feed', 'https://old.example.com/rss'))
+    assert fetched == [SourceConfig(name='Retired Feed', feed_url='https://old.example.com/rss')]
+    assert fetched[0].fetch_policy == FETCH_FEED_FIRST
+
+
+def test_source_config_returns_listed_source():
+    assert source_config(SOURCES[0].name, 'https://elsewhere.example.com/rss') is SOURCES[0]
+
+
+def _article(language: str, content_en: str, content_zh: str) -> NewsArticle:
+    return NewsArticle(
+        id=7,
+        title='Titre',
+        summary='Résumé',
+        language_detected=language,
+        content_en=content_en,
+        content_zh=content_zh,
+    )
+
+
+def test_stored_content_english_only_for_english_or_chinese_articles():
+    english = _article('en', 'Original English body', '中文译文')
+    chinese = _article('zh', 'Reverse-translated English body', '中文原文')
+    french = _article('fr', 'Corps original en français', '中文译文')
+
+    assert news_service._stored_content(english, 'en') == 'Original English body'
+    assert news_service._stored_content(chinese, 'en') == 'Reverse-translated English body'
+    assert news_service._stored_content(french, 'en') is None
+    assert news_service._stored_content(french, 'fr') == 'Corps original en français'
+    assert news_service._stored_content(french, 'zh') == '中文译文'
+
+
+class FakeTranslationSession:
+    def __init__(self, article: NewsArticle) -> None:
+        self.results = [None, article]
+        self.inserted: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def scalar(self, stmt):
+        return self.results.pop(0)
+
+    async def execute(self, stmt):
+        self.inserted.append(stmt)
+
+    async def commit(self):
+        return None
+
+
+def test_french_article_read_in_english_gets_its_body_translated(monkeypatch):
+    calls: list[tuple[str, str]] = []
+
+    async def fake_translate(text, *, source, target):
+        calls.append((text, target))
+        return f'[{target}] {text}' if text else ''
+
+    monkeypatch.setattr(news_service, '_translate_bounded', fake_translate)
+    db = FakeTranslationSession(_article('fr', 'Corps original en français', '中文译文'))
+    fields = asyncio.run(news_service._produce_translation(lambda: db, 7, 'en'))
+
+    assert ('Corps original en français', 'en') in calls
+    assert fields['content'] == '[en] Corps original en français'
+    assert len(db.inserted) == 1
+
+
+def test_chinese_article_read_in_english_keeps_stored_body(monkeypatch):
+    async def fake_translate(text, *, source, target):
+        return f'[{target}] {text}' if text else ''
+
+    monkeypatch.setattr(news_service, '_translate_bounded', fake_translate)
+    db = FakeTranslationSession(_article('zh', 'Reverse-translated English body', '中文原文'))
+    fields = asyncio.run(news_service._produce_translation(lambda: db, 7, 'en'))
+
+    assert fields['title'] == '[en] Titre'
+    assert fields['content'] == ''
+    article = _article('zh', 'Reverse-translated English body', '中文原文')
+    assert news_service._choose_content(article, 'en') == 'Reverse-translated English body'
+
+
+def test_feed_body_usable_rejects_short_teaser_and_cut_off_bodies(monkeypatch):
+    monkeypatch.setattr(settings, 'feed_content_min_chars', 200)
+    summary = 'A short teaser about the story.'
+    body = 'The full article text. ' * 20
+
+    assert news_service._feed_body_usable(body, summary)
+    assert not news_service._feed_body_usable('Too short.', summary)
+    # Long enough, but barely more than the summary it would replace.
+    assert not news_service._feed_body_usable(body, body[:-10])
+    for ending in ('...', ' […]', ' Read more', ' Continue reading »'):
+        assert not news_service._feed_body_usable(body + ending, summary)
+
+
+def test_push_cards_cover_every_reader_language(monkeypatch):
+    monkeypatch.setattr(news_service, 'READER_LANGUAGES', {'en': 'en', 'zh': 'zh-CN', 'fr': 'fr', 'ja': 'ja'})
+    article = _article('fr', 'Corps original en français', '中文译文')
+    article.country_tags_blob = '|france|'
+    article.topic_tags_blob = '|'
+    translated = ArticleTranslation(article_id=7, lang='ja', title='タイトル', summary='要約', content='本文')
+
+    event = news_service._to_article_event(article, {'ja': translated})
+
+    assert set(event.cards) == {'en', 'zh', 'fr', 'ja'}
+    assert event.cards['fr']['content'] == 'Corps original en français'
+    assert event.cards['fr']['language'] == 'fr'
+    assert event.cards['zh']['content'] == '中文译文'
+    assert (event.cards['ja']['title'], event.cards['ja']['content']) == ('タイトル', '本文')
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.config import settings
+from app.realtime import ArticleEvent, ConnectionManager, Subscription, _Client
+
+
+def _event(article_id: int, **fields) -> ArticleEvent:
+    values = {
+        'source_lang': 'en',
+        'china_related': False,
+        'country_tags': ('united-states',),
+        'topic_tags': ('economy',),
+        'search_text': f'story {article_id} about trade tariffs',
+        'cards': {'en': {'id': article_id, 'lang': 'en'}, 'zh': {'id': article_id, 'lang': 'zh'}},
+    }
+    values.update(fields)
+    return ArticleEvent(id=article_id, **values)
+
+
+def _client(manager: ConnectionManager, key: str) -> _Client:
+    client = _Client(key, queue_size=16)
+    manager._clients[key] = client
+    return client
+
+
+def _messages(client: _Client) -> list[dict]:
+    messages = []
+    while not client.queue.empty():
+        messages.append(json.loads(client.queue.get_nowait()))
+    return messages
+
+
+def test_subscription_normalizes_filters():
+    subscription = Subscription.from_message(
+        {'lang': 'xx', 'china_only': 1, 'country': ' United States ', 'q': '  Tariffs ', 'source_lang': 'EN'}
+    )
+    assert subscription == Subscription(
+        lang='en', china_only=True, country='united-states', q='tariffs', source_lang='en'
+    )
+    assert Subscription.from_message({'source_lang': 'klingon'}).source_lang == ''
+
+
+def test_subscription_matches_like_the_list_filters():
+    event = _event(1)
+    assert Subscription().matches(event)
+    assert Subscription(country='united-states', topic='economy', q='tariffs', source_lang='en').matches(event)
+    assert not Subscription(china_only=True).matches(event)
+    assert not Subscription(country='china').matches(event)
+    assert not Subscription(topic='sports').matches(event)
+    assert not Subscription(source_lang='fr').matches(event)
+    assert not Subscription(q='election').matches(event)
+
+
+def test_publish_sends_matching_cards_in_the_subscribed_language():
+    manager = ConnectionManager()
+    china = _client(manager, 'china')
+    everyone = _client(manager, 'everyone')
+    legacy = _client(manager, 'legacy')
+    china.subscription = Subscription(lang='zh', china_only=True)
+    everyone.subscription = Subscription()
+
+    asyncio.run(manager.publish_articles([_event(1), _event(2, china_related=True)]))
+
+    assert _messages(china) == [{'type': 'news_delta', 'items': [{'id': 2, 'lang': 'zh'}], 'resume_token': '2'}]
+    assert [item['id'] for item in _messages(everyone)[0]['items']] == [2, 1]
+    assert _messages(legacy) == [{'type': 'news_inserted', 'count': 2}]
+
+
+def test_resume_token_replays_missed_articles():
+    manager = ConnectionManager()
+    manager.seed_resume_floor(10)
+    asyncio.run(manager.publish_articles([_event(11), _event(12), _event(13)]))
+    client = _client(manager, 'returning')
+
+    asyncio.run(manager.subscribe('returning', {'resume_token': '11'}))
+    (message,) = _messages(client)
+    assert message['type'] == 'news_delta'
+    assert [item['id'] for item in message['items']] == [13, 12]
+    assert message['resume_token'] == '13'
+
+    # Up to date: nothing to replay.
+    asyncio.run(manager.subscribe('returning', {'resume_token': '13'}))
+    assert _messages(client) == [{'type': 'subscribed', 'resume_token': '13'}]
+
+
+def test_resume_token_older_than_the_buffer_asks_for_resync(monkeypatch):
+    monkeypatch.setattr(settings, 'ws_replay_buffer_size', 2)
+    manager = ConnectionManager()
+    manager.seed_resume_floor(10)
+    asyncio.run(manager.publish_articles([_event(11), _event(12), _event(13)]))
+    client = _client(manager, 'returning')
+
+    asyncio.run(manager.subscribe('returning', {'resume_token': '10'}))
+    assert _messages(client) == [{'type': 'resync', 'resume_token': '13'}]
+
+    # Without a seeded floor no range can be vouched for.
+    fresh = ConnectionManager()
+    other = _client(fresh, 'other')
+    asyncio.run(fresh.subscribe('other', {'resume_token': '5'}))
+    assert _messages(other)[0]['type'] == 'resync'
+
+
+def test_dashboard_panels_are_pushed_only_when_they_change(monkeypatch):
+    from app import events
+    from app.dashboard import DashboardSnapshot
+
+    manager = ConnectionManager()
+    client = _client(manager, 'page')
+    snapshot = DashboardSnapshot()
+    monkeypatch.setattr(events, 'ws_manager', manager)
+    monkeypatch.setattr(events, 'dashboard', snapshot)
+    monkeypatch.setattr(settings, 'event_bus_enabled', False)
+    bus = events.EventBus()
+    sources = [{'source_name': 'Wire', 'last_status': 'up'}]
+
+    snapshot.update(sources=sources, retry={'pending': 2, 'due': 1}, ingest=None)
+    asyncio.run(bus.publish_dashboard({'inserted': 3}))
+    assert _messages(client) == [{'type': 'dashboard', 'sources': sources, 'retry': {'pending': 2, 'due': 1}}]
+
+    snapshot.update(sources=list(sources), retry={'pending': 2, 'due': 1}, ingest={'inserted': 0})
+    asyncio.run(bus.publish_dashboard({'inserted': 0}))
+    assert _messages(client) == []
+
+    snapshot.update(sources=sources, retry={'pending': 0, 'due': 0}, ingest=None)
+    asyncio.run(bus.publish_dashboard({'inserted': 0}))
+    assert _messages(client)[0]['retry'] == {'pending': 0, 'due': 0}
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import re
+
+import numpy as np
+
+from app.config import settings
+from app.related import RelatedIndex, decode_vector, encode_vector
+
+_QUAKE = (
+    'Earthquake strikes coastal Chile, tsunami warning issued',
+    'A magnitude 7.8 earthquake struck off the Chilean coast on Monday.',
+    'The earthquake shook buildings in Valparaiso and Santiago; authorities issued a tsunami warning '
+    'for the coast and ordered evacuations while rescue teams searched collapsed buildings.',
+)
+_QUAKE_FOLLOWUP = (
+    'Chile earthquake: rescue teams search collapsed buildings after tsunami warning lifted',
+    'Rescue teams in Chile searched collapsed buildings a day after the earthquake.',
+    'Authorities lifted the tsunami warning for the Chilean coast as rescue teams continued to search '
+    'collapsed buildings in Valparaiso after the magnitude 7.8 earthquake.',
+)
+_RATES = (
+    'Central bank holds interest rates steady as inflation cools',
+    'The central bank kept its benchmark interest rate unchanged.',
+    'Policy makers said inflation had cooled for a third month and signalled that interest rate cuts '
+    'could follow later in the year if wage growth keeps slowing.',
+)
+
+
+def _vector(article: tuple[str, str, str]) -> np.ndarray:
+    vector = decode_vector(encode_vector(*article))
+    assert vector is not None
+    return vector
+
+
+def test_encode_vector_is_unit_length_float16():
+    blob = encode_vector(*_QUAKE)
+    assert len(blob) == settings.related_vector_dim * 2
+    assert abs(float(np.linalg.norm(_vector(_QUAKE))) - 1.0) < 1e-2
+
+
+def test_same_story_scores_above_unrelated_story():
+    quake = _vector(_QUAKE)
+    same_story = float(quake @ _vector(_QUAKE_FOLLOWUP))
+    unrelated = float(quake @ _vector(_RATES))
+    assert same_story >= settings.related_min_score
+    assert same_story > unrelated
+
+
+def test_encode_vector_without_words_is_none():
+    assert encode_vector('', '', '') is None
+    assert decode_vector(None) is None
+    assert decode_vector(b'\x00\x00') is None
+
+
+class FakeEmbeddingTable:
+    # Evaluates the two filters RelatedIndex._load uses against a dict of blobs.
+    def __init__(self, rows: dict[int, bytes]) -> None:
+        self.rows = rows
+        self.queries: list[str] = []
+
+    def maker(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, stmt):
+        sql = str(stmt.compile(compile_kwargs={'literal_binds': True}))
+        self.queries.append(sql)
+        ids = sorted(self.rows, reverse=True)
+        if match := re.search(r'id > (\d+)', sql):
+            ids = [article_id for article_id in ids if article_id > int(match.group(1))]
+        if match := re.search(r'id IN \(([\d, ]+)\)', sql):
+            wanted = {int(value) for value in match.group(1).split(',')}
+            ids = [article_id for article_id in ids if article_id in wanted]
+
+        async def rows():
+            for article_id in ids:
+                yield article_id, self.rows[article_id]
+
+        return rows()
+
+
+def test_reembedded_ids_are_upserted_into_loaded_index():
+    table = FakeEmbeddingTable({1: encode_vector(*_QUAKE), 2: encode_vector(*_RATES)})
+    index = RelatedIndex(10, settings.related_vector_dim)
+    asyncio.run(index.ensure_current(table.maker))
+    assert len(index) == 2
+
+    table.rows[1] = encode_vector(*_RATES)
+    table.rows[3] = encode_vector(*_QUAKE_FOLLOWUP)
+    index.mark_stale()
+    index.mark_changed([1])
+    asyncio.run(index.ensure_current(table.maker))
+
+    assert len(index) == 3
+    assert np.allclose(index.vector_for(1), _vector(_RATES))
+    assert 'IN (1)' in table.queries[-1]
+
+    # Nothing announced: no query.
+    asyncio.run(index.ensure_current(table.maker))
+    assert len(table.queries) == 3
+
+
+def test_reload_rereads_every_vector():
+    table = FakeEmbeddingTable({1: encode_vector(*_QUAKE), 2: encode_vector(*_RATES)})
+    index = RelatedIndex(10, settings.related_vector_dim)
+    asyncio.run(index.ensure_current(table.maker))
+
+    table.rows[1] = encode_vector(*_QUAKE_FOLLOWUP)
+    table.rows[2] = encode_vector(*_QUAKE)
+    index.mark_reload()
+    asyncio.run(index.ensure_current(table.maker))
+
+    assert np.allclose(index.vector_for(1), _vector(_QUAKE_FOLLOWUP))
+    assert np.allclose(index.vector_for(2), _vector(_QUAKE))
+    assert len(index) == 2
+
+
+def test_changed_ids_outside_a_full_ring_stay_out():
+    table = FakeEmbeddingTable({article_id: encode_vector(*_QUAKE) for article_id in range(1, 6)})
+    index = RelatedIndex(3, settings.related_vector_dim)
+    asyncio.run(index.ensure_current(table.maker))
+    assert index.vector_for(1) is None
+
+    index.mark_changed([1])
+    asyncio.run(index.ensure_current(table.maker))
+    assert index.vector_for(1) is None
+    assert sorted(index._slots) == [3, 4, 5]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+
+from app import reprocess as reprocess_module
+
+
+class FakeEngine:
+    # Answers keyset page queries from a list of ids and records every connection,
+    # so the test can see that no transaction spans more than one page.
+    def __init__(self, ids: list[int]) -> None:
+        self.ids = ids
+        self.open = 0
+        self.pages: list[str] = []
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        assert self.open == 0, 'a previous page is still holding its connection'
+        self.open += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.open -= 1
+        return False
+
+    async def execute(self, stmt):
+        sql = str(stmt.compile(compile_kwargs={'literal_binds': True}))
+        self.pages.append(sql)
+        after = int(re.search(r'id > (\d+)', sql).group(1))
+        until = re.search(r'id <= (\d+)', sql)
+        limit = int(re.search(r'LIMIT (\d+)', sql).group(1))
+        rows = [{'id': article_id} for article_id in self.ids if article_id > after]
+        if until:
+            rows = [row for row in rows if row['id'] <= int(until.group(1))]
+        return _Result(rows[:limit])
+
+
+class _Result:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def mappings(self):
+        return self.rows
+
+
+def _args(tmp_path, **overrides) -> argparse.Namespace:
+    values = dict(
+        extract=False,
+        translate=False,
+        embed=False,
+        since_id=0,
+        until_id=0,
+        resume=False,
+        checkpoint=str(tmp_path / 'checkpoint.json'),
+        batch_size=3,
+        workers=1,
+        concurrency=1,
+        rows_per_second=0,
+        dry_run=False,
+    )
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def _run(monkeypatch, engine: FakeEngine, args: argparse.Namespace) -> tuple[dict, list[list[int]]]:
+    batches: list[list[int]] = []
+
+    async def fake_batch(rows, pool, workers, args, semaphore):
+        assert engine.open == 0
+        batches.append([row['id'] for row in rows])
+        return 0, 0
+
+    monkeypatch.setattr(reprocess_module, 'engine', engine)
+    monkeypatch.setattr(reprocess_module, '_process_batch', fake_batch)
+    return asyncio.run(reprocess_module.reprocess(args)), batches
+
+
+def test_pages_by_keyset_with_one_short_transaction_each(monkeypatch, tmp_path):
+    engine = FakeEngine([2, 3, 5, 8, 13, 21, 34])
+    stats, batches = _run(monkeypatch, engine, _args(tmp_path))
+
+    assert batches == [[2, 3, 5], [8, 13, 21], [34]]
+    assert stats['last_id'] == 34 and stats['scanned'] == 7
+    assert [re.search(r'id > (\d+)', sql).group(1) for sql in engine.pages] == ['0', '5', '21', '34']
+
+
+def test_resume_and_until_bound_the_scan(monkeypatch, tmp_path):
+    reprocess_module._save_checkpoint(tmp_path / 'checkpoint.json', {'last_id': 5})
+
+    _, batches = _run(monkeypatch, FakeEngine([2, 3, 5, 8, 13, 21, 34]), _args(tmp_path, resume=True, until_id=21))
+    assert batches == [[8, 13, 21]]
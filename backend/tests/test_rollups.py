@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.sql.dml import Delete, Insert
+
+from app.rollups import ANY, bucket_for, flush_rollups, rebuild_rollups, record_cells, rollup_cells
+
+_PUBLISHED = datetime(2025, 3, 1, 10, 42, tzinfo=timezone.utc)
+
+
+class FakeRollupSession:
+    # Just enough of AsyncSession for the rollup code: a news_rollups table held
+    # in a Counter, with Postgres' additive upsert.
+    def __init__(self, articles: list[dict]) -> None:
+        self.info: dict = {}
+        self.articles = articles
+        self.cells: Counter = Counter()
+        self.statements: list[str] = []
+        self.commits = 0
+
+    async def execute(self, stmt, params=None):
+        if isinstance(stmt, Delete):
+            self.statements.append('delete')
+            self.cells.clear()
+        elif isinstance(stmt, Insert):
+            self.statements.append('upsert')
+            for values in stmt._multi_values[0]:
+                row = {column.name: value for column, value in values.items()}
+                key = (row['bucket_start'], row['source_name'], row['china_related'], row['country'], row['topic'])
+                self.cells[key] += row['article_count']
+        else:
+            self.statements.append(str(stmt).split('(')[0].removeprefix('SELECT '))
+
+    async def scalar(self, stmt):
+        return 1 if self.cells else None
+
+    async def stream(self, stmt):
+        async def rows():
+            for article in self.articles:
+                yield SimpleNamespace(**article)
+
+        return rows()
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _article(**overrides) -> dict:
+    article = {
+        'published_at': _PUBLISHED,
+        'source_name': 'Wire',
+        'china_related': True,
+        'country_tags_blob': '|china|japan|',
+        'topic_tags_blob': '|trade|',
+    }
+    article.update(overrides)
+    return article
+
+
+def test_rollup_cells_cover_every_filter_combination():
+    cells = rollup_cells(**_article())
+    bucket = datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+    assert len(cells) == 3 * 2
+    assert (bucket, 'Wire', True, ANY, ANY) in cells
+    assert (bucket, 'Wire', True, 'japan', 'trade') in cells
+    assert bucket_for(datetime(2025, 3, 1, 10, 59)) == bucket
+
+
+def test_record_cells_deltas_cancel_out():
+    db = FakeRollupSession([])
+    record_cells(db, 1, **_article())
+    record_cells(db, -1, **_article())
+    record_cells(db, 1, **_article(country_tags_blob='|'))
+    asyncio.run(flush_rollups(db))
+    assert set(db.cells.values()) == {1}
+    assert len(db.cells) == 2
+
+
+def test_rebuild_is_idempotent_and_locked():
+    db = FakeRollupSession([_article(), _article(source_name='Other'), _article(topic_tags_blob='|')])
+    assert asyncio.run(rebuild_rollups(db)) == 3
+    first = Counter(db.cells)
+    assert first[(bucket_for(_PUBLISHED), 'Wire', True, ANY, ANY)] == 2
+
+    assert asyncio.run(rebuild_rollups(db)) == 3
+    assert db.cells == first
+    # The lock is taken before the table is cleared, in every rebuild.
+    assert db.statements[:3] == ['pg_advisory_xact_lock', 'delete', 'upsert']
+    assert db.statements.count('pg_advisory_xact_lock') == 2
+
+
+def test_rebuild_only_if_empty_skips_populated_table():
+    db = FakeRollupSession([_article()])
+    asyncio.run(rebuild_rollups(db))
+    before = Counter(db.cells)
+
+    db.articles.append(_article(source_name='Late'))
+    assert asyncio.run(rebuild_rollups(db, only_if_empty=True)) == 0
+    assert db.cells == before
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings, settings
+from app.seen import BloomFilter, SeenIndex, apply_remembered, remember_entry
+from app.sources import FeedItem, SourceConfig
+
+_SOURCE = SourceConfig(name='Wire', feed_url='https://wire.example.com/rss')
+_NOW = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _item(number: int, *, hours_ago: float = 0.0, source: SourceConfig = _SOURCE) -> FeedItem:
+    return FeedItem(
+        source=source,
+        article_url=f'https://wire.example.com/story/{number}',
+        guid=f'guid-{number}',
+        title=f'Story {number}',
+        summary='',
+        content_html='',
+        published_at=_NOW - timedelta(hours=hours_ago),
+    )
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(10000, 0.01)
+    added = [f'https://news.example.com/{idx}' for idx in range(10000)]
+    for url in added:
+        bloom.add(url)
+    assert all(url in bloom for url in added)
+    false_positives = sum(f'https://other.example.com/{idx}' in bloom for idx in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+def test_url_generations_rotate_and_keep_the_previous_one(monkeypatch):
+    monkeypatch.setattr(settings, 'seen_url_capacity', 100)
+    index = SeenIndex()
+    for idx in range(250):
+        index.add_url(f'https://news.example.com/{idx}')
+    # Generations: 0-99 dropped, 100-199 previous, 200-249 current.
+    assert index.has_url('https://news.example.com/150')
+    assert index.has_url('https://news.example.com/249')
+    assert sum(index.has_url(f'https://news.example.com/{idx}') for idx in range(100)) < 10
+
+
+def test_known_entries_by_guid_high_water_and_url():
+    index = SeenIndex()
+    index.remember(_item(1))
+
+    assert index.known(_item(1)) == 'guid'
+    # Older than the newest entry by more than the grace period.
+    stale = _item(2, hours_ago=settings.source_high_water_grace_hours + 1)
+    assert index.known(stale) == 'high_water'
+    # Inside the grace period: late arrivals still get looked at.
+    assert index.known(_item(3, hours_ago=1)) is None
+
+    other_source = SourceConfig(name='Mirror', feed_url='https://mirror.example.com/rss')
+    republished = FeedItem(
+        source=other_source,
+        article_url=_item(1).article_url,
+        guid='mirror-1',
+        title='Story 1',
+        summary='',
+        content_html='',
+        published_at=_NOW,
+    )
+    assert index.known(republished) == 'url'
+
+
+def test_guids_per_source_are_bounded(monkeypatch):
+    monkeypatch.setattr(settings, 'seen_guids_per_source', 3)
+    index = SeenIndex()
+    for number in range(1, 6):
+        index.remember(_item(number))
+    assert list(index._marks[_SOURCE.name].guids) == ['guid-3', 'guid-4', 'guid-5']
+
+
+def test_entries_are_only_remembered_after_commit(monkeypatch):
+    index = SeenIndex()
+    monkeypatch.setattr('app.seen.seen_index', index)
+    db = SimpleNamespace(info={})
+    remember_entry(db, _item(1))
+    assert index.known(_item(1)) is None
+
+    apply_remembered(db)
+    assert index.known(_item(1)) == 'guid'
+    assert db.info == {}
+
+
+def test_metrics_report_both_generations(monkeypatch):
+    monkeypatch.setattr(settings, 'seen_url_capacity', 100)
+    index = SeenIndex()
+    single = index.metrics()['bytes']
+    for idx in range(150):
+        index.add_url(f'https://news.example.com/{idx}')
+    assert index.metrics()['bytes'] == 2 * single == 2 * index._current.nbytes
+
+
+@pytest.mark.parametrize('rate', ['0', '1', '-0.5', '2'])
+def test_error_rate_outside_zero_one_is_rejected(monkeypatch, rate):
+    monkeypatch.setenv('SEEN_URL_ERROR_RATE', rate)
+    with pytest.raises(ValidationError):
+        Settings()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.translations import READER_LANGUAGES, TranslationJobs
+
+
+def test_reader_languages_include_both_stored_columns():
+    assert READER_LANGUAGES['en'] == 'en'
+    assert READER_LANGUAGES['zh'] == 'zh-CN'
+
+
+def test_concurrent_requests_share_one_translation():
+    jobs = TranslationJobs()
+    produced: list[int] = []
+
+    async def produce():
+        produced.append(1)
+        await asyncio.sleep(0)
+        return {'title': 'Titel'}
+
+    async def scenario():
+        first = jobs.run(7, 'de', produce)
+        second = jobs.run(7, 'de', produce)
+        assert first is second
+        assert jobs.pending(7, 'de')
+        return await first
+
+    assert asyncio.run(scenario()) == {'title': 'Titel'}
+    assert produced == [1]
+    assert not jobs.pending(7, 'de')
+    assert jobs.metrics()['joined'] == 1.0
+
+
+def test_failed_translation_cools_down():
+    jobs = TranslationJobs()
+
+    async def produce():
+        return None
+
+    async def scenario():
+        await jobs.run(7, 'de', produce)
+        return jobs.run(7, 'de', produce)
+
+    assert asyncio.run(scenario()) is None
+    assert jobs.metrics()['failures'] == 1.0
+
+
+def test_popularity_decays():
+    jobs = TranslationJobs()
+    for _ in range(4):
+        jobs.record_view(1)
+    jobs.record_view(2)
+    assert jobs.popular(5) == [1, 2]
+    # Halved: 1 keeps 2 views, 2 drops out.
+    assert jobs.popular(5) == [1]
@@ -1,6 +1,6 @@
 import Link from 'next/link';
 
-import { fetchNewsDetail, type Lang } from '@/lib/api';
+import { fetchNewsDetail, fetchRelated, type Lang, type RelatedItem } from '@/lib/api';
 
 function fmtDate(input: string, lang: Lang): string {
   return new Intl.DateTimeFormat(lang === 'zh' ? 'zh-CN' : 'en-US', {
@@ -26,11 +26,16 @@ export default async function NewsDetailPage({
   const { id } = await params;
   const sp = await searchParams;
   const lang: Lang = sp.lang === 'zh' ? 'zh' : 'en';
-  const item = await fetchNewsDetail(id, lang);
+  const [item, related] = await Promise.all([
+    fetchNewsDetail(id, lang),
+    // Related coverage is optional; the article still renders without it.
+    fetchRelated(id).catch((): RelatedItem[] => []),
+  ]);
 
   const zhBack = '\u8fd4\u56de\u9996\u9875';
   const zhLabel = '\u4e2d\u6587';
   const zhOpenSource = '\u67e5\u770b\u539f\u59cb\u94fe\u63a5';
+  const zhRelated = '\u76f8\u5173\u62a5\u9053';
 
   return (
     <main className="container-shell py-10">
@@ -80,6 +85,26 @@ export default async function NewsDetailPage({
 
         <div className="mt-8 whitespace-pre-wrap text-slate-100 leading-8">{item.content}</div>
       </article>
+
+      {related.length > 0 && (
+        <section className="glass-panel mt-6 rounded-3xl p-8 md:p-10">
+          <h2 className="text-xl" style={{ fontFamily: 'var(--font-heading)' }}>
+            {lang === 'zh' ? zhRelated : 'Related coverage'}
+          </h2>
+          <ul className="mt-4 space-y-3">
+            {related.map((rel) => (
+              <li key={rel.id}>
+                <Link href={`/news/${rel.id}?lang=${lang}`} className="text-slate-100 hover:text-accent">
+                  {rel.title}
+                </Link>
+                <p className="text-xs text-slate-400">
+                  {rel.source_name} · {fmtDate(rel.published_at, lang)}
+                </p>
+              </li>
+            ))}
+          </ul>
+        </section>
+      )}
     </main>
   );
 }
@@ -4,7 +4,14 @@ import type { Lang } from '@/lib/api';
 export default async function HomePage({
   searchParams,
 }: {
-  searchParams: Promise<{ lang?: Lang; china?: string; q?: string; country?: string; topic?: string }>;
+  searchParams: Promise<{
+    lang?: Lang;
+    china?: string;
+    q?: string;
+    country?: string;
+    topic?: string;
+    source_lang?: string;
+  }>;
 }) {
   const sp = await searchParams;
   const initialLang: Lang = sp.lang === 'zh' ? 'zh' : 'en';
@@ -15,6 +22,7 @@ export default async function HomePage({
       initialQ={sp.q ?? ''}
       initialCountry={sp.country ?? ''}
       initialTopic={sp.topic ?? ''}
+      initialSourceLang={sp.source_lang ?? ''}
     />
   );
 }
@@ -1,18 +1,18 @@
 'use client';
 
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import { motion } from 'framer-motion';
 import { useRouter } from 'next/navigation';
 
 import {
+  fetchDashboard,
   fetchFilterOptions,
-  fetchNews,
-  fetchRetryMetrics,
-  fetchSourceHealth,
   getWsUrl,
+  normalizeNewsItem,
   type FilterOptions,
   type Lang,
   type NewsItem,
+  type PushMessage,
   type RetryMetrics,
   type SourceHealth,
 } from '@/lib/api';
@@ -26,8 +26,27 @@ type NewsFeedProps = {
   initialQ: string;
   initialCountry: string;
   initialTopic: string;
+  initialSourceLang: string;
 };
 
+const PAGE_SIZE = 30;
+const PANEL_POLL_MS = 60000;
+
+function mergeNews(incoming: NewsItem[], current: NewsItem[]): NewsItem[] {
+  const seen = new Set(incoming.map((item) => item.id));
+  return [...incoming, ...current.filter((item) => !seen.has(item.id))]
+    .sort((a, b) => Date.parse(b.published_at) - Date.parse(a.published_at))
+    .slice(0, PAGE_SIZE);
+}
+
+function languageName(code: string, lang: Lang): string {
+  try {
+    return new Intl.DisplayNames([lang === 'zh' ? 'zh-CN' : 'en'], { type: 'language' }).of(code) ?? code;
+  } catch {
+    return code;
+  }
+}
+
 function pretty(value: string): string {
   return value
     .split('-')
@@ -35,7 +54,14 @@ function pretty(value: string): string {
     .join(' ');
 }
 
-export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCountry, initialTopic }: NewsFeedProps) {
+export function NewsFeed({
+  initialLang,
+  initialChinaOnly,
+  initialQ,
+  initialCountry,
+  initialTopic,
+  initialSourceLang,
+}: NewsFeedProps) {
   const router = useRouter();
 
   const [lang, setLang] = useState<Lang>(initialLang);
@@ -47,9 +73,11 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
   const [keyword, setKeyword] = useState(initialQ);
   const [country, setCountry] = useState(initialCountry);
   const [topic, setTopic] = useState(initialTopic);
-  const [options, setOptions] = useState<FilterOptions>({ countries: [], topics: [] });
+  const [sourceLang, setSourceLang] = useState(initialSourceLang);
+  const [options, setOptions] = useState<FilterOptions>({ countries: [], topics: [], languages: [] });
   const [loading, setLoading] = useState(true);
   const [err, setErr] = useState<string | null>(null);
+  const resumeToken = useRef<string | null>(null);
 
   async function loadCurrent(current: {
     lang: Lang;
@@ -57,56 +85,56 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
     keyword: string;
     country: string;
     topic: string;
+    sourceLang: string;
   }) {
     try {
       setErr(null);
-      const [newsResp, healthResp, retryResp] = await Promise.allSettled([
-        fetchNews({
-          lang: current.lang,
-          chinaOnly: current.chinaOnly,
-          q: current.keyword,
-          country: current.country,
-          topic: current.topic,
-        }),
-        fetchSourceHealth(),
-        fetchRetryMetrics(),
-      ]);
-      if (newsResp.status === 'fulfilled') {
-        setNews(newsResp.value.items);
-      } else {
-        setNews([]);
-        setErr(newsResp.reason instanceof Error ? newsResp.reason.message : 'Failed to fetch news');
-      }
-
-      if (healthResp.status === 'fulfilled') {
-        setHealth(healthResp.value);
-      } else {
-        setHealth([]);
-      }
-
-      if (retryResp.status === 'fulfilled') {
-        setRetryMetrics(retryResp.value);
-      } else {
-        setRetryMetrics({ pending: 0, due: 0 });
-      }
+      const snapshot = await fetchDashboard({
+        lang: current.lang,
+        chinaOnly: current.chinaOnly,
+        q: current.keyword,
+        country: current.country,
+        topic: current.topic,
+        sourceLang: current.sourceLang,
+        limit: PAGE_SIZE,
+      });
+      setNews(snapshot.news.items);
+      setHealth(snapshot.sources);
+      setRetryMetrics(snapshot.retry);
+    } catch (error) {
+      setNews([]);
+      setHealth([]);
+      setRetryMetrics({ pending: 0, due: 0 });
+      setErr(error instanceof Error ? error.message : 'Failed to fetch news');
     } finally {
       setLoading(false);
     }
   }
 
+  // Source health and retry backlog change every ingest cycle, not with the news list.
+  async function refreshPanels(current: { lang: Lang; chinaOnly: boolean }) {
+    try {
+      const snapshot = await fetchDashboard({ lang: current.lang, chinaOnly: current.chinaOnly, limit: 1 });
+      setHealth(snapshot.sources);
+      setRetryMetrics(snapshot.retry);
+    } catch {
+      // Keep the last panels; the next push or poll tries again.
+    }
+  }
+
   useEffect(() => {
     void (async () => {
       try {
         setOptions(await fetchFilterOptions());
       } catch {
-        setOptions({ countries: [], topics: [] });
+        setOptions({ countries: [], topics: [], languages: [] });
       }
     })();
   }, []);
 
   useEffect(() => {
     setLoading(true);
-    const current = { lang, chinaOnly, keyword, country, topic };
+    const current = { lang, chinaOnly, keyword, country, topic, sourceLang };
     void loadCurrent(current);
 
     const qp = new URLSearchParams({ lang });
@@ -114,35 +142,87 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
     if (keyword) qp.set('q', keyword);
     if (country) qp.set('country', country);
     if (topic) qp.set('topic', topic);
+    if (sourceLang) qp.set('source_lang', sourceLang);
     router.replace(`/?${qp.toString()}`, { scroll: false });
-  }, [lang, chinaOnly, keyword, country, topic, router]);
+  }, [lang, chinaOnly, keyword, country, topic, sourceLang, router]);
 
   useEffect(() => {
+    const current = { lang, chinaOnly, keyword, country, topic, sourceLang };
     const wsUrl = getWsUrl();
-    if (!wsUrl) return;
-
-    if (typeof window !== 'undefined' && window.location.protocol === 'https:' && wsUrl.startsWith('ws://')) {
-      return;
+    // Without a socket nothing announces new ingest cycles, so poll the panels.
+    if (
+      !wsUrl ||
+      (typeof window !== 'undefined' && window.location.protocol === 'https:' && wsUrl.startsWith('ws://'))
+    ) {
+      const poll = setInterval(() => void refreshPanels(current), PANEL_POLL_MS);
+      return () => clearInterval(poll);
     }
 
-    let ws: WebSocket;
-    try {
-      ws = new WebSocket(wsUrl);
-    } catch {
-      return;
-    }
+    let ws: WebSocket | null = null;
+    let reconnect: ReturnType<typeof setTimeout> | undefined;
+    let disposed = false;
+
+    // The server pushes matching cards directly, so a new ingest no longer makes
+    // every open tab refetch /api/news. resync means our resume token is too old.
+    const onMessage = (event: MessageEvent) => {
+      let message: PushMessage;
+      try {
+        message = JSON.parse(event.data);
+      } catch {
+        return;
+      }
+      if ('resume_token' in message) resumeToken.current = message.resume_token;
 
-    ws.onmessage = () => void loadCurrent({ lang, chinaOnly, keyword, country, topic });
+      if (message.type === 'news_delta') {
+        if (message.items.length === 0) return;
+        const incoming = message.items.map((item) => normalizeNewsItem(item));
+        setNews((prev) => mergeNews(incoming, prev));
+      } else if (message.type === 'resync' || message.type === 'news_inserted') {
+        void loadCurrent(current);
+      } else if (message.type === 'dashboard') {
+        setHealth(message.sources);
+        setRetryMetrics(message.retry);
+      }
+    };
 
+    const open = () => {
+      try {
+        ws = new WebSocket(wsUrl);
+      } catch {
+        return;
+      }
+      ws.onopen = () => {
+        ws?.send(
+          JSON.stringify({
+            type: 'subscribe',
+            lang,
+            china_only: chinaOnly,
+            q: keyword,
+            country,
+            topic,
+            source_lang: sourceLang,
+            resume_token: resumeToken.current,
+          })
+        );
+      };
+      ws.onmessage = onMessage;
+      ws.onclose = () => {
+        if (!disposed) reconnect = setTimeout(open, 3000);
+      };
+    };
+
+    open();
     const heartbeat = setInterval(() => {
-      if (ws.readyState === WebSocket.OPEN) ws.send('ping');
+      if (ws?.readyState === WebSocket.OPEN) ws.send('ping');
     }, 20000);
 
     return () => {
+      disposed = true;
       clearInterval(heartbeat);
-      ws.close();
+      clearTimeout(reconnect);
+      ws?.close();
     };
-  }, [lang, chinaOnly, keyword, country, topic]);
+  }, [lang, chinaOnly, keyword, country, topic, sourceLang]);
 
   const chinaItems = useMemo(() => news.filter((item) => item.china_related), [news]);
 
@@ -153,6 +233,7 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
       search: '\u5173\u952e\u8bcd\u641c\u7d22',
       allCountries: '\u5168\u90e8\u56fd\u5bb6',
       allTopics: '\u5168\u90e8\u4e3b\u9898',
+      allLanguages: '\u5168\u90e8\u539f\u6587\u8bed\u8a00',
       apply: '\u5e94\u7528\u641c\u7d22',
       reset: '\u91cd\u7f6e\u7b5b\u9009',
       chinaSection: '\u4e2d\u56fd\u76f8\u5173\u4e13\u680f',
@@ -166,6 +247,7 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
       search: 'Search keywords',
       allCountries: 'All Countries',
       allTopics: 'All Topics',
+      allLanguages: 'All Source Languages',
       apply: 'Apply Search',
       reset: 'Reset Filters',
       chinaSection: 'China Focus',
@@ -205,7 +287,7 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
           </div>
         </div>
 
-        <div className="mb-8 grid gap-3 rounded-2xl border border-slate-500/30 bg-slate-900/35 p-4 md:grid-cols-5">
+        <div className="mb-8 grid gap-3 rounded-2xl border border-slate-500/30 bg-slate-900/35 p-4 md:grid-cols-6">
           <input
             className="rounded-lg border border-slate-500/40 bg-slate-900/50 px-3 py-2 text-sm text-slate-100 outline-none focus:border-mint"
             placeholder={i18n.search}
@@ -239,6 +321,18 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
               </option>
             ))}
           </select>
+          <select
+            className="rounded-lg border border-slate-500/40 bg-slate-900/50 px-3 py-2 text-sm text-slate-100 outline-none focus:border-mint"
+            value={sourceLang}
+            onChange={(e) => setSourceLang(e.target.value)}
+          >
+            <option value="">{i18n.allLanguages}</option>
+            {options.languages.map((entry) => (
+              <option key={entry} value={entry}>
+                {languageName(entry, lang)}
+              </option>
+            ))}
+          </select>
           <button
             className="rounded-lg border border-accent/60 bg-accent/85 px-3 py-2 text-sm text-slate-900 hover:bg-accent"
             onClick={() => setKeyword(keywordInput.trim())}
@@ -252,6 +346,7 @@ export function NewsFeed({ initialLang, initialChinaOnly, initialQ, initialCount
               setKeyword('');
               setCountry('');
               setTopic('');
+              setSourceLang('');
               setChinaOnly(false);
             }}
           >
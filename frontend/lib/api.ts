@@ -9,6 +9,7 @@ export type NewsItem = {
   summary: string;
   content: string;
   language: Lang;
+  source_lang: string;
   published_at: string;
   fetched_at: string;
   china_related: boolean;
@@ -22,12 +23,19 @@ type NewsListResponse = {
   items: NewsItem[];
 };
 
-type RawNewsItem = Partial<NewsItem> & {
+export type RawNewsItem = Partial<NewsItem> & {
   id: number;
   title: string;
 };
 
-function normalizeNewsItem(raw: RawNewsItem): NewsItem {
+export type PushMessage =
+  | { type: 'news_delta'; items: RawNewsItem[]; resume_token: string }
+  | { type: 'subscribed' | 'resync'; resume_token: string }
+  | { type: 'news_inserted'; count: number }
+  | { type: 'dashboard'; sources: SourceHealth[]; retry: RetryMetrics }
+  | { type: 'heartbeat'; ts: number };
+
+export function normalizeNewsItem(raw: RawNewsItem): NewsItem {
   return {
     id: raw.id,
     source_name: raw.source_name ?? 'Unknown Source',
@@ -37,6 +45,7 @@ function normalizeNewsItem(raw: RawNewsItem): NewsItem {
     summary: raw.summary ?? '',
     content: raw.content ?? '',
     language: raw.language === 'zh' ? 'zh' : 'en',
+    source_lang: raw.source_lang ?? 'en',
     published_at: raw.published_at ?? new Date().toISOString(),
     fetched_at: raw.fetched_at ?? new Date().toISOString(),
     china_related: Boolean(raw.china_related),
@@ -65,6 +74,7 @@ type SourceHealthResponse = {
 export type FilterOptions = {
   countries: string[];
   topics: string[];
+  languages: string[];
 };
 
 export type RetryMetrics = {
@@ -72,6 +82,45 @@ export type RetryMetrics = {
   due: number;
 };
 
+export type IngestStats = {
+  finished_at: string;
+  duration_ms: number;
+  inserted: number;
+  sources_ok: number;
+  sources_failed: number;
+  items_fetched: number;
+  items_new: number;
+};
+
+export type Dashboard = {
+  news: NewsListResponse;
+  sources: SourceHealth[];
+  retry: RetryMetrics;
+  ingest: IngestStats | null;
+  generatedAt: string | null;
+};
+
+export type RelatedItem = {
+  id: number;
+  title: string;
+  source_name: string;
+  article_url: string;
+  image_url: string | null;
+  published_at: string;
+  china_related: boolean;
+  score: number;
+};
+
+type NewsQuery = {
+  lang: Lang;
+  chinaOnly: boolean;
+  q?: string;
+  country?: string;
+  topic?: string;
+  sourceLang?: string;
+  limit?: number;
+};
+
 function normalizeApiBase(raw: string): string {
   const trimmed = raw.trim().replace(/[<>]/g, '');
   if (!trimmed) return '';
@@ -97,20 +146,11 @@ function apiUrl(path: string): string {
   return `${API_BASE}${path}`;
 }
 
-export async function fetchNews(params: {
-  lang: Lang;
-  chinaOnly: boolean;
-  q?: string;
-  country?: string;
-  topic?: string;
-  limit?: number;
-  offset?: number;
-}): Promise<NewsListResponse> {
+function newsQueryParams(params: NewsQuery): URLSearchParams {
   const qp = new URLSearchParams({
     lang: params.lang,
     china_only: String(params.chinaOnly),
     limit: String(params.limit ?? 30),
-    offset: String(params.offset ?? 0),
   });
   if (params.q?.trim()) {
     qp.set('q', params.q.trim());
@@ -121,19 +161,50 @@ export async function fetchNews(params: {
   if (params.topic?.trim()) {
     qp.set('topic', params.topic.trim());
   }
+  if (params.sourceLang?.trim()) {
+    qp.set('source_lang', params.sourceLang.trim());
+  }
+  return qp;
+}
+
+function normalizeNewsList(data: { total?: unknown; items?: unknown } | null | undefined): NewsListResponse {
+  const items = data?.items;
+  return {
+    total: Number(data?.total ?? 0),
+    items: Array.isArray(items)
+      ? items
+          .filter((item: unknown): item is RawNewsItem => Boolean(item) && typeof item === 'object')
+          .map((item: RawNewsItem) => normalizeNewsItem(item))
+      : [],
+  };
+}
+
+export async function fetchNews(params: NewsQuery & { offset?: number }): Promise<NewsListResponse> {
+  const qp = newsQueryParams(params);
+  qp.set('offset', String(params.offset ?? 0));
 
   const resp = await fetch(apiUrl(`/api/news?${qp.toString()}`), { next: { revalidate: 0 } });
   if (!resp.ok) {
     throw new Error(`Failed to fetch news: ${resp.status}`);
   }
+  return normalizeNewsList(await resp.json());
+}
+
+// First news page plus the ingest-time snapshot of source health, retry queue
+// and ingest stats in one request; served from server memory.
+export async function fetchDashboard(params: NewsQuery): Promise<Dashboard> {
+  const qp = newsQueryParams(params);
+  const resp = await fetch(apiUrl(`/api/dashboard?${qp.toString()}`), { next: { revalidate: 0 } });
+  if (!resp.ok) {
+    throw new Error(`Failed to fetch dashboard: ${resp.status}`);
+  }
   const data = await resp.json();
   return {
-    total: Number(data.total ?? 0),
-    items: Array.isArray(data.items)
-      ? data.items
-          .filter((item: unknown): item is RawNewsItem => Boolean(item) && typeof item === 'object')
-          .map((item: RawNewsItem) => normalizeNewsItem(item))
-      : [],
+    news: normalizeNewsList(data.news),
+    sources: Array.isArray(data.sources) ? data.sources : [],
+    retry: data.retry ?? { pending: 0, due: 0 },
+    ingest: data.ingest ?? null,
+    generatedAt: data.generated_at ?? null,
   };
 }
 
@@ -146,6 +217,15 @@ export async function fetchNewsDetail(id: string, lang: Lang): Promise<NewsItem>
   return normalizeNewsItem(data);
 }
 
+export async function fetchRelated(id: string, limit = 6): Promise<RelatedItem[]> {
+  const resp = await fetch(apiUrl(`/api/news/${id}/related?limit=${limit}`), { next: { revalidate: 0 } });
+  if (!resp.ok) {
+    throw new Error(`Failed to fetch related: ${resp.status}`);
+  }
+  const data = await resp.json();
+  return Array.isArray(data?.items) ? data.items : [];
+}
+
 export async function fetchSourceHealth(): Promise<SourceHealth[]> {
   const resp = await fetch(apiUrl('/api/sources/health'), { next: { revalidate: 0 } });
   if (!resp.ok) {
@@ -160,7 +240,12 @@ export async function fetchFilterOptions(): Promise<FilterOptions> {
   if (!resp.ok) {
     throw new Error(`Failed to fetch filters: ${resp.status}`);
   }
-  return resp.json();
+  const data = await resp.json();
+  return {
+    countries: Array.isArray(data.countries) ? data.countries : [],
+    topics: Array.isArray(data.topics) ? data.topics : [],
+    languages: Array.isArray(data.languages) ? data.languages : [],
+  };
 }
 
 export async function fetchRetryMetrics(): Promise<RetryMetrics> {